@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class HomeExpenseAppConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'app'
+
+    def ready(self):
+        # Connect signal handlers (token cache invalidation, owner data versions)
+        from . import signals  # noqa: F401
@@ -0,0 +1,236 @@
+"""
+Async (ASGI) read-only endpoints mirroring the summary views and list endpoints.
+
+Under an ASGI server these never tie up a worker while waiting on the
+database. They authenticate with the same cached token authentication as the
+DRF views and return identical JSON. Writes stay on the DRF viewsets.
+"""
+import asyncio
+import calendar
+import functools
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+
+from .authentication import CachedTokenAuthentication
+from .conditional import current_period, etag_matches, owner_etag
+from .fast_lists import compile_fields, select_fields, serialize_values, values_queryset
+from .ledger import ledger_totals
+from .models import Tenant, ElectricityReading, ExpenseCategory, Expense
+from .serializers import (
+    TenantSerializer,
+    ElectricityReadingSerializer,
+    ExpenseCategorySerializer,
+    ExpenseSerializer,
+)
+from .summary import grouped_month_totals, range_series, rent_by_month, summary_payload, tenant_bill_rows
+from .views_summary import MAX_RANGE_MONTHS, parse_year_month, validate_year
+
+ZERO = Decimal('0.00')
+
+
+# --- Helpers ---
+
+def _json(data, status=200):
+    """Renders with DRF's JSONRenderer so bodies match the sync endpoints byte for byte."""
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def _error(message, status):
+    return _json({"error": message} if status == 400 else {"detail": message}, status=status)
+
+
+async def _authenticate(request):
+    """Token-authenticates a plain Django request; returns the user or None."""
+    try:
+        result = await sync_to_async(CachedTokenAuthentication().authenticate)(request)
+    except exceptions.AuthenticationFailed:
+        return None
+    if result is None:
+        return None
+    request.user = result[0]
+    return result[0]
+
+
+def _isolated(func):
+    """
+    Wraps a blocking ORM callable to run on its own executor thread, so several
+    can hit the database at once. Each thread keeps its own connection, recycled
+    like a request's would be.
+    """
+    def run():
+        close_old_connections()
+        return func()
+    return sync_to_async(run, thread_sensitive=False)
+
+
+async def run_concurrently(*funcs):
+    """Runs independent ORM callables in parallel and returns their results in order."""
+    return await asyncio.gather(*(_isolated(func)() for func in funcs))
+
+
+def owner_view(handler=None, *, etag_period=None):
+    """
+    Decorator for async GET endpoints (HEAD is answered like GET, as Django's
+    views do): authenticates the token, answers 304 Not Modified for a
+    current ETag, and stamps the ETag on 200 responses.
+    `etag_period(request.GET)` gives the period a date-dependent default
+    resolves to (see owner_etag).
+    """
+    if handler is None:
+        return functools.partial(owner_view, etag_period=etag_period)
+
+    async def view(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            response = _error(f'Method "{request.method}" not allowed.', 405)
+            response['Allow'] = 'GET, HEAD'
+            return response
+        user = await _authenticate(request)
+        if user is None:
+            return _error("Authentication credentials were not provided.", 401)
+
+        period = etag_period(request.GET) if etag_period else None
+        etag = await sync_to_async(owner_etag)(request, period)
+        if etag_matches(request, etag):
+            response = HttpResponse(status=304)
+        else:
+            response = await handler(request, user, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+    return view
+
+
+# --- Summary endpoints ---
+
+@owner_view
+async def monthly_summary(request, user):
+    """
+    GET /api/async/monthly-summary/?month=10&year=2025
+    Same payload as MonthlySummaryView; tenant rows, ledger totals and rent are fetched concurrently.
+    """
+    try:
+        month = int(request.GET.get('month', ''))
+        year = validate_year(int(request.GET.get('year', '')))
+        if not (1 <= month <= 12):
+            raise ValueError("Month must be between 1 and 12.")
+    except ValueError as e:
+        return _error(f"Invalid month or year format: {e}", 400)
+
+    rows, totals, rent = await run_concurrently(
+        lambda: list(tenant_bill_rows(user, month, year)),
+        lambda: ledger_totals(user, month, year),
+        lambda: rent_by_month(user, (year, month), (year, month)),
+    )
+    summary = summary_payload(rows, totals, rent[(year, month)])
+
+    return _json({
+        "month": calendar.month_name[month],
+        "year": year,
+        "tenants": summary["tenants"],
+        "total_rent": summary["total_rent"],
+        "total_electricity": summary["total_electricity"],
+        "total_other_expenses": summary["total_other_expenses"],
+        "net_balance": summary["net_balance"],
+    })
+
+
+@owner_view
+async def summary_range(request, user):
+    """
+    GET /api/async/summary/range/?from=2024-01&to=2025-12
+    Same payload as SummaryRangeView; the rent, electricity and expense
+    aggregates run concurrently.
+    """
+    try:
+        start = parse_year_month(request.GET.get('from'))
+        end = parse_year_month(request.GET.get('to'))
+    except ValueError as e:
+        return _error(f"Invalid 'from' or 'to' format: {e}", 400)
+    span = (end[0] - start[0]) * 12 + (end[1] - start[1]) + 1
+    if not (1 <= span <= MAX_RANGE_MONTHS):
+        return _error(f"'from' must not be after 'to' and the range cannot exceed {MAX_RANGE_MONTHS} months.", 400)
+
+    electricity, expenses, rent = await run_concurrently(
+        lambda: grouped_month_totals(
+            ElectricityReading.objects.filter(tenant__owner=user), 'calculated_bill', start, end
+        ),
+        lambda: grouped_month_totals(Expense.objects.filter(owner=user), 'amount', start, end),
+        lambda: rent_by_month(user, start, end),
+    )
+    series = range_series(start, end, rent, electricity, expenses)
+
+    return _json({
+        "from": f"{start[0]:04d}-{start[1]:02d}",
+        "to": f"{end[0]:04d}-{end[1]:02d}",
+        "months": series["months"],
+        "totals": series["totals"],
+    })
+
+
+# --- Read-only list endpoints ---
+
+async def _serialized(request, queryset, serializer_class):
+    """Serializes through the values() fast path, honouring ?fields= and ?omit=."""
+    try:
+        mapping = select_fields(compile_fields(serializer_class), request.GET)
+    except ValueError as e:
+        return _error(str(e), 400)
+    rows = [row async for row in values_queryset(queryset, mapping)]
+    return _json(serialize_values(rows, mapping))
+
+
+def _int_params(request, *names):
+    """Returns {name: int} for the given query params that are present; raises ValueError."""
+    return {name: int(request.GET[name]) for name in names if request.GET.get(name)}
+
+
+@owner_view
+async def tenant_list(request, user):
+    """GET /api/async/tenants/ - same payload as GET /api/tenants/."""
+    return await _serialized(request, Tenant.objects.filter(owner=user), TenantSerializer)
+
+
+@owner_view
+async def category_list(request, user):
+    """GET /api/async/categories/ - same payload as GET /api/categories/."""
+    return await _serialized(
+        request, ExpenseCategory.objects.filter(owner=user), ExpenseCategorySerializer
+    )
+
+
+@owner_view
+async def expense_list(request, user):
+    """GET /api/async/expenses/?month=&year=&category= - same payload as GET /api/expenses/."""
+    try:
+        filters = _int_params(request, 'month', 'year', 'category')
+    except ValueError:
+        return _error("month, year and category must be integers.", 400)
+    return await _serialized(
+        request, Expense.objects.filter(owner=user, **filters), ExpenseSerializer
+    )
+
+
+@owner_view(etag_period=current_period)
+async def reading_list(request, user):
+    """
+    GET /api/async/readings/?tenant=&month=&year= - same payload as GET /api/readings/,
+    including the default to the current month when neither month nor year is given.
+    """
+    try:
+        filters = _int_params(request, 'tenant', 'month', 'year')
+    except ValueError:
+        return _error("tenant, month and year must be integers.", 400)
+    period = current_period(request.GET)
+    if period is not None:
+        filters.update(year=period[0], month=period[1])
+    return await _serialized(
+        request, ElectricityReading.objects.filter(tenant__owner=user, **filters),
+        ElectricityReadingSerializer,
+    )
@@ -0,0 +1,192 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+from .metrics import CACHE_REQUESTS
+
+# Defaults, overridable through settings.TOKEN_AUTH_CACHE
+TOKEN_AUTH_CACHE_DEFAULTS = {
+    'TTL': 60,                  # seconds a token -> user mapping may be reused
+    'MAX_SIZE': 10000,          # entries kept in the process-local LRU
+    'USE_DJANGO_CACHE': True,   # share entries and revocations through Django's cache
+    'LOCAL_TTL': 5,             # TTL cap without the Django cache, where revocations stay in one process
+    'CACHE_ALIAS': 'default',
+}
+
+
+def _config():
+    return {**TOKEN_AUTH_CACHE_DEFAULTS, **getattr(settings, 'TOKEN_AUTH_CACHE', {})}
+
+
+def _ttl(config):
+    """Seconds an entry may be reused: TTL, capped at LOCAL_TTL when revocations are not shared."""
+    return config['TTL'] if config['USE_DJANGO_CACHE'] else min(config['TTL'], config['LOCAL_TTL'])
+
+
+def _digest(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class TokenCache:
+    """
+    Process-local LRU of token digest -> (user, token, cached_at), optionally
+    backed by the Django cache.
+
+    The Django cache (a file cache on local disk by default) only ever holds
+    token digest -> (user id, cached_at), never the user or the token itself.
+    A process that finds an entry there loads the user by primary key into its
+    own LRU instead of repeating the token lookup.
+
+    When the Django cache is enabled, revoking a user stores a timestamp there
+    that every process checks on each hit, so revocation is immediate across
+    gunicorn workers. Without it, revocation is immediate in this process only
+    and other processes pick it up when their entries expire, so entries then
+    live at most LOCAL_TTL seconds.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._by_user = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'shared_hits': 0, 'revoked': 0}
+
+    # --- shared (Django cache) helpers ---
+
+    def _shared(self):
+        config = _config()
+        return caches[config['CACHE_ALIAS']] if config['USE_DJANGO_CACHE'] else None
+
+    @staticmethod
+    def _revoked_key(user_id):
+        return f'authtoken-revoked:{user_id}'
+
+    def _is_revoked(self, shared, user_id, cached_at):
+        if shared is None:
+            return False
+        revoked_at = shared.get(self._revoked_key(user_id))
+        return revoked_at is not None and revoked_at >= cached_at
+
+    # --- public API ---
+
+    def get(self, key):
+        """Returns (user, token) for a cached, unexpired and unrevoked key, else None."""
+        digest = _digest(key)
+        config = _config()
+        now = time.time()
+        shared = self._shared()
+
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+        source, shared_entry = 'hits', None
+        if entry is not None:
+            user_id, cached_at = entry[0].pk, entry[2]
+        elif shared is not None:
+            shared_entry = shared.get(f'authtoken:{digest}')
+            if shared_entry is not None:
+                (user_id, cached_at), source = shared_entry, 'shared_hits'
+
+        if (
+            (entry is None and shared_entry is None)
+            or now - cached_at > _ttl(config)
+            or self._is_revoked(shared, user_id, cached_at)
+        ):
+            return self._miss()
+        if entry is None:
+            entry = self._load(key, user_id, cached_at)
+            if entry is None:
+                return self._miss()
+            self._store_local(digest, entry)
+
+        with self._lock:
+            self._stats[source] += 1
+        CACHE_REQUESTS.labels('token', 'hit' if source == 'hits' else 'shared_hit').inc()
+        user, token, _cached_at = entry
+        # Hand out copies so per-request attribute caching never leaks between requests
+        return copy.copy(user), copy.copy(token)
+
+    def set(self, key, user, token):
+        digest = _digest(key)
+        entry = (user, token, time.time())
+        self._store_local(digest, entry)
+        shared = self._shared()
+        if shared is not None:
+            shared.set(f'authtoken:{digest}', (user.pk, entry[2]), _config()['TTL'])
+
+    def _miss(self):
+        with self._lock:
+            self._stats['misses'] += 1
+        CACHE_REQUESTS.labels('token', 'miss').inc()
+        return None
+
+    @staticmethod
+    def _load(key, user_id, cached_at):
+        """Local entry for a shared one: the active user by primary key, or None."""
+        from rest_framework.authtoken.models import Token
+
+        user = get_user_model()._default_manager.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            return None
+        return user, Token(key=key, user=user), cached_at
+
+    def _store_local(self, digest, entry):
+        max_size = _config()['MAX_SIZE']
+        with self._lock:
+            self._entries[digest] = entry
+            self._entries.move_to_end(digest)
+            self._by_user.setdefault(entry[0].pk, set()).add(digest)
+            while len(self._entries) > max_size:
+                old_digest, (old_user, _token, _at) = self._entries.popitem(last=False)
+                self._by_user.get(old_user.pk, set()).discard(old_digest)
+
+    def revoke_user(self, user_id):
+        """Drops every cached token of the user, in this process and (if enabled) everywhere."""
+        with self._lock:
+            for digest in self._by_user.pop(user_id, set()):
+                self._entries.pop(digest, None)
+            self._stats['revoked'] += 1
+        shared = self._shared()
+        if shared is not None:
+            shared.set(self._revoked_key(user_id), time.time(), _config()['TTL'])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self):
+        """Hit/miss counters for this process, including the current hit rate."""
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries))
+        lookups = stats['hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['shared_hits']) / lookups if lookups else 0.0
+        return stats
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for DRF's TokenAuthentication that skips the Token+User
+    query for recently seen tokens. Entries live for TOKEN_AUTH_CACHE['TTL'] seconds
+    and are revoked when the token is deleted or the user is saved
+    (see app/signals.py).
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user, token)
+        return (user, token)
@@ -0,0 +1,80 @@
+"""
+Set-based electricity billing.
+
+A tariff's bill is a SQL expression over total_units (fixed charge plus, per
+slab, rate * GREATEST(LEAST(units, upper) - lower, 0)), so recomputing every
+reading in a tariff's window is a single UPDATE no matter how many rows it
+touches. Months without a tariff fall back to the flat units * rate_per_unit.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Value
+from django.db.models.functions import Greatest, Least, Round
+
+from .caching import bump_owner_version_on_commit
+from .ledger import rebuild_ledger
+from .models import ElectricityReading, Tariff
+from .summary import period_filter, previous_month
+
+# Bounds used for open-ended ranges (reading years are validated to 2000-2100)
+FIRST_PERIOD = (1, 1)
+LAST_PERIOD = (9999, 12)
+
+_money = DecimalField(max_digits=14, decimal_places=4)
+
+
+def _decimal(value):
+    return Value(Decimal(value), output_field=_money)
+
+
+def bill_expression(tariff):
+    """SQL expression for the bill of a reading under `tariff` (slabs must be loaded)."""
+    units = F('total_units')
+    bill = _decimal(tariff.fixed_charge)
+    for slab in tariff.slabs.all():
+        top = units if slab.upper_units is None else Least(units, _decimal(slab.upper_units))
+        bill = bill + _decimal(slab.rate) * Greatest(top - _decimal(slab.lower_units), _decimal(0))
+    return ExpressionWrapper(Round(bill, 2), output_field=_money)
+
+
+FLAT_BILL = ExpressionWrapper(Round(F('total_units') * F('rate_per_unit'), 2), output_field=_money)
+
+
+def tariff_windows(owner_id, start=FIRST_PERIOD, end=LAST_PERIOD):
+    """
+    Splits [start, end] into [(tariff or None, window_start, window_end)] by the
+    owner's tariffs, oldest first. None covers the months before the first tariff.
+    """
+    tariffs = list(Tariff.objects.filter(owner_id=owner_id).prefetch_related('slabs').order_by('effective_from'))
+    boundaries = [(None, FIRST_PERIOD)] + [
+        (tariff, (tariff.effective_from.year, tariff.effective_from.month)) for tariff in tariffs
+    ]
+    windows = []
+    for index, (tariff, window_start) in enumerate(boundaries):
+        if index + 1 < len(boundaries):
+            window_end = previous_month(boundaries[index + 1][1])
+        else:
+            window_end = LAST_PERIOD
+        window_start, window_end = max(window_start, start), min(window_end, end)
+        if window_start <= window_end:
+            windows.append((tariff, window_start, window_end))
+    return windows
+
+
+def recompute_bills(owner_id, start=FIRST_PERIOD, end=LAST_PERIOD):
+    """
+    Recomputes calculated_bill for the owner's readings in [start, end] with one
+    UPDATE per tariff window, then rebuilds the owner's monthly ledger and
+    invalidates their cached responses. Returns the number of readings updated.
+    """
+    updated = 0
+    with transaction.atomic():
+        for tariff, window_start, window_end in tariff_windows(owner_id, start, end):
+            updated += ElectricityReading.objects.filter(
+                period_filter(window_start, window_end), tenant__owner_id=owner_id,
+            ).update(calculated_bill=FLAT_BILL if tariff is None else bill_expression(tariff))
+        if updated:
+            rebuild_ledger([owner_id])
+            bump_owner_version_on_commit(owner_id)
+    return updated
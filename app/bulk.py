@@ -0,0 +1,81 @@
+"""
+Set-based bulk updates for readings and expenses.
+
+Rows are selected by id or by filter, always within the requesting owner's
+data, and changed with UPDATE ... WHERE instead of a load-validate-save cycle
+per row. Rollups stay consistent: the monthly ledger gets one grouped delta
+per affected month, and the views bump the owner's data version on success.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+
+from .billing import FIRST_PERIOD, LAST_PERIOD
+from .models import ElectricityReading, Expense, MonthlyLedger
+from .summary import period_filter
+
+# Ids per UPDATE ... WHERE id IN (...), under every backend's bound-parameter limit
+UPDATE_BATCH_SIZE = 2000
+
+
+def _select(queryset, ids, filters):
+    """Narrows `queryset` to the given ids, or to the filter's fields and from/to period."""
+    if ids is not None:
+        return queryset.filter(pk__in=ids)
+    filters = dict(filters)
+    start, end = filters.pop('from', None), filters.pop('to', None)
+    if start or end:
+        queryset = queryset.filter(period_filter(start or FIRST_PERIOD, end or LAST_PERIOD))
+    for field, value in filters.items():
+        queryset = queryset.filter(**({f'{field}__isnull': True} if value is None else {field: value}))
+    return queryset
+
+
+def set_readings_paid(owner, is_paid, ids=None, filters=None):
+    """
+    Sets is_paid on the owner's readings selected by `ids` or `filters`
+    (tenant, from, to). Rows already in that state are left alone; the others
+    are locked, changed with UPDATE ... WHERE id IN (...), and their bills are
+    moved between electricity_paid and electricity_unpaid in the ledger with
+    one delta per month. Returns (matched, updated).
+    """
+    readings = _select(ElectricityReading.objects.filter(tenant__owner=owner), ids, filters or {})
+    with transaction.atomic():
+        # 1. Lock the selected rows and total the bills that change, per month
+        rows = list(
+            readings.select_for_update(of=('self',))
+            .order_by('pk')
+            .values_list('pk', 'is_paid', 'year', 'month', 'calculated_bill')
+        )
+        changing = [pk for pk, paid, _year, _month, _bill in rows if paid != is_paid]
+        moved = defaultdict(Decimal)
+        for _pk, paid, year, month, bill in rows:
+            if paid != is_paid:
+                moved[(year, month)] += bill
+
+        # 2. Flip them in batches of ids, then apply the grouped ledger deltas
+        for start in range(0, len(changing), UPDATE_BATCH_SIZE):
+            ElectricityReading.objects.filter(pk__in=changing[start:start + UPDATE_BATCH_SIZE]).update(
+                is_paid=is_paid
+            )
+        sign = 1 if is_paid else -1
+        for (year, month), amount in moved.items():
+            MonthlyLedger.objects.apply_delta(
+                owner.pk, year, month,
+                electricity_paid=sign * amount, electricity_unpaid=-sign * amount,
+            )
+    return len(rows), len(changing)
+
+
+def update_expenses(owner, changes, ids=None, filters=None):
+    """
+    Applies `changes` (category and/or description) to the owner's expenses
+    selected by `ids` or `filters` (category, from, to) with a single UPDATE.
+    Neither field feeds the ledger. Returns the number of rows updated.
+    """
+    expenses = _select(Expense.objects.filter(owner=owner), ids, filters or {})
+    changes = dict(changes)
+    if 'category' in changes:
+        changes['category_id'] = changes.pop('category')
+    return expenses.update(**changes)
@@ -0,0 +1,70 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .metrics import CACHE_REQUESTS
+
+# Seconds a cached summary may live even if the owner's data never changes
+SUMMARY_CACHE_TIMEOUT = getattr(settings, 'SUMMARY_CACHE_TIMEOUT', 300)
+SUMMARY_CACHE_ALIAS = getattr(settings, 'SUMMARY_CACHE_ALIAS', 'default')
+
+
+def _cache():
+    return caches[SUMMARY_CACHE_ALIAS]
+
+
+def _version_key(owner_id):
+    return f'owner-data-version:{owner_id}'
+
+
+def get_owner_version(owner_id):
+    """
+    Returns the owner's current data version.
+    A missing version (first use or eviction) is seeded from the clock, so it
+    can never match a version that older cache entries were stored under.
+    """
+    cache = _cache()
+    version = cache.get(_version_key(owner_id))
+    if version is None:
+        cache.add(_version_key(owner_id), time.time_ns(), timeout=None)
+        version = cache.get(_version_key(owner_id), time.time_ns())
+    return version
+
+
+def bump_owner_version(owner_id):
+    """Invalidates every cached response for the owner by moving to a new version."""
+    cache = _cache()
+    try:
+        cache.incr(_version_key(owner_id))
+    except ValueError:
+        cache.set(_version_key(owner_id), time.time_ns(), timeout=None)
+
+
+def bump_owner_version_on_commit(owner_id):
+    """
+    Bumps the version now and again once the current transaction commits
+    (just once in autocommit). The second bump drops anything a concurrent
+    request cached from the data as it was before the commit.
+    """
+    if transaction.get_connection().in_atomic_block:
+        bump_owner_version(owner_id)
+    transaction.on_commit(lambda: bump_owner_version(owner_id))
+
+
+def get_or_compute(owner_id, namespace, params, compute):
+    """
+    Returns (value, hit) for the owner's cached `namespace` entry keyed by
+    `params`, computing and storing it on a miss.
+    """
+    cache = _cache()
+    key = f'{namespace}:{owner_id}:{get_owner_version(owner_id)}:' + ':'.join(str(p) for p in params)
+    value = cache.get(key)
+    hit = value is not None
+    CACHE_REQUESTS.labels('summary', 'hit' if hit else 'miss').inc()
+    if not hit:
+        value = compute()
+        cache.set(key, value, SUMMARY_CACHE_TIMEOUT)
+    return value, hit
+
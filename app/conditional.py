@@ -0,0 +1,84 @@
+import datetime
+import hashlib
+
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .caching import get_owner_version
+
+
+def current_period(params):
+    """
+    (year, month) of today when neither ?month= nor ?year= is given, which the
+    readings list then defaults to; None when the URL names the period itself.
+    """
+    if params.get('month') or params.get('year'):
+        return None
+    today = datetime.date.today()
+    return today.year, today.month
+
+
+def owner_etag(request, period=None):
+    """
+    Cheap weak ETag for an owner-scoped GET: the owner's data version plus a
+    digest of the URL, Accept header and `period`. The response body is never
+    hashed. Endpoints that default to the current date pass the period the
+    default resolved to, so the same URL gets a new ETag when it changes.
+    """
+    variant = f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}|{period or ''}"
+    digest = hashlib.md5(variant.encode(), usedforsecurity=False).hexdigest()[:12]
+    return f'W/"{request.user.pk}-{get_owner_version(request.user.pk)}-{digest}"'
+
+
+def etag_matches(request, etag):
+    """Weak comparison of `etag` against the request's If-None-Match header."""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    # '*' is not honoured: whether the resource exists is unknown without a query
+    candidates = parse_etags(header)
+    bare = etag.removeprefix('W/')
+    return any(candidate.removeprefix('W/') == bare for candidate in candidates)
+
+
+def conditional_owner_response(request, build_response, period=None):
+    """
+    Answers 304 Not Modified when the client already holds the current version;
+    otherwise calls `build_response()` and stamps a successful response with the ETag.
+    """
+    etag = owner_etag(request, period)
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = build_response()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ('Accept', 'Authorization'))
+    return response
+
+
+class ConditionalOwnerMixin:
+    """
+    Adds ETag / If-None-Match handling to list and retrieve on owner-scoped viewsets.
+    A matching request is answered before the queryset or serializer is touched.
+    """
+
+    def etag_period(self):
+        """Period a date-dependent list default resolves to (see owner_etag); None if there is none."""
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return conditional_owner_response(
+            request, lambda: super(ConditionalOwnerMixin, self).list(request, *args, **kwargs),
+            self.etag_period(),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_owner_response(
+            request, lambda: super(ConditionalOwnerMixin, self).retrieve(request, *args, **kwargs)
+        )
@@ -0,0 +1,233 @@
+"""
+Read-replica routing.
+
+settings.DATABASE_REPLICA_URLS adds the aliases listed in
+READ_REPLICAS['ALIASES'] (replica1, replica2, ...). ReplicaRoutingMiddleware
+starts a RequestRouting for every request, and ReplicaRouter asks it where
+each read should go:
+
+- Unsafe methods (POST, PUT, PATCH, DELETE), and anything inside a
+  transaction, use the primary.
+- Reads before the user is known also use the primary. These are
+  authentication's own lookups, which CachedTokenAuthentication keeps rare.
+  A token created a moment ago is then always found.
+- A user who wrote within READ_REPLICAS['PIN_SECONDS'] is pinned to the
+  primary, so they read their own writes. Pins live in the shared cache, so
+  every worker honours them.
+- Otherwise one healthy replica is picked and used for the whole request.
+  A replica is healthy if it answers and is no more than
+  READ_REPLICAS['MAX_LAG_SECONDS'] behind. Each process checks this at most
+  once per CHECK_INTERVAL_SECONDS, from one thread while the others keep the
+  last result. With no healthy replica, reads fall back to the primary.
+  settings.py gives replica connections a connect and statement timeout, so
+  a hung replica fails the check instead of blocking it.
+
+Writes always go to the primary, and migrations never run on a replica.
+"""
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.functional import SimpleLazyObject
+
+logger = logging.getLogger('app.db_routing')
+
+# Defaults, overridable through settings.READ_REPLICAS
+READ_REPLICAS_DEFAULTS = {
+    'ALIASES': [],
+    'PIN_SECONDS': 10,              # keep a user on the primary this long after a write
+    'MAX_LAG_SECONDS': 5,           # replicas further behind than this are skipped
+    'CHECK_INTERVAL_SECONDS': 10,   # how often each process re-checks a replica
+    'CACHE_ALIAS': 'default',       # cache holding read-your-writes pins
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Seconds the replica is behind; 0 when it has replayed everything it received
+POSTGRES_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_routing = ContextVar('db_routing', default=None)
+
+
+def replica_config():
+    return {**READ_REPLICAS_DEFAULTS, **getattr(settings, 'READ_REPLICAS', {})}
+
+
+def _pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def pin_to_primary(user_id, config=None):
+    """Sends the user's reads to the primary for the next PIN_SECONDS."""
+    config = config or replica_config()
+    caches[config['CACHE_ALIAS']].set(_pin_key(user_id), 1, config['PIN_SECONDS'])
+
+
+def is_pinned(user_id, config=None):
+    config = config or replica_config()
+    return caches[config['CACHE_ALIAS']].get(_pin_key(user_id)) is not None
+
+
+class ReplicaHealth:
+    """Per-process, periodically refreshed view of which replicas can take reads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # alias -> (checked at, healthy, lag in seconds or None if unreachable)
+        self._status = {}
+        # Aliases a thread is checking right now
+        self._refreshing = set()
+
+    def healthy(self, aliases, config):
+        result = []
+        for alias in aliases:
+            status = self._refresh(alias, config)
+            if status is not None and status[1]:
+                result.append(alias)
+        return result
+
+    def _refresh(self, alias, config):
+        """
+        The replica's status, re-checked if older than CHECK_INTERVAL_SECONDS.
+        Only one thread checks a replica at a time; while it does, the others
+        use the last known status (None, i.e. skipped, before the first check),
+        so a hung replica stalls one request rather than all of them.
+        """
+        now = time.monotonic()
+        with self._lock:
+            status = self._status.get(alias)
+            if status is not None and now - status[0] < config['CHECK_INTERVAL_SECONDS']:
+                return status
+            if alias in self._refreshing:
+                return status
+            self._refreshing.add(alias)
+        try:
+            lag = self.measure_lag(alias)
+        finally:
+            with self._lock:
+                self._refreshing.discard(alias)
+        status = (time.monotonic(), lag is not None and lag <= config['MAX_LAG_SECONDS'], lag)
+        with self._lock:
+            self._status[alias] = status
+        if not status[1]:
+            logger.warning('Replica %s skipped for reads (lag: %s)', alias, lag)
+        return status
+
+    def mark_down(self, alias):
+        """Skips the replica until its next check, e.g. after a query on it failed."""
+        with self._lock:
+            self._status[alias] = (time.monotonic(), False, None)
+
+    def status(self):
+        """{alias: {'healthy': bool, 'lag_seconds': float or None}} as last checked."""
+        with self._lock:
+            return {
+                alias: {'healthy': healthy, 'lag_seconds': lag}
+                for alias, (_checked, healthy, lag) in self._status.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._status.clear()
+
+    @staticmethod
+    def measure_lag(alias):
+        """Replication lag of `alias` in seconds, or None if it cannot be reached."""
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute(POSTGRES_LAG_SQL)
+                    return float(cursor.fetchone()[0] or 0)
+                # Other backends have no replication to measure; a reachable replica is current
+                cursor.execute('SELECT 1')
+                return 0.0
+        except DatabaseError:
+            logger.exception('Replica %s is unreachable', alias)
+            connection.close()
+            return None
+
+
+replica_health = ReplicaHealth()
+
+
+class RequestRouting:
+    """Where one request's reads go, decided at its first read once the user is known."""
+
+    def __init__(self, request, config):
+        self.request = request
+        self.config = config
+        self.safe = request.method in SAFE_METHODS
+        self.alias = None
+        self.reason = 'primary'
+        # Replica whose query failed, set by ReplicaRoutingMiddleware.process_exception()
+        self.failed_on = None
+
+    def read_alias(self):
+        if self.alias is not None:
+            return self.alias
+        if not self.safe:
+            return DEFAULT_DB_ALIAS
+        user = getattr(self.request, 'user', None)
+        # Authentication has not resolved the user yet: decide at a later read
+        if user is None or isinstance(user, SimpleLazyObject):
+            return DEFAULT_DB_ALIAS
+        if user.is_authenticated and is_pinned(user.pk, self.config):
+            self.use_primary('pinned')
+        else:
+            replicas = replica_health.healthy(self.config['ALIASES'], self.config)
+            if replicas:
+                self.alias, self.reason = random.choice(replicas), 'replica'
+            else:
+                self.use_primary('fallback')
+        return self.alias
+
+    def use_primary(self, reason):
+        self.alias, self.reason = DEFAULT_DB_ALIAS, reason
+
+    @property
+    def on_replica(self):
+        return self.alias not in (None, DEFAULT_DB_ALIAS)
+
+
+def current_routing():
+    return _routing.get()
+
+
+class ReplicaRouter:
+    """Sends reads where the current request's RequestRouting says; everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return routing.read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db in replica_config()['ALIASES'] else None
+
+
+def start_routing(request, config):
+    routing = RequestRouting(request, config)
+    return routing, _routing.set(routing)
+
+
+def stop_routing(token):
+    _routing.reset(token)
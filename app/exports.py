@@ -0,0 +1,108 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+# Rows fetched per database round trip while streaming
+EXPORT_CHUNK_SIZE = 2000
+# Approximate number of bytes buffered before a chunk is sent to the client
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+EXPENSE_EXPORT_FIELDS = {
+    'id': 'id',
+    'date': 'date',
+    'category': 'category_id',
+    'category_name': 'category__name',
+    'amount': 'amount',
+    'description': 'description',
+    'month': 'month',
+    'year': 'year',
+}
+
+READING_EXPORT_FIELDS = {
+    'id': 'id',
+    'tenant': 'tenant_id',
+    'tenant_name': 'tenant__name',
+    'tenant_room_no': 'tenant__room_no',
+    'month': 'month',
+    'year': 'year',
+    'previous_reading': 'previous_reading',
+    'current_reading': 'current_reading',
+    'rate_per_unit': 'rate_per_unit',
+    'total_units': 'total_units',
+    'calculated_bill': 'calculated_bill',
+    'is_paid': 'is_paid',
+}
+
+
+class CSVRenderer(JSONRenderer):
+    """
+    Lets content negotiation pick a CSV export for Accept: text/csv. The rows
+    are streamed by stream_export(); only error bodies are rendered, as JSON.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONRenderer(CSVRenderer):
+    """Lets content negotiation pick an NDJSON export for Accept: application/x-ndjson."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+# Renderers of the export actions: JSON first, so Accept: */* keeps the ?output= default
+EXPORT_RENDERERS = [JSONRenderer, CSVRenderer, NDJSONRenderer]
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(rows, columns):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def _buffered(lines):
+    """Groups small lines into larger chunks to cut per-chunk overhead."""
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_BUFFER_SIZE:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_export(queryset, fields, output, filename):
+    """
+    Streams `queryset` as CSV or NDJSON without materialising it.
+    `fields` maps output column names to queryset lookups; rows are read with
+    values_list().iterator() so memory use does not grow with the export size.
+    """
+    columns = list(fields)
+    rows = queryset.values_list(*fields.values()).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    lines = _csv_lines(rows, columns) if output == 'csv' else _ndjson_lines(rows, columns)
+
+    response = StreamingHttpResponse(_buffered(lines), content_type=EXPORT_FORMATS[output])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
@@ -0,0 +1,156 @@
+"""
+Read-optimized list serialization.
+
+List endpoints fetch exactly the columns their serializer outputs with a single
+.values() query (related names such as owner_username become joined columns),
+then build the response dicts from a field mapping compiled once per
+serializer class. No model instances or per-row serializers are created, and
+the JSON is identical to what the ModelSerializer would produce.
+"""
+from django.db.models import F
+from rest_framework import serializers, status
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+
+# Fields whose to_representation() returns database values unchanged
+_PASSTHROUGH_FIELDS = (
+    serializers.ReadOnlyField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.CharField,
+)
+
+_compiled = {}
+_supported = {}
+
+
+def compile_fields(serializer_class):
+    """
+    Returns [(name, lookup, to_representation or None, guard)] in the
+    serializer's field order. The converter is the serializer field's own
+    to_representation (e.g. DecimalField's quantized string), or None when
+    values pass through. `guard` names an extra column holding the nullable
+    relation a dotted source goes through: the serializer omits such a field
+    when the relation is empty (e.g. category_name for an uncategorized expense).
+    """
+    if serializer_class not in _compiled:
+        model = serializer_class.Meta.model
+        mapping = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                # values('owner') yields the primary key, which is what the field outputs
+                lookup = field.source
+            else:
+                lookup = '__'.join(field.source_attrs)
+            guard = None
+            if len(field.source_attrs) > 1 and model._meta.get_field(field.source_attrs[0]).null:
+                guard = f'_{name}_via'
+            convert = None if isinstance(field, _PASSTHROUGH_FIELDS) else field.to_representation
+            mapping.append((name, lookup, convert, guard))
+        _compiled[serializer_class] = mapping
+    return _compiled[serializer_class]
+
+
+def supports_values(serializer_class):
+    """False for serializers with nested or many-valued fields, which .values() cannot produce."""
+    if serializer_class not in _supported:
+        _supported[serializer_class] = not any(
+            isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField))
+            for field in serializer_class().fields.values()
+        )
+    return _supported[serializer_class]
+
+
+def select_fields(mapping, params):
+    """
+    Narrows a compiled mapping to the ?fields= / ?omit= query params
+    (comma-separated field names). Raises ValueError for unknown names.
+    """
+    known = [entry[0] for entry in mapping]
+    wanted = [name for name in params.get('fields', '').split(',') if name]
+    omitted = [name for name in params.get('omit', '').split(',') if name]
+    unknown = sorted(set(wanted + omitted) - set(known))
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(known)}.")
+    return [
+        entry for entry in mapping
+        if (not wanted or entry[0] in wanted) and entry[0] not in omitted
+    ]
+
+
+def values_queryset(queryset, mapping, extra=()):
+    """
+    `queryset` reduced to one dict per row holding only the mapping's columns,
+    keyed by field name. `extra` model fields are fetched too but not output
+    (cursor pagination reads its ordering fields from each row).
+    """
+    plain, aliased = [], {}
+    for name, lookup, _convert, guard in mapping:
+        if name == lookup:
+            plain.append(name)
+        else:
+            aliased[name] = F(lookup)
+        if guard:
+            aliased[guard] = F(lookup.split('__')[0])
+    plain += [name for name in extra if name not in plain and name not in aliased]
+    return queryset.values(*plain, **aliased)
+
+
+def serialize_values(rows, mapping):
+    """Converts rows from values_queryset() into the serializer's output."""
+    data = []
+    for row in rows:
+        item = {}
+        for name, _lookup, convert, guard in mapping:
+            if guard and row[guard] is None:
+                continue
+            value = row[name]
+            item[name] = value if convert is None or value is None else convert(value)
+        data.append(item)
+    return data
+
+
+class FastListMixin:
+    """
+    Serves list() from values_queryset()/serialize_values(), keeping the
+    viewset's filtering, ordering and pagination, and honours ?fields= and
+    ?omit= on GET requests. Lists only select the requested columns; other
+    actions, and lists of serializers with nested fields, drop the
+    unrequested serializer fields before serializing.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if not supports_values(serializer_class):
+            return super().list(request, *args, **kwargs)
+        try:
+            mapping = select_fields(compile_fields(serializer_class), request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        rows = values_queryset(
+            self.filter_queryset(self.get_queryset()), mapping, extra=[field.lstrip('-') for field in ordering]
+        )
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serialize_values(page, mapping))
+        return Response(serialize_values(rows, mapping))
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        params = self.request.query_params
+        # Writes keep every field, so ?fields= can never drop submitted data
+        if self.request.method == 'GET' and ('fields' in params or 'omit' in params):
+            target = getattr(serializer, 'child', serializer)
+            try:
+                selected = {entry[0] for entry in select_fields(compile_fields(type(target)), params)}
+            except ValueError as e:
+                raise ParseError({"error": str(e)})
+            for name in list(target.fields):
+                if name not in selected:
+                    target.fields.pop(name)
+        return serializer
@@ -0,0 +1,139 @@
+import csv
+import datetime
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .models import Expense, ExpenseCategory, MonthlyLedger
+
+# Rows inserted per INSERT statement
+IMPORT_CHUNK_SIZE = 500
+# Largest amount that fits Expense.amount (max_digits=10, decimal_places=2)
+MAX_AMOUNT = Decimal('99999999.99')
+
+
+def _parse_row(row):
+    """
+    Validates one CSV row. Returns (values, errors) where values holds the
+    parsed date, amount, category name and description.
+    """
+    errors = {}
+    values = {
+        'category': (row.get('category') or '').strip(),
+        'description': (row.get('description') or '').strip(),
+    }
+
+    try:
+        values['date'] = datetime.date.fromisoformat((row.get('date') or '').strip())
+    except ValueError:
+        errors['date'] = ["Enter a valid date in YYYY-MM-DD format."]
+
+    try:
+        amount = Decimal((row.get('amount') or '').strip().replace(',', ''))
+        if not amount.is_finite() or amount <= 0 or amount > MAX_AMOUNT:
+            raise InvalidOperation
+        values['amount'] = amount.quantize(Decimal('0.01'))
+    except InvalidOperation:
+        errors['amount'] = [f"Enter a positive amount no greater than {MAX_AMOUNT}."]
+
+    return values, errors
+
+
+def _resolve_categories(owner, names, create_missing):
+    """
+    Maps category names to the owner's ExpenseCategory ids in one query,
+    optionally creating missing ones with a single bulk insert.
+    Returns (categories, created_names).
+    """
+    categories = dict(
+        ExpenseCategory.objects.filter(owner=owner, name__in=names).values_list('name', 'id')
+    )
+    missing = names - categories.keys()
+    if not (missing and create_missing):
+        return categories, []
+
+    # Category names are unique across all owners, so some may be taken
+    ExpenseCategory.objects.bulk_create(
+        [ExpenseCategory(owner=owner, name=name) for name in sorted(missing)],
+        ignore_conflicts=True,
+    )
+    created = dict(
+        ExpenseCategory.objects.filter(owner=owner, name__in=missing).values_list('name', 'id')
+    )
+    categories.update(created)
+    return categories, sorted(created)
+
+
+def import_expenses_csv(owner, lines, create_missing_categories=False, partial=False,
+                        chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Imports expenses for `owner` from CSV `lines` with the header
+    date,amount,category,description (category and description optional).
+    `lines` is a file opened with newline='' (or io.StringIO(text, newline='')),
+    so quoted fields may contain line breaks.
+
+    Categories are resolved in one query, rows are inserted with bulk_create
+    in chunks and the MonthlyLedger is updated once per month, all in one
+    transaction. By default nothing is saved if any row is invalid; with
+    `partial` the valid rows are saved and the invalid ones reported.
+
+    Returns a report: {"created", "errors": [{"line", "errors"}], "categories_created"}.
+    """
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames or not {'date', 'amount'} <= {f.strip() for f in reader.fieldnames}:
+        return {
+            "created": 0,
+            "errors": [{"line": 1, "errors": {"header": ["CSV must have 'date' and 'amount' columns."]}}],
+            "categories_created": [],
+        }
+    reader.fieldnames = [name.strip() for name in reader.fieldnames]
+
+    # 1. Parse and validate every row without touching the database
+    parsed = []
+    errors = []
+    for row in reader:
+        values, row_errors = _parse_row(row)
+        if row_errors:
+            errors.append({"line": reader.line_num, "errors": row_errors})
+        else:
+            parsed.append((reader.line_num, values))
+
+    with transaction.atomic():
+        # 2. Resolve (and optionally create) categories in bulk
+        names = {values['category'] for _line, values in parsed if values['category']}
+        categories, created_categories = _resolve_categories(owner, names, create_missing_categories)
+
+        # 3. Build the expenses, computing month/year as Expense.save() would
+        expenses = []
+        for line, values in parsed:
+            name = values['category']
+            if name and name not in categories:
+                message = "Category name is already used by another account." if create_missing_categories \
+                    else "Unknown category. Create it first or enable creating missing categories."
+                errors.append({"line": line, "errors": {"category": [message]}})
+                continue
+            expenses.append(Expense(
+                owner=owner,
+                category_id=categories.get(name),
+                amount=values['amount'],
+                date=values['date'],
+                description=values['description'],
+                month=values['date'].month,
+                year=values['date'].year,
+            ))
+
+        errors.sort(key=lambda error: error['line'])
+        if errors and not partial:
+            transaction.set_rollback(True)
+            return {"created": 0, "errors": errors, "categories_created": []}
+
+        # 4. Insert in chunks and roll the totals into the ledger once per month
+        Expense.objects.bulk_create(expenses, batch_size=chunk_size)
+        month_totals = defaultdict(Decimal)
+        for expense in expenses:
+            month_totals[(expense.year, expense.month)] += expense.amount
+        for (year, month), total in month_totals.items():
+            MonthlyLedger.objects.apply_delta(owner.pk, year, month, total_expenses=total)
+
+    return {"created": len(expenses), "errors": errors, "categories_created": created_categories}
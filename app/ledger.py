@@ -0,0 +1,107 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from .models import ElectricityReading, Expense, MonthlyLedger
+
+ZERO = Decimal('0.00')
+LEDGER_FIELDS = (
+    'electricity_billed', 'electricity_paid',
+    'electricity_unpaid', 'total_expenses',
+)
+
+
+def _cents(value):
+    return Decimal(value).quantize(Decimal('0.01'))
+
+
+def expected_ledger_rows(owner_ids=None):
+    """
+    Recomputes the ledger from the raw tables with one GROUP BY per table.
+    Returns {(owner_id, year, month): {field: Decimal}}.
+    """
+    readings = ElectricityReading.objects.all()
+    expenses = Expense.objects.exclude(owner__isnull=True)
+    if owner_ids is not None:
+        readings = readings.filter(tenant__owner_id__in=owner_ids)
+        expenses = expenses.filter(owner_id__in=owner_ids)
+
+    rows = defaultdict(lambda: dict.fromkeys(LEDGER_FIELDS, ZERO))
+
+    # 1. Electricity per owner/month
+    reading_totals = readings.values('tenant__owner_id', 'year', 'month').annotate(
+        billed=Sum('calculated_bill'),
+        paid=Sum('calculated_bill', filter=Q(is_paid=True)),
+    )
+    for row in reading_totals:
+        entry = rows[(row['tenant__owner_id'], row['year'], row['month'])]
+        paid = row['paid'] or ZERO
+        entry['electricity_billed'] = row['billed']
+        entry['electricity_paid'] = paid
+        entry['electricity_unpaid'] = row['billed'] - paid
+
+    # 2. Other expenses per owner/month
+    expense_totals = expenses.values('owner_id', 'year', 'month').annotate(total=Sum('amount'))
+    for row in expense_totals:
+        rows[(row['owner_id'], row['year'], row['month'])]['total_expenses'] = row['total']
+
+    return dict(rows)
+
+
+def ledger_drift(owner_ids=None):
+    """
+    Compares stored ledger rows with a fresh recomputation.
+    Returns a list of (key, field, stored, expected) tuples; empty means no drift.
+    """
+    expected = expected_ledger_rows(owner_ids)
+    stored_qs = MonthlyLedger.objects.all()
+    if owner_ids is not None:
+        stored_qs = stored_qs.filter(owner_id__in=owner_ids)
+    stored = {
+        (row['owner_id'], row['year'], row['month']): row
+        for row in stored_qs.values('owner_id', 'year', 'month', *LEDGER_FIELDS)
+    }
+
+    drift = []
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key)
+        have = stored.get(key)
+        # A stored row with no underlying data only matters if it is non-zero
+        if want is None:
+            want = dict.fromkeys(LEDGER_FIELDS, ZERO)
+        for field in LEDGER_FIELDS:
+            stored_value = have[field] if have else None
+            # Quantize both sides: SQLite sums decimals as floats (e.g. 2956909.55999999)
+            if stored_value is None or _cents(stored_value) != _cents(want[field]):
+                drift.append((key, field, stored_value, want[field]))
+    return drift
+
+
+def rebuild_ledger(owner_ids=None):
+    """Replaces the ledger rows (optionally for some owners) with a fresh recomputation."""
+    with transaction.atomic():
+        expected = expected_ledger_rows(owner_ids)
+        stored_qs = MonthlyLedger.objects.all()
+        if owner_ids is not None:
+            stored_qs = stored_qs.filter(owner_id__in=owner_ids)
+        stored_qs.delete()
+        MonthlyLedger.objects.bulk_create(
+            [
+                MonthlyLedger(owner_id=owner_id, year=year, month=month, **fields)
+                for (owner_id, year, month), fields in expected.items()
+            ],
+            batch_size=1000,
+        )
+    return len(expected)
+
+
+def ledger_totals(owner, month, year):
+    """
+    Returns the electricity and expense totals for one owner/month with a
+    single indexed lookup (rent depends on occupancy and is computed by
+    summary.rent_by_month). Months with no readings or expenses have no row.
+    """
+    row = MonthlyLedger.objects.filter(owner=owner, year=year, month=month).values(*LEDGER_FIELDS).first()
+    return row if row is not None else dict.fromkeys(LEDGER_FIELDS, ZERO)
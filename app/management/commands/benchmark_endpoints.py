@@ -0,0 +1,316 @@
+import datetime
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.urls import URLPattern, URLResolver, reverse
+from rest_framework.authtoken.models import Token
+
+from app import urls as app_urls
+from app.caching import bump_owner_version
+from app.models import Tenant, ElectricityReading, ExpenseCategory, Expense, Tariff, TariffSlab
+
+User = get_user_model()
+
+BENCH_USERNAME = '__benchmark_user__'
+BENCH_PASSWORD = 'benchmark-password'
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class QueryCounter:
+    """
+    connection.execute_wrapper() hook counting statements. CaptureQueriesContext
+    cannot be used here because request_started clears connection.queries.
+    Queries that async views run on their own worker-thread connections are not seen.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Savepoint statements issued by the harness itself are not counted
+        if 'SAVEPOINT' not in sql.upper():
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+def route_names(patterns):
+    """Every named route under `patterns`, including the router's."""
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= route_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def build_scenarios(ctx):
+    """
+    (url_name, method, path, data, content_type, auth) for every benchmarked request.
+    `ctx` holds sample objects owned by the benchmarked landlord. Writes are
+    rolled back after each iteration, so they can reuse the same payloads.
+    """
+    month, year = ctx['month'], ctx['year']
+    period = f'?month={month}&year={year}'
+    window = f"?from={year - 1}-{month:02d}&to={year}-{month:02d}"
+    # A period with no readings, so creates do not hit the unique constraint
+    next_year = datetime.date.today().year + 1
+    tenant, reading, category, expense = ctx['tenant'], ctx['reading'], ctx['category'], ctx['expense']
+    tariff = ctx['tariff']
+    csv_body = 'date,amount,category,description\n' + ''.join(
+        f'{year}-{month:02d}-{day:02d},{100 + day}.00,{category.name},Benchmark row\n' for day in range(1, 21)
+    )
+    detail = lambda name, obj: reverse(name, kwargs={'pk': obj.pk})
+
+    scenarios = [
+        ('api-root', 'get', reverse('api-root'), None, None, 'owner'),
+        ('health_check', 'get', reverse('health_check'), None, None, None),
+        ('register', 'post', reverse('register'),
+         {'username': '__benchmark_new__', 'email': 'new@example.com', 'password': BENCH_PASSWORD}, None, None),
+        ('login', 'post', reverse('login'), {'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}, None, None),
+        ('logout', 'post', reverse('logout'), None, None, 'bench'),
+
+        ('monthly_summary', 'get', reverse('monthly_summary') + period, None, None, 'owner'),
+        ('summary_range', 'get', reverse('summary_range') + window, None, None, 'owner'),
+        ('dashboard', 'get', reverse('dashboard') + period, None, None, 'owner'),
+        ('async_monthly_summary', 'get', reverse('async_monthly_summary') + period, None, None, 'owner'),
+        ('async_summary_range', 'get', reverse('async_summary_range') + window, None, None, 'owner'),
+        ('async_tenant_list', 'get', reverse('async_tenant_list'), None, None, 'owner'),
+        ('async_category_list', 'get', reverse('async_category_list'), None, None, 'owner'),
+        ('async_expense_list', 'get', reverse('async_expense_list') + f'?year={year}', None, None, 'owner'),
+        ('async_reading_list', 'get', reverse('async_reading_list') + f'?year={year}', None, None, 'owner'),
+
+        ('tenant-list', 'get', reverse('tenant-list'), None, None, 'owner'),
+        ('tenant-list', 'post', reverse('tenant-list'),
+         {'name': 'Benchmark', 'room_no': 'BENCH', 'contact_no': '0', 'rent': '5000.00'}, None, 'owner'),
+        ('tenant-detail', 'get', detail('tenant-detail', tenant), None, None, 'owner'),
+        ('tenant-detail', 'patch', detail('tenant-detail', tenant), {'rent': '9999.00'}, None, 'owner'),
+        ('tenant-detail', 'delete', detail('tenant-detail', tenant), None, None, 'owner'),
+
+        ('electricityreading-list', 'get', reverse('electricityreading-list') + f'?year={year}', None, None, 'owner'),
+        ('electricityreading-list', 'post', reverse('electricityreading-list'),
+         {'tenant': tenant.pk, 'month': 1, 'year': next_year, 'previous_reading': '999000.00',
+          'current_reading': '999999.00', 'rate_per_unit': '8.00'}, None, 'owner'),
+        ('electricityreading-detail', 'get', detail('electricityreading-detail', reading), None, None, 'owner'),
+        ('electricityreading-detail', 'patch', detail('electricityreading-detail', reading),
+         {'is_paid': not reading.is_paid}, None, 'owner'),
+        ('electricityreading-detail', 'delete', detail('electricityreading-detail', reading), None, None, 'owner'),
+        ('electricityreading-bulk-close', 'post', reverse('electricityreading-bulk-close'),
+         {'month': 1, 'year': next_year, 'rate_per_unit': '8.00',
+          'readings': [{'tenant': t.pk, 'current_reading': '999999.00'} for t in ctx['tenants']]}, None, 'owner'),
+        ('electricityreading-export', 'get', reverse('electricityreading-export') + f'?year={year}&output=csv',
+         None, None, 'owner'),
+        ('electricityreading-bulk-update', 'post', reverse('electricityreading-bulk-update'),
+         {'filter': {'to': f'{year}-{month:02d}'}, 'set': {'is_paid': True}}, None, 'owner'),
+        ('electricityreading-outstanding', 'get', reverse('electricityreading-outstanding'), None, None, 'owner'),
+        ('electricityreading-get-previous-reading', 'get',
+         reverse('electricityreading-get-previous-reading') + f'?tenant_id={tenant.pk}&month={month}&year={year}',
+         None, None, 'owner'),
+
+        ('expensecategory-list', 'get', reverse('expensecategory-list'), None, None, 'owner'),
+        ('expensecategory-list', 'post', reverse('expensecategory-list'),
+         {'name': '__benchmark_category__', 'description': ''}, None, 'owner'),
+        ('expensecategory-detail', 'get', detail('expensecategory-detail', category), None, None, 'owner'),
+        ('expensecategory-detail', 'patch', detail('expensecategory-detail', category),
+         {'description': 'Benchmark'}, None, 'owner'),
+        ('expensecategory-detail', 'delete', detail('expensecategory-detail', category), None, None, 'owner'),
+
+        ('expense-list', 'get', reverse('expense-list') + f'?year={year}', None, None, 'owner'),
+        ('expense-bulk-update', 'post', reverse('expense-bulk-update'),
+         {'filter': {'from': f'{year}-{month:02d}', 'to': f'{year}-{month:02d}'},
+          'set': {'category': category.pk}}, None, 'owner'),
+        ('expense-search', 'get', reverse('expense-search') + '?q=' + category.name.split()[0][:4],
+         None, None, 'owner'),
+        ('expense-breakdown', 'get', reverse('expense-breakdown') + window + '&top=3', None, None, 'owner'),
+        ('expense-list', 'post', reverse('expense-list'),
+         {'category': category.pk, 'amount': '250.00', 'date': f'{year}-{month:02d}-15',
+          'month': month, 'year': year, 'description': 'Benchmark'}, None, 'owner'),
+        ('expense-detail', 'get', detail('expense-detail', expense), None, None, 'owner'),
+        ('expense-detail', 'patch', detail('expense-detail', expense), {'amount': '123.45'}, None, 'owner'),
+        ('expense-detail', 'delete', detail('expense-detail', expense), None, None, 'owner'),
+        ('expense-export', 'get', reverse('expense-export') + f'?year={year}&output=ndjson', None, None, 'owner'),
+        ('expense-import-csv', 'post', reverse('expense-import-csv'), csv_body, 'text/csv', 'owner'),
+
+        ('tariff-list', 'get', reverse('tariff-list'), None, None, 'owner'),
+        ('tariff-list', 'post', reverse('tariff-list'),
+         {'name': 'Benchmark', 'effective_from': f'{next_year}-02-01', 'fixed_charge': '50.00',
+          'slabs': [{'lower_units': '0', 'upper_units': '100', 'rate': '5.00'},
+                    {'lower_units': '100', 'upper_units': None, 'rate': '8.00'}]}, None, 'owner'),
+        ('tariff-detail', 'get', detail('tariff-detail', tariff), None, None, 'owner'),
+        ('tariff-detail', 'patch', detail('tariff-detail', tariff), {'fixed_charge': '75.00'}, None, 'owner'),
+        ('tariff-detail', 'delete', detail('tariff-detail', tariff), None, None, 'owner'),
+        ('tariff-recompute', 'post', reverse('tariff-recompute') + f'?from={year}-01&to={year}-12', None, None, 'owner'),
+    ]
+    return scenarios
+
+
+class Command(BaseCommand):
+    """
+    Drives every route in app/urls.py through the Django test client against the
+    configured database and reports latency percentiles, queries per request and
+    peak memory as JSON, e.g. to diff between releases:
+        python manage.py generate_synthetic_data --landlords 5 --tenants 100 --years 3 --seed 1
+        python manage.py benchmark_endpoints --owner synthetic_0 --iterations 50 --output bench.json
+    Everything runs inside a transaction that is rolled back, so writes leave no trace.
+    """
+    help = "Benchmark every API route with the Django test client and print JSON results."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', help="Username of the landlord whose data is used (default: most tenants).")
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--cold', action='store_true',
+                            help="Invalidate the owner's response cache before every request.")
+        parser.add_argument('--only', nargs='*', default=None, help="Only run these route names.")
+        parser.add_argument('--output', help="Write the JSON report to this file as well as stdout.")
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        owner = self._owner(options['owner'])
+
+        with transaction.atomic():
+            ctx = self._context(owner)
+            scenarios = build_scenarios(ctx)
+            if options['only']:
+                scenarios = [s for s in scenarios if s[0] in options['only']]
+            results = {}
+            for scenario in scenarios:
+                url_name, method = scenario[0], scenario[1]
+                self.stderr.write(f"{method.upper():6} {url_name}")
+                results[f'{method.upper()} {url_name}'] = self._run(scenario, ctx, options)
+            transaction.set_rollback(True)
+
+        covered = {s[0] for s in build_scenarios(ctx)}
+        report = {
+            'meta': {
+                'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'owner': owner.username,
+                'iterations': options['iterations'],
+                'cold_cache': options['cold'],
+                'dataset': ctx['dataset'],
+            },
+            'routes': results,
+            'uncovered_routes': sorted(route_names(app_urls.urlpatterns) - covered),
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        self.stdout.write(output)
+
+    def _owner(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"User '{username}' does not exist.")
+        owner = User.objects.annotate(n=Count('owned_tenants')).filter(n__gt=0).order_by('-n').first()
+        if owner is None:
+            raise CommandError("No landlord with tenants found; run generate_synthetic_data first.")
+        return owner
+
+    def _context(self, owner):
+        """Sample objects and tokens used by the scenarios (created inside the rolled-back transaction)."""
+        reading = (ElectricityReading.objects.filter(tenant__owner=owner)
+                   .select_related('tenant').order_by('-year', '-month', 'id').first())
+        expense = Expense.objects.filter(owner=owner).select_related('category').order_by('-date', 'id').first()
+        if reading is None or expense is None:
+            raise CommandError(f"'{owner.username}' needs at least one reading and one expense.")
+        bench_user = User.objects.create_user(BENCH_USERNAME, password=BENCH_PASSWORD, is_superuser=True)
+        tariff = Tariff.objects.filter(owner=owner).first()
+        if tariff is None:
+            tariff = Tariff.objects.create(owner=owner, name='Benchmark', effective_from=datetime.date(2000, 1, 1))
+            TariffSlab.objects.create(tariff=tariff, lower_units=0, rate=reading.rate_per_unit)
+        return {
+            'owner_token': Token.objects.get_or_create(user=owner)[0].key,
+            'bench_token': Token.objects.create(user=bench_user).key,
+            'owner': owner,
+            'tenant': reading.tenant,
+            'tenants': list(Tenant.objects.filter(owner=owner).order_by('id')[:20]),
+            'reading': reading,
+            'category': expense.category,
+            'expense': expense,
+            'tariff': tariff,
+            'month': reading.month,
+            'year': reading.year,
+            'dataset': {
+                'tenants': Tenant.objects.filter(owner=owner).count(),
+                'readings': ElectricityReading.objects.filter(tenant__owner=owner).count(),
+                'expenses': Expense.objects.filter(owner=owner).count(),
+                'categories': ExpenseCategory.objects.filter(owner=owner).count(),
+            },
+        }
+
+    def _request(self, client, scenario, ctx, cold):
+        url_name, method, path, data, content_type, auth = scenario
+        if cold:
+            bump_owner_version(ctx['owner'].pk)
+        headers = {'Authorization': f"Token {ctx[f'{auth}_token']}"} if auth else {}
+        kwargs = {'headers': headers}
+        if data is not None:
+            kwargs['data'] = data if content_type else json.dumps(data)
+            kwargs['content_type'] = content_type or 'application/json'
+
+        # Every request runs in a savepoint that is rolled back, so writes are repeatable
+        savepoint = transaction.savepoint()
+        try:
+            started = time.perf_counter()
+            response = getattr(client, method)(path, **kwargs)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - started
+        finally:
+            transaction.savepoint_rollback(savepoint)
+        return response, elapsed
+
+    def _run(self, scenario, ctx, options):
+        client = Client()
+        for _ in range(options['warmup']):
+            self._request(client, scenario, ctx, options['cold'])
+
+        latencies = []
+        for _ in range(options['iterations']):
+            response, elapsed = self._request(client, scenario, ctx, options['cold'])
+            latencies.append(elapsed * 1000)
+
+        # Query counting and tracemalloc both slow requests down, so they get their own runs
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            self._request(client, scenario, ctx, options['cold'])
+        tracemalloc.start()
+        try:
+            self._request(client, scenario, ctx, options['cold'])
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            'path': scenario[2],
+            'status': response.status_code,
+            'p50_ms': round(percentile(latencies, 0.50), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'queries': queries.count,
+            'peak_memory_kib': round(peak / 1024, 1),
+        }
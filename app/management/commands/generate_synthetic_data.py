@@ -0,0 +1,176 @@
+import datetime
+import random
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from app.ledger import rebuild_ledger
+from app.models import Tenant, ElectricityReading, ExpenseCategory, Expense
+from app.populate_data import CATEGORIES_TO_CREATE
+
+User = get_user_model()
+
+BATCH_SIZE = 2000
+# Typical spend per visit for each default category (median, in rupees)
+CATEGORY_MEDIANS = {'Plumber': 900, 'Carpenter': 1500, 'Painter': 4000, 'Electrician': 700, 'Pest': 1200}
+# Monthly consumption multiplier, heavier in summer (fans/AC) and mid-winter
+SEASONALITY = [0.9, 0.85, 1.0, 1.25, 1.45, 1.5, 1.3, 1.2, 1.1, 1.0, 0.9, 0.95]
+
+
+class Command(BaseCommand):
+    """
+    Generates production-scale synthetic data: N landlords x M tenants x Y years
+    of monthly readings and expenses, inserted with bulk_create.
+    Usage:
+        python manage.py generate_synthetic_data --landlords 20 --tenants 50 --years 3 --seed 7
+    All generated landlords share the password given by --password (default "password").
+    """
+    help = "Bulk-generate synthetic landlords, tenants, readings and expenses for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--landlords', type=int, default=10)
+        parser.add_argument('--tenants', type=int, default=20, help="Tenants per landlord.")
+        parser.add_argument('--years', type=int, default=2, help="Years of history ending this month.")
+        parser.add_argument('--expenses-per-month', type=float, default=4.0,
+                            help="Average expenses per landlord per month.")
+        parser.add_argument('--seed', type=int, default=None, help="Random seed for reproducible data.")
+        parser.add_argument('--password', default='password')
+        parser.add_argument('--prefix', default='synthetic', help="Username prefix for generated landlords.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=f'{prefix}_').exists():
+            raise CommandError(f"Users with prefix '{prefix}_' already exist; pass a different --prefix.")
+
+        today = datetime.date.today()
+        months = self._months(today, options['years'])
+
+        with transaction.atomic():
+            owners = self._landlords(prefix, options['landlords'], options['password'])
+            categories = self._categories(owners)
+            tenants = self._tenants(rng, owners, options['tenants'], months[0])
+            readings = self._readings(rng, tenants, months, today)
+            expenses = self._expenses(rng, owners, categories, months, options['expenses_per_month'])
+            rebuild_ledger([owner.pk for owner in owners])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(owners)} landlords, {len(tenants)} tenants, "
+            f"{readings} readings and {expenses} expenses over {len(months)} months."
+        ))
+
+    @staticmethod
+    def _months(today, years):
+        months = []
+        year, month = today.year - years, today.month
+        for _ in range(years * 12):
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            months.append((year, month))
+        return months
+
+    def _landlords(self, prefix, count, password):
+        password_hash = make_password(password)
+        User.objects.bulk_create([
+            User(username=f'{prefix}_{i}', email=f'{prefix}_{i}@example.com', password=password_hash,
+                 is_superuser=True, is_staff=True)
+            for i in range(count)
+        ], batch_size=BATCH_SIZE)
+        return list(User.objects.filter(username__startswith=f'{prefix}_').order_by('pk'))
+
+    def _categories(self, owners):
+        # Category names are unique across all owners, so suffix them per landlord
+        ExpenseCategory.objects.bulk_create([
+            ExpenseCategory(owner=owner, name=f'{name} #{owner.pk}', description=description)
+            for owner in owners for name, description in CATEGORIES_TO_CREATE
+        ], batch_size=BATCH_SIZE)
+        categories = {}
+        for category in ExpenseCategory.objects.filter(owner__in=owners):
+            categories.setdefault(category.owner_id, []).append(category)
+        return categories
+
+    def _tenants(self, rng, owners, per_owner, first_month):
+        start = datetime.date(*first_month, 1)
+        span_days = (datetime.date.today() - start).days
+        base_room = Tenant.objects.count()
+        tenants = []
+        for owner_index, owner in enumerate(owners):
+            for j in range(per_owner):
+                # Most tenants stay; about a quarter have already left
+                joined = start + datetime.timedelta(days=rng.randrange(max(span_days // 2, 1)))
+                left = None
+                if rng.random() < 0.25:
+                    left = joined + datetime.timedelta(days=rng.randrange(90, max(span_days, 91)))
+                    left = left if left < datetime.date.today() else None
+                tenants.append(Tenant(
+                    owner=owner,
+                    name=f'Tenant {owner_index}-{j}',
+                    # room_no is unique across all owners and limited to 10 characters
+                    room_no=f'S{base_room + len(tenants):x}',
+                    contact_no=f'9{rng.randrange(10**8, 10**9)}',
+                    joining_date=joined,
+                    leaving_date=left,
+                    rent=Decimal(round(rng.lognormvariate(9.0, 0.35) / 500) * 500 or 500),
+                ))
+        return Tenant.objects.bulk_create(tenants, batch_size=BATCH_SIZE)
+
+    def _readings(self, rng, tenants, months, today):
+        rates = {}
+        batch = []
+        total = 0
+        for tenant in tenants:
+            rate = rates.setdefault(tenant.owner_id, Decimal(rng.choice(['7.00', '7.50', '8.00', '8.50', '9.00'])))
+            base_units = rng.lognormvariate(4.8, 0.4)
+            meter = Decimal(rng.randrange(0, 5000))
+            for year, month in months:
+                first_day = datetime.date(year, month, 1)
+                if first_day < tenant.joining_date.replace(day=1):
+                    continue
+                if tenant.leaving_date and first_day > tenant.leaving_date:
+                    break
+                units = Decimal(round(base_units * SEASONALITY[month - 1] * rng.uniform(0.8, 1.2), 2))
+                age = (today.year - year) * 12 + today.month - month
+                batch.append(ElectricityReading(
+                    tenant=tenant, month=month, year=year,
+                    previous_reading=meter, current_reading=meter + units,
+                    rate_per_unit=rate, total_units=units,
+                    calculated_bill=(units * rate).quantize(Decimal('0.01'), ROUND_HALF_UP),
+                    # Old bills are almost always settled; recent ones often are not
+                    is_paid=rng.random() < (0.98 if age > 2 else 0.4),
+                ))
+                meter += units
+            if len(batch) >= BATCH_SIZE:
+                ElectricityReading.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+                total += len(batch)
+                batch = []
+        ElectricityReading.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+        return total + len(batch)
+
+    def _expenses(self, rng, owners, categories, months, per_month):
+        batch = []
+        total = 0
+        for owner in owners:
+            for year, month in months:
+                # Poisson-like count via exponential inter-arrival times
+                count, elapsed = 0, rng.expovariate(per_month) if per_month > 0 else 1
+                while elapsed < 1:
+                    count += 1
+                    elapsed += rng.expovariate(per_month)
+                for _ in range(count):
+                    category = rng.choice(categories[owner.pk])
+                    median = CATEGORY_MEDIANS.get(category.name.split(' #')[0], 1000)
+                    day = rng.randint(1, 28)
+                    batch.append(Expense(
+                        owner=owner, category=category,
+                        amount=Decimal(round(rng.lognormvariate(0, 0.6) * median, 2)),
+                        date=datetime.date(year, month, day), month=month, year=year,
+                        description=f'{category.name.split(" #")[0]} visit',
+                    ))
+            if len(batch) >= BATCH_SIZE:
+                Expense.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+                total += len(batch)
+                batch = []
+        Expense.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+        return total + len(batch)
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from app.caching import bump_owner_version
+from app.importers import import_expenses_csv
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Imports expenses for one owner from a CSV file (date,amount,category,description).
+    Usage:
+        python manage.py import_expenses statement.csv --owner 1 --create-categories
+    """
+    help = "Bulk import expenses from a CSV file for a single owner."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to the CSV file.")
+        parser.add_argument('--owner', type=int, required=True, help="Owner (user) id.")
+        parser.add_argument(
+            '--create-categories', action='store_true',
+            help="Create category names that the owner does not have yet.",
+        )
+        parser.add_argument(
+            '--partial', action='store_true',
+            help="Save the valid rows even if some rows fail validation.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(pk=options['owner'])
+        except User.DoesNotExist:
+            raise CommandError(f"Owner with ID {options['owner']} not found.")
+
+        with open(options['path'], newline='', encoding='utf-8-sig') as handle:
+            report = import_expenses_csv(
+                owner, handle,
+                create_missing_categories=options['create_categories'],
+                partial=options['partial'],
+            )
+        if report['created']:
+            bump_owner_version(owner.pk)
+
+        for error in report['errors']:
+            self.stderr.write(f"  [ERROR] line {error['line']}: {error['errors']}")
+        for name in report['categories_created']:
+            self.stdout.write(f"  [CREATED] category {name}")
+
+        self.stdout.write("-" * 40)
+        self.stdout.write(f"Import Complete: {report['created']} created, {len(report['errors'])} failed.")
+        if report['errors'] and not report['created']:
+            raise CommandError("No expenses were imported.")
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.ledger import ledger_drift, rebuild_ledger
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the MonthlyLedger rollup from Tenant, ElectricityReading and Expense rows.
+    Usage:
+        python manage.py rebuild_ledger              # rebuild everything, then verify
+        python manage.py rebuild_ledger --verify     # only report drift
+        python manage.py rebuild_ledger --owner 1 --owner 2
+    """
+    help = "Rebuild the monthly ledger rollup from scratch and verify it against the raw data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--owner', type=int, action='append', dest='owners',
+            help="Limit to the given owner (user) id. Can be repeated.",
+        )
+        parser.add_argument(
+            '--verify', action='store_true',
+            help="Do not rebuild; report drift and exit with an error if any is found.",
+        )
+
+    def handle(self, *args, **options):
+        owner_ids = options['owners']
+
+        if not options['verify']:
+            count = rebuild_ledger(owner_ids)
+            self.stdout.write(f"Rebuilt {count} ledger rows.")
+
+        drift = ledger_drift(owner_ids)
+        if drift:
+            for (owner_id, year, month), field, stored, expected in drift:
+                self.stderr.write(
+                    f"  [DRIFT] owner={owner_id} {month}/{year} {field}: stored={stored} expected={expected}"
+                )
+            raise CommandError(f"Ledger drift detected in {len(drift)} field(s).")
+
+        self.stdout.write(self.style.SUCCESS("Ledger matches the raw data."))
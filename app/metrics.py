@@ -0,0 +1,82 @@
+"""
+Prometheus metrics for the API, served as text at /metrics.
+
+Under gunicorn every worker is a separate process, so gunicorn.conf.py sets
+PROMETHEUS_MULTIPROC_DIR before the workers start. prometheus_client then
+keeps each worker's values in memory-mapped files in that directory and the
+/metrics view merges them, whichever worker answers the scrape. Without the
+variable (runserver, manage.py) the metrics are simply process-local.
+"""
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUESTS = Counter(
+    'http_requests_total', 'HTTP requests handled, by route, method and status code.',
+    ['route', 'method', 'status'],
+)
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time to produce the response, by route and method.',
+    ['route', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0),
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries executed per request, by route.',
+    ['route'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+IN_FLIGHT = Gauge(
+    'http_requests_in_flight', 'Requests currently being handled, summed across workers.',
+    multiprocess_mode='livesum',
+)
+CACHE_REQUESTS = Counter(
+    'app_cache_requests_total', 'Cache lookups by cache and result (hit, shared_hit or miss).',
+    ['cache', 'result'],
+)
+
+DB_READ_ROUTES = Counter(
+    'app_db_read_routes_total',
+    'Requests by the database their reads used and why (replica, pinned, fallback or primary).',
+    ['alias', 'reason'],
+)
+
+
+def route_label(request):
+    """Low-cardinality route name: the URL pattern name, never the raw path."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route or 'unnamed'
+
+
+def metrics_view(request):
+    """
+    GET /metrics - Prometheus text exposition format.
+    If METRICS_AUTH_TOKEN is set, requires 'Authorization: Bearer <token>'.
+    Otherwise it answers only scrapers at METRICS_ALLOWED_IPS, or anyone with
+    DEBUG on, and is a 404 for everyone else: per-route traffic is not public.
+    """
+    token = getattr(settings, 'METRICS_AUTH_TOKEN', '')
+    if token:
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            return HttpResponse(status=401)
+    elif not (settings.DEBUG or request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ())):
+        return HttpResponse(status=404)
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,467 @@
+import heapq
+import logging
+import random
+import time
+import zlib
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+from . import db_routing, metrics
+
+logger = logging.getLogger('app.request_timing')
+logger_replicas = logging.getLogger('app.db_routing')
+
+# Defaults, overridable through settings.REQUEST_TIMING
+REQUEST_TIMING_DEFAULTS = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 0.1,         # fraction of requests that are instrumented
+    'SLOW_REQUEST_MS': 500,     # sampled requests slower than this are logged
+    'WORST_QUERIES': 3,         # slowest SQL statements included in the log line
+    'SQL_MAX_LENGTH': 500,      # logged statements are truncated to this many characters
+}
+
+
+def _config():
+    return {**REQUEST_TIMING_DEFAULTS, **getattr(settings, 'REQUEST_TIMING', {})}
+
+
+class RequestTiming:
+    """Per-request measurements, collected by the execute wrapper and the middleware hooks."""
+
+    def __init__(self, worst_queries):
+        self.queries = 0
+        self.db_time = 0.0
+        self.view_started = None
+        self.view_ended = None
+        self.db_before_view = 0.0
+        self.db_after_view = None
+        self._worst = []
+        self._worst_size = worst_queries
+        self._seen = set()
+        self.duplicates = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper() hook: times every statement on this thread."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += elapsed
+            # Repeated statements are the usual sign of an N+1 query
+            if sql in self._seen:
+                self.duplicates += 1
+            else:
+                self._seen.add(sql)
+            entry = (elapsed, self.queries, sql)
+            if len(self._worst) < self._worst_size:
+                heapq.heappush(self._worst, entry)
+            elif self._worst_size:
+                heapq.heappushpop(self._worst, entry)
+
+    def worst_queries(self):
+        return sorted(self._worst, reverse=True)
+
+
+class RequestTimingMiddleware:
+    """
+    Opt-in, sampled per-request instrumentation.
+
+    For a sampled request it records the query count and total DB time (through
+    connection.execute_wrapper), the view time split into DB and non-DB work
+    (for these thin DRF views the latter is almost all serialization), and the
+    time spent rendering the response. The numbers are sent back in a
+    Server-Timing header, and requests slower than REQUEST_TIMING['SLOW_REQUEST_MS']
+    are logged on the 'app.request_timing' logger with their slowest statements.
+
+    Unsampled requests only pay for one random() call. Queries that async views
+    run on worker threads use other connections and are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = _config()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config['SAMPLE_RATE']
+        self.slow_ms = config['SLOW_REQUEST_MS']
+        self.worst_queries = config['WORST_QUERIES']
+        self.sql_max_length = config['SQL_MAX_LENGTH']
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timing = RequestTiming(self.worst_queries)
+        request._request_timing = timing
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timing))
+            response = self.get_response(request)
+        self._report(request, response, timing, started)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        timing = RequestTiming(self.worst_queries)
+        request._request_timing = timing
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            # Sync views run on the request's thread-sensitive executor thread: time that thread's connections
+            for connection in await sync_to_async(connections.all)():
+                stack.enter_context(connection.execute_wrapper(timing))
+            response = await self.get_response(request)
+        self._report(request, response, timing, started)
+        return response
+
+    def _report(self, request, response, timing, started):
+        total = time.perf_counter() - started
+        phases = self._phases(timing, started, total)
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration * 1000:.2f}' + (f';desc="{desc}"' if desc else '')
+            for name, duration, desc in phases
+        )
+        if total * 1000 >= self.slow_ms:
+            self._log_slow(request, response, timing, phases)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = getattr(request, '_request_timing', None)
+        if timing is not None:
+            timing.view_started = time.perf_counter()
+            timing.db_before_view = timing.db_time
+
+    def process_template_response(self, request, response):
+        # Called once the view has returned and before DRF renders the response
+        timing = getattr(request, '_request_timing', None)
+        if timing is not None:
+            timing.view_ended = time.perf_counter()
+            timing.db_after_view = timing.db_time
+        return response
+
+    @staticmethod
+    def _phases(timing, started, total):
+        """[(name, seconds, description)] in Server-Timing order."""
+        finished = started + total
+        view = render = view_db = 0.0
+        if timing.view_started is not None:
+            # Plain HttpResponses are not rendered separately, so the view ran until the end
+            view_ended = timing.view_ended or finished
+            db_after_view = timing.db_after_view if timing.db_after_view is not None else timing.db_time
+            view = view_ended - timing.view_started
+            view_db = db_after_view - timing.db_before_view
+            render = finished - view_ended
+        return [
+            ('db', timing.db_time, f'{timing.queries} queries'),
+            ('view', view, ''),
+            ('serialize', max(view - view_db, 0.0), 'view time outside the database'),
+            ('render', render, ''),
+            ('total', total, ''),
+        ]
+
+    def _log_slow(self, request, response, timing, phases):
+        worst = '\n'.join(
+            f'  {elapsed * 1000:.2f} ms: {sql[:self.sql_max_length]}'
+            for elapsed, _index, sql in timing.worst_queries()
+        )
+        logger.warning(
+            'Slow request %s %s -> %s: %s; %d duplicate queries\n%s',
+            request.method, request.get_full_path(), response.status_code,
+            ', '.join(f'{name} {duration * 1000:.1f} ms' for name, duration, _desc in phases),
+            timing.duplicates, worst,
+        )
+
+
+class QueryCounter:
+    """connection.execute_wrapper() hook that only counts statements."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """
+    Records Prometheus request metrics (see app/metrics.py) for every request:
+    in-flight requests, count and latency by route, method and status, and
+    database queries per request. Disabled when settings.METRICS_ENABLED is False.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        queries = QueryCounter()
+        metrics.IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(queries))
+                response = self.get_response(request)
+        finally:
+            metrics.IN_FLIGHT.dec()
+        self._record(request, response, time.perf_counter() - started, queries)
+        return response
+
+    async def __acall__(self, request):
+        queries = QueryCounter()
+        metrics.IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                # Sync views run on the request's thread-sensitive executor thread: count that thread's connections
+                for connection in await sync_to_async(connections.all)():
+                    stack.enter_context(connection.execute_wrapper(queries))
+                response = await self.get_response(request)
+        finally:
+            metrics.IN_FLIGHT.dec()
+        self._record(request, response, time.perf_counter() - started, queries)
+        return response
+
+    @staticmethod
+    def _record(request, response, elapsed, queries):
+        route = metrics.route_label(request)
+        metrics.REQUESTS.labels(route, request.method, str(response.status_code)).inc()
+        metrics.REQUEST_LATENCY.labels(route, request.method).observe(elapsed)
+        metrics.REQUEST_QUERIES.labels(route).observe(queries.count)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Routes each request's reads through app/db_routing.py and records where
+    they went. After a successful unsafe request the user is pinned to the
+    primary (read-your-writes). A safe request that fails with a database
+    error on a replica marks that replica down and is retried once on the
+    primary. Disabled when READ_REPLICAS['ALIASES'] is empty.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.config = db_routing.replica_config()
+        if not self.config['ALIASES']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        routing, token = db_routing.start_routing(request, self.config)
+        try:
+            response = self.get_response(request)
+            if routing.failed_on is not None:
+                self._fall_back(routing)
+                response = self.get_response(request)
+        finally:
+            db_routing.stop_routing(token)
+
+        if not routing.safe:
+            self._pin_writer(request, response)
+        metrics.DB_READ_ROUTES.labels(routing.alias or 'default', routing.reason).inc()
+        return response
+
+    async def __acall__(self, request):
+        routing, token = db_routing.start_routing(request, self.config)
+        try:
+            response = await self.get_response(request)
+            if routing.failed_on is not None:
+                self._fall_back(routing)
+                response = await self.get_response(request)
+        finally:
+            db_routing.stop_routing(token)
+
+        if not routing.safe:
+            # Resolving request.user may query the session
+            await sync_to_async(self._pin_writer)(request, response)
+        metrics.DB_READ_ROUTES.labels(routing.alias or 'default', routing.reason).inc()
+        return response
+
+    @staticmethod
+    def _fall_back(routing):
+        db_routing.replica_health.mark_down(routing.failed_on)
+        routing.failed_on = None
+        routing.use_primary('fallback')
+
+    def _pin_writer(self, request, response):
+        """Sends the user's reads to the primary after a successful write (read-your-writes)."""
+        user = getattr(request, 'user', None)
+        if response.status_code < 400 and user is not None and user.is_authenticated:
+            db_routing.pin_to_primary(user.pk, self.config)
+
+    def process_exception(self, request, exception):
+        routing = db_routing.current_routing()
+        if routing is not None and routing.safe and routing.on_replica and isinstance(exception, DatabaseError):
+            logger_replicas.warning('Read on replica %s failed, retrying on the primary: %s', routing.alias, exception)
+            # Handled here so it is not reported as a server error; __call__ discards this response and retries
+            routing.failed_on = routing.alias
+            return HttpResponse(status=503)
+        return None
+
+
+# Defaults, overridable through settings.COMPRESSION
+COMPRESSION_DEFAULTS = {
+    'ENABLED': True,
+    'MIN_SIZE': 1024,       # bytes; smaller bodies are sent as they are
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 4,    # fast setting suited to dynamic responses
+    # Routes whose bodies carry credentials are never compressed: a compressed
+    # secret next to attacker-influenced input leaks through its size (BREACH)
+    'EXCLUDED_URL_NAMES': ('login', 'register'),
+}
+
+_accept_encoding_re = _lazy_re_compile(r'\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def negotiate_encoding(accept_encoding):
+    """Picks 'br' or 'gzip' from an Accept-Encoding header (honouring q=0), or None."""
+    weights = {}
+    for part in accept_encoding.split(','):
+        match = _accept_encoding_re.match(part)
+        if match:
+            try:
+                weights[match[1].lower()] = float(match[2]) if match[2] else 1.0
+            except ValueError:
+                continue
+    candidates = (['br'] if brotli is not None else []) + ['gzip']
+    # Prefer brotli on ties: it is smaller for JSON at a similar cost
+    best = max(candidates, key=lambda name: (weights.get(name, weights.get('*', 0.0)), name == 'br'))
+    return best if weights.get(best, weights.get('*', 0.0)) > 0 else None
+
+
+class CompressionMiddleware:
+    """
+    Negotiated brotli/gzip response compression.
+
+    Bodies under COMPRESSION['MIN_SIZE'] bytes are left alone, since the
+    saving would not cover the CPU cost. Streaming responses (exports) are
+    compressed chunk by chunk. Brotli is used when the optional 'brotli'
+    package is installed and the client accepts it, otherwise gzip. Routes
+    named in COMPRESSION['EXCLUDED_URL_NAMES'] (login and register, which
+    return tokens) are sent uncompressed.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = {**COMPRESSION_DEFAULTS, **getattr(settings, 'COMPRESSION', {})}
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.min_size = config['MIN_SIZE']
+        self.gzip_level = config['GZIP_LEVEL']
+        self.brotli_quality = config['BROTLI_QUALITY']
+        self.excluded_url_names = frozenset(config['EXCLUDED_URL_NAMES'])
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or response.status_code == 206:
+            return response
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.url_name in self.excluded_url_names:
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        # Whether or not this client gets a compressed body, caches must key on the header
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            compress_stream = self._compress_async_stream if response.is_async else self._compress_stream
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            compressed = self._compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # A strong ETag promises byte-identical bodies, which no longer holds
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def _compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+
+    def _stream_compressor(self, encoding):
+        """(compress, flush, finish) callables for a chunked body."""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            return compressor.process, compressor.flush, compressor.finish
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+    def _compress_stream(self, chunks, encoding):
+        compress, flush, finish = self._stream_compressor(encoding)
+        for chunk in chunks:
+            # Flush per chunk so each buffered export chunk reaches the client promptly
+            data = compress(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+
+    async def _compress_async_stream(self, chunks, encoding):
+        compress, flush, finish = self._stream_compressor(encoding)
+        async for chunk in chunks:
+            data = compress(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
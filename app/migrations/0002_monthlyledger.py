@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:29
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+
+def populate_ledger(apps, schema_editor):
+    Tenant = apps.get_model('app', 'Tenant')
+    ElectricityReading = apps.get_model('app', 'ElectricityReading')
+    Expense = apps.get_model('app', 'Expense')
+    MonthlyLedger = apps.get_model('app', 'MonthlyLedger')
+
+    rent_roll = dict(
+        Tenant.objects.values('owner_id').annotate(total=Sum('rent')).values_list('owner_id', 'total')
+    )
+    rows = {}
+
+    def row_for(owner_id, year, month):
+        key = (owner_id, year, month)
+        if key not in rows:
+            rows[key] = MonthlyLedger(
+                owner_id=owner_id, year=year, month=month, total_rent=rent_roll.get(owner_id) or 0
+            )
+        return rows[key]
+
+    reading_totals = ElectricityReading.objects.values('tenant__owner_id', 'year', 'month').annotate(
+        billed=Sum('calculated_bill'),
+        paid=Sum('calculated_bill', filter=Q(is_paid=True)),
+    )
+    for total in reading_totals:
+        row = row_for(total['tenant__owner_id'], total['year'], total['month'])
+        row.electricity_billed = total['billed']
+        row.electricity_paid = total['paid'] or 0
+        row.electricity_unpaid = total['billed'] - row.electricity_paid
+
+    expense_totals = Expense.objects.exclude(owner__isnull=True).values(
+        'owner_id', 'year', 'month'
+    ).annotate(total=Sum('amount'))
+    for total in expense_totals:
+        row_for(total['owner_id'], total['year'], total['month']).total_expenses = total['total']
+
+    MonthlyLedger.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)])),
+                ('total_rent', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('electricity_billed', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('electricity_paid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('electricity_unpaid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_expenses', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_ledgers', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('owner', 'year', 'month'), name='unique_ledger_per_owner_month')],
+            },
+        ),
+        migrations.RunPython(populate_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_monthlyledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='electricityreading',
+            index=models.Index(fields=['-year', '-month', 'id'], name='reading_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['owner', '-date', 'id'], name='expense_owner_date_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tariff',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('effective_from', models.DateField()),
+                ('fixed_charge', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tariffs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-effective_from'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TariffSlab',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lower_units', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('upper_units', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('rate', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('tariff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slabs', to='app.tariff')),
+            ],
+            options={
+                'ordering': ['lower_units'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tariff',
+            constraint=models.UniqueConstraint(fields=('owner', 'effective_from'), name='unique_tariff_per_owner_month'),
+        ),
+        migrations.AddConstraint(
+            model_name='tariffslab',
+            constraint=models.UniqueConstraint(fields=('tariff', 'lower_units'), name='unique_slab_start_per_tariff'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_tariff'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='monthlyledger',
+            name='total_rent',
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(fields=['owner', 'joining_date', 'leaving_date'], name='tenant_occupancy_idx'),
+        ),
+    ]
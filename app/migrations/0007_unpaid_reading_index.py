@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_expense_period_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='electricityreading',
+            index=models.Index(condition=models.Q(('is_paid', False)), fields=['tenant', 'year', 'month'], name='reading_unpaid_idx'),
+        ),
+    ]
@@ -0,0 +1,155 @@
+"""
+Full-text search over expenses (see app/search.py).
+
+Each expense is indexed with its category's name and description, its own
+description and its period ("March 2025"). Triggers keep the index in step
+with every write path, including bulk_create() and queryset.update():
+
+- PostgreSQL: a tsvector column on app_expense with a GIN index.
+- SQLite: an FTS5 table keyed by the expense id.
+
+Other databases get no index; app/search.py falls back to LIKE there.
+"""
+from django.db import migrations
+
+MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December')
+
+# --- PostgreSQL ---
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE app_expense ADD COLUMN search_vector tsvector",
+    """
+    CREATE FUNCTION app_expense_search_vector(p_description text, p_date date, p_category_id bigint)
+    RETURNS tsvector LANGUAGE sql STABLE AS $$
+        SELECT setweight(to_tsvector('simple', coalesce(
+                   (SELECT name || ' ' || description FROM app_expensecategory WHERE id = p_category_id), ''
+               )), 'A')
+            || setweight(to_tsvector('simple', coalesce(p_description, '')), 'B')
+            || setweight(to_tsvector('simple', to_char(p_date, 'FMMonth YYYY')), 'C')
+    $$
+    """,
+    """
+    CREATE FUNCTION app_expense_search_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := app_expense_search_vector(NEW.description, NEW.date, NEW.category_id);
+        RETURN NEW;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER app_expense_search BEFORE INSERT OR UPDATE OF description, date, category_id
+    ON app_expense FOR EACH ROW EXECUTE FUNCTION app_expense_search_trigger()
+    """,
+    """
+    CREATE FUNCTION app_expensecategory_search_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE app_expense SET search_vector = app_expense_search_vector(description, date, category_id)
+        WHERE category_id = NEW.id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER app_expensecategory_search AFTER UPDATE OF name, description
+    ON app_expensecategory FOR EACH ROW EXECUTE FUNCTION app_expensecategory_search_trigger()
+    """,
+    "UPDATE app_expense SET search_vector = app_expense_search_vector(description, date, category_id)",
+    "CREATE INDEX app_expense_search_idx ON app_expense USING GIN (search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP TRIGGER app_expensecategory_search ON app_expensecategory",
+    "DROP TRIGGER app_expense_search ON app_expense",
+    "DROP FUNCTION app_expensecategory_search_trigger()",
+    "DROP FUNCTION app_expense_search_trigger()",
+    "DROP FUNCTION app_expense_search_vector(text, date, bigint)",
+    "ALTER TABLE app_expense DROP COLUMN search_vector",
+]
+
+# --- SQLite ---
+
+
+def _sqlite_category(row):
+    return (
+        f"coalesce((SELECT name || ' ' || description FROM app_expensecategory "
+        f"WHERE id = {row}.category_id), '')"
+    )
+
+
+def _sqlite_period(row):
+    names = ' '.join(f"WHEN {number} THEN '{name}'" for number, name in enumerate(MONTH_NAMES, start=1))
+    return f"(CASE CAST(strftime('%m', {row}.date) AS INTEGER) {names} END) || ' ' || strftime('%Y', {row}.date)"
+
+
+def _sqlite_insert(row):
+    return (
+        "INSERT INTO app_expense_search(rowid, category, description, period) "
+        f"VALUES ({row}.id, {_sqlite_category(row)}, {row}.description, {_sqlite_period(row)});"
+    )
+
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE app_expense_search
+    USING fts5(category, description, period, tokenize = 'unicode61 remove_diacritics 2')
+    """,
+    f"CREATE TRIGGER app_expense_search_insert AFTER INSERT ON app_expense BEGIN {_sqlite_insert('NEW')} END",
+    f"""
+    CREATE TRIGGER app_expense_search_update AFTER UPDATE OF description, date, category_id ON app_expense
+    BEGIN
+        DELETE FROM app_expense_search WHERE rowid = OLD.id;
+        {_sqlite_insert('NEW')}
+    END
+    """,
+    """
+    CREATE TRIGGER app_expense_search_delete AFTER DELETE ON app_expense
+    BEGIN
+        DELETE FROM app_expense_search WHERE rowid = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER app_expensecategory_search_update AFTER UPDATE OF name, description ON app_expensecategory
+    BEGIN
+        UPDATE app_expense_search SET category = NEW.name || ' ' || NEW.description
+        WHERE rowid IN (SELECT id FROM app_expense WHERE category_id = NEW.id);
+    END
+    """,
+    f"""
+    INSERT INTO app_expense_search(rowid, category, description, period)
+    SELECT e.id, {_sqlite_category('e')}, e.description, {_sqlite_period('e')} FROM app_expense e
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER app_expensecategory_search_update",
+    "DROP TRIGGER app_expense_search_delete",
+    "DROP TRIGGER app_expense_search_update",
+    "DROP TRIGGER app_expense_search_insert",
+    "DROP TABLE app_expense_search",
+]
+
+STATEMENTS = {
+    'postgresql': (POSTGRES_FORWARD, POSTGRES_BACKWARD),
+    'sqlite': (SQLITE_FORWARD, SQLITE_BACKWARD),
+}
+
+
+def _run(direction):
+    def run(apps, schema_editor):
+        statements = STATEMENTS.get(schema_editor.connection.vendor)
+        if statements:
+            for sql in statements[direction]:
+                schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_unpaid_reading_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(0), _run(1)),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_expense_search'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='electricityreading',
+            name='reading_period_idx',
+        ),
+        migrations.AddIndex(
+            model_name='electricityreading',
+            index=models.Index(fields=['tenant', '-year', '-month', 'id'], name='reading_period_idx'),
+        ),
+    ]
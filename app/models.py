@@ -1,6 +1,7 @@
 import datetime
-from django.db import models
-from django.db.models import UniqueConstraint, Q
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import models, transaction, IntegrityError
+from django.db.models import UniqueConstraint, Q, F, Sum
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator 
@@ -28,6 +29,30 @@ class Tenant(models.Model):
         constraints = [
             UniqueConstraint(fields=['owner', 'room_no'], name='unique_room_per_owner')
         ]
+        # Month/range rent aggregates select an owner's tenancies by date overlap
+        indexes = [
+            models.Index(fields=['owner', 'joining_date', 'leaving_date'], name='tenant_occupancy_idx'),
+        ]
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            # Readings are removed by cascade without calling their delete(),
+            # so take their totals out of the ledger here.
+            month_totals = ElectricityReading.objects.filter(tenant=self).values(
+                'year', 'month'
+            ).annotate(
+                billed=Sum('calculated_bill'),
+                paid=Sum('calculated_bill', filter=Q(is_paid=True)),
+            )
+            for row in month_totals:
+                paid = row['paid'] or 0
+                MonthlyLedger.objects.apply_delta(
+                    self.owner_id, row['year'], row['month'],
+                    electricity_billed=-row['billed'],
+                    electricity_paid=-paid,
+                    electricity_unpaid=-(row['billed'] - paid),
+                )
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         return f"{self.name} ({self.room_no})"
@@ -71,6 +96,14 @@ class ElectricityReading(models.Model):
         constraints = [
             UniqueConstraint(fields=['tenant', 'month', 'year'], name='unique_reading_per_month_year')
         ]
+        # Supports keyset pagination on (-year, -month, id) within a tenant's readings
+        indexes = [
+            models.Index(fields=['tenant', '-year', '-month', 'id'], name='reading_period_idx'),
+            # Only unpaid rows, so arrears lookups scale with what is outstanding
+            models.Index(
+                fields=['tenant', 'year', 'month'], condition=Q(is_paid=False), name='reading_unpaid_idx'
+            ),
+        ]
         ordering = ['-year', '-month', 'tenant__room_no']
 
     def clean(self):
@@ -79,31 +112,95 @@ class ElectricityReading(models.Model):
                 _('Current reading must be greater than or equal to the previous reading.')
             )
 
-    def save(self, *args, **kwargs):
-        # 1. Automatic Calculation
+    # Fields the bill depends on; saving a reading without changing them keeps its stored bill
+    PRICING_FIELDS = ('tenant', 'previous_reading', 'current_reading', 'rate_per_unit', 'year', 'month')
+
+    def _needs_pricing(self, old, update_fields):
+        if old is None:
+            return True
+        names = self.PRICING_FIELDS if update_fields is None else set(self.PRICING_FIELDS) & set(update_fields)
+        attnames = [self._meta.get_field(name).attname for name in names]
+        return any(old[attname] != getattr(self, attname) for attname in attnames)
+
+    def _price(self, old, kwargs):
+        """Sets total_units and, if its inputs changed, calculated_bill (the owner's tariff wins over the flat rate)."""
         self.total_units = self.current_reading - self.previous_reading
-        self.calculated_bill = self.total_units * self.rate_per_unit
-        
-        # 2. Check for automatic previous reading update (only on create)
-        if not self.pk:
-            try:
-                last_reading = ElectricityReading.objects.filter(
-                    tenant=self.tenant
-                ).filter(
-
-                    Q(year__lt=self.year) | Q(year=self.year, month__lt=self.month)
-                ).order_by('-year', '-month').first() 
-
-                if last_reading:
-                    self.previous_reading = last_reading.current_reading
-            except Exception:
-                pass
-                
-        # 3. If a new month's reading is being created (pk is None), ensure is_paid is False
-        if not self.pk:
-             self.is_paid = False
-
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if not self._needs_pricing(old, update_fields):
+            # Keep the stored bill, which app.billing may have rebilled since this instance was loaded
+            self.calculated_bill = old['calculated_bill']
+            return
+        tariff = Tariff.objects.effective_for(self.tenant.owner_id, self.year, self.month)
+        if tariff is not None:
+            self.calculated_bill = tariff.bill_for(Decimal(self.total_units))
+        else:
+            self.calculated_bill = (Decimal(self.total_units) * self.rate_per_unit).quantize(
+                Decimal('0.01'), ROUND_HALF_UP
+            )
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'total_units', 'calculated_bill'}
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            # The stored row: its bill is kept unless re-priced, and moved out of its ledger month (step 4)
+            old = None
+            if self.pk:
+                old = ElectricityReading.objects.filter(pk=self.pk).values(
+                    'calculated_bill', 'is_paid', 'tenant_id', 'previous_reading', 'current_reading',
+                    'rate_per_unit', 'year', 'month',
+                ).first()
+
+            # 1. Automatic Calculation, only when the units, rate, tenant or billing month changed
+            self._price(old, kwargs)
+
+            # 2. Check for automatic previous reading update (only on create)
+            if not self.pk:
+                try:
+                    last_reading = ElectricityReading.objects.filter(
+                        tenant=self.tenant
+                    ).filter(
+
+                        Q(year__lt=self.year) | Q(year=self.year, month__lt=self.month)
+                    ).order_by('-year', '-month').first() 
+
+                    if last_reading:
+                        self.previous_reading = last_reading.current_reading
+                except Exception:
+                    pass
+                    
+            # 3. If a new month's reading is being created (pk is None), ensure is_paid is False
+            if not self.pk:
+                 self.is_paid = False
+
+            # 4. Move this reading's bill out of its old ledger month and into the new one
+            super().save(*args, **kwargs)
+            owner_id = self.tenant.owner_id
+            if old:
+                MonthlyLedger.objects.apply_delta(
+                    owner_id, old['year'], old['month'],
+                    **self._ledger_amounts(old['calculated_bill'], old['is_paid'], sign=-1)
+                )
+            MonthlyLedger.objects.apply_delta(
+                owner_id, self.year, self.month,
+                **self._ledger_amounts(self.calculated_bill, self.is_paid)
+            )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            MonthlyLedger.objects.apply_delta(
+                self.tenant.owner_id, self.year, self.month,
+                **self._ledger_amounts(self.calculated_bill, self.is_paid, sign=-1)
+            )
+            return super().delete(*args, **kwargs)
+
+    @staticmethod
+    def _ledger_amounts(bill, is_paid, sign=1):
+        bill = Decimal(bill) * sign
+        return {
+            'electricity_billed': bill,
+            'electricity_paid': bill if is_paid else 0,
+            'electricity_unpaid': 0 if is_paid else bill,
+        }
 
     def __str__(self):
         return f"E-Reading for {self.tenant.name} - {self.month}/{self.year}"
@@ -124,12 +221,152 @@ class Expense(models.Model):
 
     class Meta:
         ordering = ['-date']
+        # Supports keyset pagination on (-date, id) within an owner
+        indexes = [
+            models.Index(fields=['owner', '-date', 'id'], name='expense_owner_date_idx'),
+            # Per-month and per-category aggregates (breakdown, ledger rebuilds)
+            models.Index(fields=['owner', 'year', 'month', 'category'], name='expense_owner_period_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         # Automatically set month and year from the date field
         self.month = self.date.month
         self.year = self.date.year
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            old = None
+            if self.pk:
+                old = Expense.objects.filter(pk=self.pk).values(
+                    'owner_id', 'year', 'month', 'amount'
+                ).first()
+            super().save(*args, **kwargs)
+            if old and old['owner_id']:
+                MonthlyLedger.objects.apply_delta(
+                    old['owner_id'], old['year'], old['month'], total_expenses=-old['amount']
+                )
+            if self.owner_id:
+                MonthlyLedger.objects.apply_delta(
+                    self.owner_id, self.year, self.month, total_expenses=Decimal(self.amount)
+                )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            if self.owner_id:
+                MonthlyLedger.objects.apply_delta(
+                    self.owner_id, self.year, self.month, total_expenses=-self.amount
+                )
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         return f"{self.category.name}: ₹{self.amount} ({self.date})"
+
+
+class MonthlyLedgerManager(models.Manager):
+    """Incremental maintenance helpers for the MonthlyLedger rollup."""
+
+    def apply_delta(self, owner_id, year, month, **deltas):
+        """
+        Adds the given amounts to the (owner, year, month) ledger row,
+        creating the row if needed.
+        Must be called inside the transaction that performs the underlying write.
+        """
+        deltas = {field: value for field, value in deltas.items() if value}
+        if not deltas:
+            return
+        updates = {field: F(field) + value for field, value in deltas.items()}
+        if self.filter(owner_id=owner_id, year=year, month=month).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                self.create(owner_id=owner_id, year=year, month=month, **deltas)
+        except IntegrityError:
+            # Another transaction created the row first
+            self.filter(owner_id=owner_id, year=year, month=month).update(**updates)
+
+
+class MonthlyLedger(models.Model):
+    """
+    Rollup of an owner's electricity and expense totals for one month.
+    Rent is not stored: it depends on each tenancy's dates and is prorated
+    per month in SQL (see summary.rent_by_month).
+    Maintained incrementally by Tenant, ElectricityReading and Expense writes;
+    rebuilt and checked for drift with the `rebuild_ledger` management command.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='monthly_ledgers')
+    year = models.IntegerField()
+    month = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(12)])
+
+    electricity_billed = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    electricity_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    electricity_unpaid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_expenses = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    objects = MonthlyLedgerManager()
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=['owner', 'year', 'month'], name='unique_ledger_per_owner_month')
+        ]
+
+    def __str__(self):
+        return f"Ledger for {self.owner_id} - {self.month}/{self.year}"
+
+
+class TariffManager(models.Manager):
+
+    def effective_for(self, owner_id, year, month):
+        """The owner's tariff in force for the given billing month (with slabs prefetched), or None."""
+        return (
+            self.filter(owner_id=owner_id, effective_from__lte=datetime.date(year, month, 1))
+            .prefetch_related('slabs')
+            .order_by('-effective_from')
+            .first()
+        )
+
+
+class Tariff(models.Model):
+    """
+    An owner's electricity tariff: a fixed monthly charge plus per-unit slab rates.
+    A tariff applies to every billing month from `effective_from` (always the
+    first of a month) until the owner's next tariff takes over. Months before
+    an owner's first tariff are billed at each reading's flat rate_per_unit.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tariffs')
+    name = models.CharField(max_length=100, blank=True)
+    effective_from = models.DateField()
+    fixed_charge = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+
+    objects = TariffManager()
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=['owner', 'effective_from'], name='unique_tariff_per_owner_month')
+        ]
+        ordering = ['-effective_from']
+
+    def bill_for(self, units):
+        """Bill for `units` consumed in one month; mirrors app.billing.bill_expression()."""
+        total = self.fixed_charge
+        for slab in self.slabs.all():
+            top = units if slab.upper_units is None else min(units, slab.upper_units)
+            total += slab.rate * max(top - slab.lower_units, Decimal('0'))
+        return total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    def __str__(self):
+        return f"Tariff {self.name or self.pk} for {self.owner_id} from {self.effective_from}"
+
+
+class TariffSlab(models.Model):
+    """Units above `lower_units` and up to `upper_units` (unbounded if null) are billed at `rate`."""
+    tariff = models.ForeignKey(Tariff, on_delete=models.CASCADE, related_name='slabs')
+    lower_units = models.DecimalField(max_digits=10, decimal_places=2)
+    upper_units = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    rate = models.DecimalField(max_digits=6, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=['tariff', 'lower_units'], name='unique_slab_start_per_tariff')
+        ]
+        ordering = ['lower_units']
+
+    def __str__(self):
+        return f"{self.lower_units}-{self.upper_units or '∞'} @ {self.rate}"
@@ -0,0 +1,133 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+from rest_framework.response import Response
+
+
+def keyset_filter(ordering, position, reverse=False):
+    """
+    Q matching the rows strictly after `position` (one value per ordering
+    field) in `ordering`, or strictly before it when `reverse`:
+    (a > x) OR (a = x AND b > y) OR ..., with each comparison following
+    its field's direction.
+    """
+    condition, equal = Q(), {}
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') != reverse else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+class OptInCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination that only activates when the client asks for it
+    with ?page_size= or ?cursor=, so existing callers keep receiving plain lists.
+
+    The response includes a total 'count' unless ?count=false is passed, which
+    skips the extra COUNT(*) query on large tables.
+
+    Unlike DRF's CursorPagination, which seeks on the first ordering field and
+    then skips an offset through rows that share its value, the cursor holds
+    every ordering field. The ordering must end in a unique field (id), so each
+    page is one index range scan however many rows share a year or a date.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        self.count = None
+        if params.get(self.count_query_param, 'true').lower() not in ('0', 'false', 'no'):
+            self.count = queryset.count()
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor is not None else None
+        queryset = queryset.order_by(*(_reverse_ordering(self.ordering) if reverse else self.ordering))
+        if position is not None:
+            try:
+                queryset = queryset.filter(keyset_filter(self.ordering, position, reverse))
+            except (ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # One extra row tells whether another page follows
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        following = None
+        if len(results) > self.page_size:
+            following = self._get_position_from_instance(results[-1], self.ordering)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.next_position = position is not None, position
+            self.has_previous, self.previous_position = following is not None, following
+        else:
+            self.has_next, self.next_position = following is not None, following
+            self.has_previous, self.previous_position = position is not None, position
+        return self.page
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if (not isinstance(position, list) or len(position) != len(self.ordering)
+                or not all(isinstance(value, str) for value in position)):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=cursor.reverse, position=tuple(position))
+
+    def encode_cursor(self, cursor):
+        if cursor.position is not None:
+            cursor = cursor._replace(position=json.dumps(list(cursor.position)))
+        return super().encode_cursor(cursor)
+
+    def _get_position_from_instance(self, instance, ordering):
+        """Every ordering field's value, as strings (dates in ISO format)."""
+        fields = [field.lstrip('-') for field in ordering]
+        if isinstance(instance, dict):
+            return tuple(str(instance[field]) for field in fields)
+        return tuple(str(getattr(instance, field)) for field in fields)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {'type': 'integer', 'example': 123}
+        return response_schema
+
+
+class TenantCursorPagination(OptInCursorPagination):
+    ordering = ('id',)
+
+
+class ExpenseCursorPagination(OptInCursorPagination):
+    ordering = ('-date', 'id')
+
+
+class ElectricityReadingCursorPagination(OptInCursorPagination):
+    ordering = ('-year', '-month', 'id')
@@ -0,0 +1,112 @@
+"""
+Ranked full-text search over an owner's expenses.
+
+Matches run against the text index created by migration 0008 (a GIN-indexed
+tsvector on PostgreSQL, an FTS5 table on SQLite), covering the expense's
+description, its category's name and description, and its period
+("March 2025"). Every query term must match, as a prefix, so "plumb mar"
+finds a plumber's visit in March. Results are ordered by relevance and then
+by newest id, and paginated by keyset on (score, id): later pages cost the
+same as the first. Other database vendors fall back to unranked LIKE matching.
+"""
+import base64
+import binascii
+import json
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+
+from .models import Expense
+
+# Longest query, in terms, that is searched
+MAX_TERMS = 8
+# Results per page unless ?page_size= asks for another size (up to the maximum)
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+_TERM = re.compile(r'[^\W_]+')
+
+POSTGRES_SQL = """
+    SELECT id, score FROM (
+        SELECT e.id, ts_rank(e.search_vector, query) AS score
+        FROM app_expense e, to_tsquery('simple', %s) query
+        WHERE e.owner_id = %s AND e.search_vector @@ query
+    ) matches
+    {after}
+    ORDER BY score DESC, id DESC
+    LIMIT %s
+"""
+
+# bm25() is lower for better matches; the columns are weighted category, description, period
+SQLITE_SQL = """
+    SELECT id, score FROM (
+        SELECT e.id AS id, -bm25(app_expense_search, 3.0, 2.0, 1.0) AS score
+        FROM app_expense_search JOIN app_expense e ON e.id = app_expense_search.rowid
+        WHERE app_expense_search MATCH %s AND e.owner_id = %s
+    ) matches
+    {after}
+    ORDER BY score DESC, id DESC
+    LIMIT %s
+"""
+
+AFTER_SQL = "WHERE score < %s OR (score = %s AND id < %s)"
+
+
+def search_terms(query):
+    """Lower-cased word tokens of a search query (punctuation is dropped)."""
+    return _TERM.findall(query.lower())[:MAX_TERMS]
+
+
+def encode_cursor(score, pk):
+    return base64.urlsafe_b64encode(json.dumps([score, pk]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """(score, id) from encode_cursor(); raises ValueError for anything else."""
+    try:
+        score, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(score, (int, float)) or not isinstance(pk, int):
+        raise ValueError("Invalid cursor.")
+    return float(score), pk
+
+
+def _indexed_matches(connection, sql, match, owner, limit, after):
+    params = [match, owner.pk]
+    if after is not None:
+        params += [after[0], after[0], after[1]]
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(after=AFTER_SQL if after else ''), params + [limit])
+        return [(pk, float(score)) for pk, score in cursor.fetchall()]
+
+
+def _fallback_matches(terms, owner, limit, after):
+    queryset = Expense.objects.filter(owner=owner)
+    for term in terms:
+        queryset = queryset.filter(
+            Q(description__icontains=term)
+            | Q(category__name__icontains=term)
+            | Q(category__description__icontains=term)
+        )
+    if after is not None:
+        queryset = queryset.filter(pk__lt=after[1])
+    return [(pk, 0.0) for pk in queryset.order_by('-pk').values_list('pk', flat=True)[:limit]]
+
+
+def search_expenses(owner, terms, limit, after=None):
+    """
+    Returns up to `limit` (expense id, score) pairs of the owner's expenses
+    matching every term as a prefix, best first. `after` is the (score, id)
+    of the last row of the previous page.
+    """
+    # The database the ORM would read expenses from (a replica, see app/db_routing.py)
+    connection = connections[router.db_for_read(Expense)]
+    if connection.vendor == 'postgresql':
+        match = ' & '.join(f'{term}:*' for term in terms)
+        return _indexed_matches(connection, POSTGRES_SQL, match, owner, limit, after)
+    if connection.vendor == 'sqlite':
+        match = ' AND '.join(f'"{term}"*' for term in terms)
+        return _indexed_matches(connection, SQLITE_SQL, match, owner, limit, after)
+    return _fallback_matches(terms, owner, limit, after)
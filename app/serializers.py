@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Tenant, ElectricityReading  , ExpenseCategory, Expense
+from django.db import transaction
+from .models import Tenant, ElectricityReading  , ExpenseCategory, Expense, Tariff, TariffSlab
 
 # Get the User model
 User = get_user_model()
@@ -104,3 +105,191 @@ class ExpenseSerializer(serializers.ModelSerializer):
             'description', 'month', 'year'
         ]
         read_only_fields = ['owner'] # <--- THE FIX
+
+
+# --- Bulk Reading Serializers ---
+
+class BulkReadingRowSerializer(serializers.Serializer):
+    """
+    One meter reading inside a bulk month-close payload.
+    previous_reading is only used when the tenant has no earlier reading.
+    """
+    tenant = serializers.IntegerField()
+    current_reading = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    previous_reading = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    rate_per_unit = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=0, required=False)
+
+
+class BulkReadingSerializer(serializers.Serializer):
+    """
+    Payload for closing a month's electricity readings in one request.
+    A top-level rate_per_unit applies to every row that does not set its own.
+    """
+    month = serializers.IntegerField(min_value=1, max_value=12)
+    year = serializers.IntegerField(min_value=2000, max_value=2100)
+    rate_per_unit = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=0, required=False)
+    readings = BulkReadingRowSerializer(many=True, allow_empty=False)
+
+    def validate(self, data):
+        """
+        Ensure every row has a rate and each tenant appears only once.
+        """
+        errors = []
+        seen = set()
+        for row in data['readings']:
+            row_errors = {}
+            if 'rate_per_unit' not in row and 'rate_per_unit' not in data:
+                row_errors['rate_per_unit'] = ["This field is required when no default rate is given."]
+            if row['tenant'] in seen:
+                row_errors['tenant'] = ["Duplicate tenant in this payload."]
+            seen.add(row['tenant'])
+            errors.append(row_errors)
+
+        if any(errors):
+            raise serializers.ValidationError({"readings": errors})
+        return data
+
+
+class YearMonthField(serializers.Field):
+    """A billing period written as 'YYYY-MM', represented as a (year, month) tuple."""
+
+    def to_internal_value(self, data):
+        year, sep, month = str(data).partition('-')
+        if not (sep and year.isdigit() and month.isdigit() and 1 <= int(month) <= 12):
+            raise serializers.ValidationError("Use the YYYY-MM format with a month between 1 and 12.")
+        return int(year), int(month)
+
+    def to_representation(self, value):
+        return f"{value[0]:04d}-{value[1]:02d}"
+
+
+class BulkFilterSerializer(serializers.Serializer):
+    """
+    Selects rows for a bulk update by billing period; 'from' and 'to'
+    (YYYY-MM, inclusive) are both optional. Subclasses add their own keys.
+    """
+
+    def get_fields(self):
+        # 'from' is a keyword, so the period fields cannot be declared as attributes
+        fields = super().get_fields()
+        fields['from'] = YearMonthField(required=False)
+        fields['to'] = YearMonthField(required=False)
+        return fields
+
+    def validate(self, data):
+        if 'from' in data and 'to' in data and data['from'] > data['to']:
+            raise serializers.ValidationError("'from' must not be after 'to'.")
+        return data
+
+
+class ReadingBulkFilterSerializer(BulkFilterSerializer):
+    tenant = serializers.IntegerField(required=False)
+
+
+class ExpenseBulkFilterSerializer(BulkFilterSerializer):
+    category = serializers.IntegerField(required=False, allow_null=True)
+
+
+class BulkUpdateSerializer(serializers.Serializer):
+    """
+    Payload for updating many of the owner's rows at once: the rows are
+    given either as 'ids' or as a 'filter', and 'set' holds the new values.
+    Subclasses declare the 'filter' and 'set' serializers.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, required=False)
+
+    def validate(self, data):
+        if ('ids' in data) == ('filter' in data):
+            raise serializers.ValidationError("Pass either 'ids' or 'filter', not both.")
+        if not data['set']:
+            raise serializers.ValidationError({"set": ["Give at least one field to update."]})
+        return data
+
+
+class ReadingChangesSerializer(serializers.Serializer):
+    is_paid = serializers.BooleanField()
+
+
+class ReadingBulkUpdateSerializer(BulkUpdateSerializer):
+    """
+    Example: { "filter": { "tenant": 3, "from": "2025-01", "to": "2025-06" }, "set": { "is_paid": true } }
+    """
+    filter = ReadingBulkFilterSerializer(required=False)
+    set = ReadingChangesSerializer()
+
+
+class ExpenseChangesSerializer(serializers.Serializer):
+    category = serializers.IntegerField(required=False, allow_null=True)
+    description = serializers.CharField(required=False, allow_blank=True)
+
+
+class ExpenseBulkUpdateSerializer(BulkUpdateSerializer):
+    """
+    Example: { "ids": [4, 5, 9], "set": { "category": 2 } }
+    """
+    filter = ExpenseBulkFilterSerializer(required=False)
+    set = ExpenseChangesSerializer()
+
+
+# --- Tariff Serializers ---
+
+class TariffSlabSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TariffSlab
+        fields = ['lower_units', 'upper_units', 'rate']
+
+
+class TariffSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a Tariff with its slabs nested.
+    Slabs must start at 0 and be contiguous; only the last may be open-ended.
+    Writing slabs replaces the tariff's existing ones.
+    """
+    owner_username = serializers.ReadOnlyField(source='owner.username')
+    slabs = TariffSlabSerializer(many=True)
+
+    class Meta:
+        model = Tariff
+        fields = ['id', 'owner', 'owner_username', 'name', 'effective_from', 'fixed_charge', 'slabs']
+        read_only_fields = ['owner']
+
+    def validate_effective_from(self, value):
+        if value.day != 1:
+            raise serializers.ValidationError("Tariffs take effect from the first day of a month.")
+        return value
+
+    def validate_slabs(self, slabs):
+        slabs = sorted(slabs, key=lambda slab: slab['lower_units'])
+        if not slabs:
+            raise serializers.ValidationError("At least one slab is required.")
+        if slabs[0]['lower_units'] != 0:
+            raise serializers.ValidationError("The first slab must start at 0 units.")
+        for slab, following in zip(slabs, slabs[1:] + [None]):
+            upper = slab.get('upper_units')
+            if upper is None and following is not None:
+                raise serializers.ValidationError("Only the last slab may be open-ended.")
+            if upper is not None and upper <= slab['lower_units']:
+                raise serializers.ValidationError("Each slab's upper_units must exceed its lower_units.")
+            if following is not None and following['lower_units'] != upper:
+                raise serializers.ValidationError("Slabs must be contiguous.")
+        return slabs
+
+    def create(self, validated_data):
+        slabs = validated_data.pop('slabs')
+        with transaction.atomic():
+            tariff = super().create(validated_data)
+            TariffSlab.objects.bulk_create([TariffSlab(tariff=tariff, **slab) for slab in slabs])
+        return tariff
+
+    def update(self, instance, validated_data):
+        slabs = validated_data.pop('slabs', None)
+        with transaction.atomic():
+            tariff = super().update(instance, validated_data)
+            if slabs is not None:
+                tariff.slabs.all().delete()
+                TariffSlab.objects.bulk_create([TariffSlab(tariff=tariff, **slab) for slab in slabs])
+        # Drop any prefetched slabs so the response shows the new ones
+        if hasattr(tariff, '_prefetched_objects_cache'):
+            tariff._prefetched_objects_cache.clear()
+        return tariff
+
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .caching import bump_owner_version_on_commit
+from .models import Tenant, ElectricityReading, ExpenseCategory, Expense, Tariff, TariffSlab
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def revoke_deleted_token(sender, instance, **kwargs):
+    """Logout (LogoutView deletes the token) and user deletion revoke cached auth at once."""
+    token_cache.revoke_user(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def revoke_saved_user(sender, instance, **kwargs):
+    """
+    Cached users must not outlive changes to them: a deactivated user stops
+    authenticating at once, and other processes reload changed permissions.
+    """
+    token_cache.revoke_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def reset_new_owner_version(sender, instance, created, **kwargs):
+    """A new account may reuse a deleted one's id; it must not see responses cached for that one."""
+    if created:
+        bump_owner_version_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+@receiver(post_save, sender=ExpenseCategory)
+@receiver(post_delete, sender=ExpenseCategory)
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+@receiver(post_save, sender=Tariff)
+@receiver(post_delete, sender=Tariff)
+def bump_owner_data_version(sender, instance, **kwargs):
+    """Every write to an owner's rows, through the API or not, invalidates their cached responses."""
+    if instance.owner_id:
+        bump_owner_version_on_commit(instance.owner_id)
+
+
+@receiver(post_save, sender=ElectricityReading)
+def bump_reading_owner_version(sender, instance, **kwargs):
+    bump_owner_version_on_commit(instance.tenant.owner_id)
+
+
+@receiver(post_delete, sender=ElectricityReading)
+def bump_deleted_reading_owner_version(sender, instance, origin=None, **kwargs):
+    # Readings deleted by a tenant's (or user's) cascade are covered by the tenant's own signal
+    if getattr(origin, 'model', type(origin)) is ElectricityReading:
+        bump_owner_version_on_commit(instance.tenant.owner_id)
+
+
+@receiver(post_save, sender=TariffSlab)
+@receiver(post_delete, sender=TariffSlab)
+def bump_slab_owner_version(sender, instance, origin=None, **kwargs):
+    if getattr(origin, 'model', type(origin)) is not Tariff:
+        bump_owner_version_on_commit(instance.tariff.owner_id)
@@ -0,0 +1,458 @@
+import calendar
+import datetime
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db.models import Count, F, FilteredRelation, Func, Q, Sum, Window
+from django.db.models.functions import ExtractDay, ExtractMonth, ExtractYear, Lag, Rank
+
+from .fast_lists import compile_fields, serialize_values, values_queryset
+from .ledger import ledger_totals
+from .models import Tenant, ElectricityReading, ExpenseCategory, Expense
+from .serializers import TenantSerializer, ExpenseCategorySerializer, ExpenseSerializer
+
+ZERO = Decimal('0.00')
+# Number of latest expenses included in the dashboard
+DASHBOARD_RECENT_EXPENSES = 10
+
+
+def month_bounds(year, month):
+    """First and last day of a month, plus its number of days."""
+    days = calendar.monthrange(year, month)[1]
+    return datetime.date(year, month, 1), datetime.date(year, month, days), days
+
+
+def occupancy_filter(first_day, last_day):
+    """Q object selecting tenancies that overlap [first_day, last_day]."""
+    return Q(joining_date__lte=last_day) & (Q(leaving_date__isnull=True) | Q(leaving_date__gte=first_day))
+
+
+def rent_by_month(owner, start, end):
+    """
+    Rent income for each month between `start` and `end` ((year, month)
+    tuples, inclusive), counting only the days each tenant occupied.
+    Returns {(year, month): Decimal}.
+
+    One GROUP BY over the owner's tenancies that overlap the range (served by
+    the (owner, joining_date, leaving_date) index) sums rent, and rent x day
+    of the month, per joining and leaving month. A tenancy pays its full rent
+    in the months strictly between the two and occupied_days/month_days of it
+    in the months it starts and ends, so a running total over the series
+    gives each month's rent exactly. The query cost depends on the number of
+    tenancies, not on the length of the range.
+    """
+    first_day, _last, _days = month_bounds(*start)
+    _first, last_day, _days = month_bounds(*end)
+
+    # 1. Rent moving in and out, per joining and leaving month
+    moves = (
+        Tenant.objects.filter(occupancy_filter(first_day, last_day), owner=owner)
+        # Ignore tenancies with a leaving date before their joining date
+        .exclude(leaving_date__lt=F('joining_date'))
+        .values(
+            joined_year=ExtractYear('joining_date'), joined_month=ExtractMonth('joining_date'),
+            left_year=ExtractYear('leaving_date'), left_month=ExtractMonth('leaving_date'),
+        )
+        .annotate(
+            rent_total=Sum('rent'),
+            joined_rent_days=Sum(F('rent') * ExtractDay('joining_date')),
+            left_rent_days=Sum(F('rent') * ExtractDay('leaving_date')),
+        )
+        .order_by()
+    )
+    joined = defaultdict(lambda: [ZERO, ZERO])
+    left = defaultdict(lambda: [ZERO, ZERO])
+    for row in moves:
+        rent = Decimal(row['rent_total'])
+        entry = joined[(row['joined_year'], row['joined_month'])]
+        entry[0] += rent
+        entry[1] += Decimal(row['joined_rent_days'])
+        if row['left_year'] is not None:
+            entry = left[(row['left_year'], row['left_month'])]
+            entry[0] += rent
+            entry[1] += Decimal(row['left_rent_days'])
+
+    # 2. Walk the range; tenancies that joined before it are active from the start
+    active = sum((rent for key, (rent, _rent_days) in joined.items() if key < start), ZERO)
+    result = {}
+    for year, month in month_range(start, end):
+        days = month_bounds(year, month)[2]
+        joined_rent, joined_rent_days = joined.get((year, month), (ZERO, ZERO))
+        left_rent, left_rent_days = left.get((year, month), (ZERO, ZERO))
+        active += joined_rent
+        # Whole month for everyone active, except leavers stop on their leaving
+        # day and joiners start on their joining day
+        rent_days = (
+            (active - left_rent) * days + left_rent_days
+            - (joined_rent_days - joined_rent)
+        )
+        result[(year, month)] = (rent_days / days).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        active -= left_rent
+    return result
+
+
+def tenant_bill_rows(owner, month, year):
+    """
+    Returns one row per tenant owned by `owner` who occupied the room during
+    the given month/year or has a reading for it, LEFT JOINed to that reading
+    (bill is None when no reading exists). Runs a single query regardless of
+    the number of tenants.
+    """
+    first_day, last_day, _days = month_bounds(year, month)
+    return (
+        Tenant.objects.filter(owner=owner)
+        .annotate(
+            month_reading=FilteredRelation(
+                'electricity_readings',
+                condition=Q(
+                    electricity_readings__month=month,
+                    electricity_readings__year=year,
+                ),
+            )
+        )
+        .filter(occupancy_filter(first_day, last_day) | Q(month_reading__isnull=False))
+        .order_by('id')
+        .values(
+            'id', 'name', 'room_no', 'rent',
+            bill=F('month_reading__calculated_bill'),
+            total_units=F('month_reading__total_units'),
+            is_paid=F('month_reading__is_paid'),
+        )
+    )
+
+
+def summary_payload(rows, totals, total_rent):
+    """
+    Builds the monthly summary from tenant bill rows, ledger totals and the
+    month's prorated rent.
+    All money values are Decimals; nothing is converted to float here. A tenant
+    without a reading keeps the integer bill 0 the endpoint has always returned.
+    """
+    tenants = [{
+        "tenant_id": row['id'],
+        "name": row['name'],
+        "room_no": row['room_no'],
+        "bill": row['bill'] if row['bill'] is not None else 0,
+        "is_paid": bool(row['is_paid']),
+    } for row in rows]
+
+    total_electricity = totals['electricity_billed']
+    total_expenses = totals['total_expenses']
+
+    return {
+        "tenants": tenants,
+        "total_rent": total_rent,
+        "total_electricity": total_electricity,
+        "total_other_expenses": total_expenses,
+        "net_balance": total_rent - (total_electricity + total_expenses),
+    }
+
+
+def monthly_summary_data(owner, month, year):
+    """
+    Computes the monthly financial summary for a single owner in three queries:
+    one LEFT JOIN of tenants to their readings, one MonthlyLedger lookup for
+    the electricity and expense totals and one prorated rent aggregate.
+    """
+    return summary_payload(
+        tenant_bill_rows(owner, month, year),
+        ledger_totals(owner, month, year),
+        rent_by_month(owner, (year, month), (year, month))[(year, month)],
+    )
+
+
+def month_range(start, end):
+    """Yields (year, month) pairs from `start` to `end` inclusive."""
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def previous_month(period):
+    """The (year, month) before `period`."""
+    year, month = period
+    return (year - 1, 12) if month == 1 else (year, month - 1)
+
+
+def period_filter(start, end, prefix=''):
+    """Q object selecting rows whose (year, month) falls within [start, end]."""
+    year, month = f'{prefix}year', f'{prefix}month'
+    return (
+        (Q(**{f'{year}__gt': start[0]}) | Q(**{year: start[0], f'{month}__gte': start[1]}))
+        & (Q(**{f'{year}__lt': end[0]}) | Q(**{year: end[0], f'{month}__lte': end[1]}))
+    )
+
+
+def grouped_month_totals(queryset, field, start, end):
+    """{(year, month): Sum(field)} over `queryset` within [start, end], in one GROUP BY query."""
+    return {
+        (row['year'], row['month']): row['total']
+        for row in queryset.filter(period_filter(start, end))
+        .values('year', 'month').annotate(total=Sum(field)).order_by()
+    }
+
+
+def range_series(start, end, rent, electricity, expenses):
+    """
+    Fills the per-month series between `start` and `end` from grouped totals,
+    including months with no data, and sums the range totals.
+    """
+    months = []
+    totals = dict.fromkeys(('total_rent', 'total_electricity', 'total_other_expenses', 'net_balance'), ZERO)
+    for year, month in month_range(start, end):
+        entry = {
+            "year": year,
+            "month": month,
+            "label": f"{year:04d}-{month:02d}",
+            "total_rent": rent.get((year, month)) or ZERO,
+            "total_electricity": electricity.get((year, month)) or ZERO,
+            "total_other_expenses": expenses.get((year, month)) or ZERO,
+        }
+        entry["net_balance"] = entry["total_rent"] - (
+            entry["total_electricity"] + entry["total_other_expenses"]
+        )
+        for key in totals:
+            totals[key] += entry[key]
+        months.append(entry)
+
+    return {"months": months, "totals": totals}
+
+
+def range_summary_data(owner, start, end):
+    """
+    Computes a per-month series of rent, electricity, other expenses and net
+    balance between `start` and `end` ((year, month) tuples, inclusive).
+
+    Uses one GROUP BY (year, month) query per table plus one prorated rent
+    aggregate (see rent_by_month), so the query count does not depend on the range length.
+    Months without any readings or expenses are filled with zeros.
+    """
+    # 1. One grouped pass over readings and one over expenses
+    electricity = grouped_month_totals(
+        ElectricityReading.objects.filter(tenant__owner=owner), 'calculated_bill', start, end
+    )
+    expenses = grouped_month_totals(Expense.objects.filter(owner=owner), 'amount', start, end)
+
+    # 2. Rent for the days each tenant occupied, per month
+    rent = rent_by_month(owner, start, end)
+
+    # 3. Fill the series, including empty months
+    return range_series(start, end, rent, electricity, expenses)
+
+
+def serialized_rows(queryset, serializer_class):
+    """`queryset` as its serializer's output, via the values() fast path (one query)."""
+    mapping = compile_fields(serializer_class)
+    return serialize_values(values_queryset(queryset, mapping), mapping)
+
+
+def dashboard_lists(owner, month, year):
+    """
+    The lists shown next to the monthly summary on the dashboard, in four
+    queries regardless of the amount of data: the month's expenses grouped by
+    category, the owner's latest expenses, and the category and tenant lists
+    (serialized exactly like the corresponding list endpoints).
+    """
+    breakdown = (
+        Expense.objects.filter(owner=owner, month=month, year=year)
+        .values('category', category_name=F('category__name'))
+        .annotate(total=Sum('amount'))
+        .order_by('-total', 'category')
+    )
+    recent = Expense.objects.filter(owner=owner).order_by('-date', 'id')[:DASHBOARD_RECENT_EXPENSES]
+    return {
+        "expense_breakdown": [
+            {"category": row['category'], "category_name": row['category_name'], "total": row['total']}
+            for row in breakdown
+        ],
+        "recent_expenses": serialized_rows(recent, ExpenseSerializer),
+        "categories": serialized_rows(ExpenseCategory.objects.filter(owner=owner).order_by('id'), ExpenseCategorySerializer),
+        "tenants": serialized_rows(Tenant.objects.filter(owner=owner).order_by('id'), TenantSerializer),
+    }
+
+
+class _WindowSum(Func):
+    """SUM() usable as a window over an aggregate, e.g. SUM(SUM(amount)) OVER (...)."""
+    function = 'SUM'
+    window_compatible = True
+
+
+def _percent(part, whole):
+    return (part * 100 / whole).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP) if whole else ZERO
+
+
+def _cents(value):
+    return Decimal(value).quantize(Decimal('0.01'))
+
+
+def expense_breakdown(owner, start, end, top=5):
+    """
+    Per-category expense analytics between `start` and `end` ((year, month)
+    tuples, inclusive): totals, counts and share of spend for the whole range
+    (with its `top` categories) and for each month, where every category also
+    carries its month-over-month change.
+
+    A single GROUP BY (year, month, category) query, starting one month early
+    so the first month has a baseline, computes everything per month: window
+    functions add the month's total (for shares), each category's rank within
+    the month and, via LAG over the category's months, its previous total.
+    Range totals are summed from those grouped rows.
+    """
+    lead_in = previous_month(start)
+    by_month = [F('year'), F('month')]
+    by_category_period = {'partition_by': [F('category')], 'order_by': by_month}
+    rows = (
+        Expense.objects.filter(period_filter(lead_in, end), owner=owner)
+        .values('year', 'month', 'category', category_name=F('category__name'))
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .annotate(
+            month_total=Window(_WindowSum(Sum('amount')), partition_by=by_month),
+            rank=Window(Rank(), partition_by=by_month, order_by=F('total').desc()),
+            previous_total=Window(Lag('total'), **by_category_period),
+            previous_year=Window(Lag('year'), **by_category_period),
+            previous_month=Window(Lag('month'), **by_category_period),
+        )
+        .order_by('year', 'month', 'rank', 'category')
+    )
+
+    # 1. Per-month entries; LAG only counts when the category's previous row is the previous month
+    months = {key: [] for key in month_range(lead_in, end)}
+    for row in rows:
+        key = (row['year'], row['month'])
+        adjacent = (row['previous_year'], row['previous_month']) == previous_month(key)
+        previous = _cents(row['previous_total']) if adjacent else ZERO
+        total = _cents(row['total'])
+        months[key].append({
+            "category": row['category'],
+            "category_name": row['category_name'],
+            "total": total,
+            "count": row['count'],
+            "share": _percent(total, row['month_total']),
+            "rank": row['rank'],
+            "previous_total": previous,
+            "change": total - previous,
+        })
+
+    # 2. Categories that had spend in the previous month but none this month
+    series = []
+    for key in month_range(start, end):
+        entries = months[key]
+        present = {entry['category'] for entry in entries}
+        for gone in months[previous_month(key)]:
+            if gone['count'] and gone['category'] not in present:
+                entries.append({
+                    "category": gone['category'], "category_name": gone['category_name'],
+                    "total": ZERO, "count": 0, "share": ZERO, "rank": None,
+                    "previous_total": gone['total'], "change": -gone['total'],
+                })
+        series.append({
+            "year": key[0],
+            "month": key[1],
+            "label": f"{key[0]:04d}-{key[1]:02d}",
+            "total": sum((entry['total'] for entry in entries), ZERO),
+            "count": sum(entry['count'] for entry in entries),
+            "categories": entries,
+        })
+
+    # 3. Range totals per category, largest first
+    totals = {}
+    for month in series:
+        for entry in month['categories']:
+            if entry['count']:
+                total = totals.setdefault(entry['category'], {
+                    "category": entry['category'], "category_name": entry['category_name'],
+                    "total": ZERO, "count": 0,
+                })
+                total['total'] += entry['total']
+                total['count'] += entry['count']
+    range_total = sum((entry['total'] for entry in totals.values()), ZERO)
+    categories = sorted(totals.values(), key=lambda entry: (-entry['total'], entry['category'] is None, entry['category'] or 0))
+    for rank, entry in enumerate(categories, start=1):
+        entry['share'] = _percent(entry['total'], range_total)
+        entry['rank'] = rank
+
+    return {
+        "total": range_total,
+        "count": sum(entry['count'] for entry in categories),
+        "categories": categories,
+        "top": categories[:top],
+        "months": series,
+    }
+
+
+# Ageing buckets for unpaid bills: (label, maximum age in days or None)
+AGEING_BUCKETS = (('0-30', 30), ('31-60', 60), ('60+', None))
+
+
+def ageing_bucket(age_days):
+    """Label of the AGEING_BUCKETS entry an unpaid bill of `age_days` falls in."""
+    for label, limit in AGEING_BUCKETS:
+        if limit is None or age_days <= limit:
+            return label
+
+
+def outstanding_dues(owner, as_of):
+    """
+    Every unpaid electricity bill of the owner's tenants, grouped by tenant
+    (largest arrears first) with each tenant's running total, oldest bill
+    first, and totals per ageing bucket. A bill's age counts from the last
+    day of its billing month to `as_of`.
+
+    One query over the partial index on unpaid readings, so the cost follows
+    the number of unpaid bills rather than the full reading history; the
+    running totals are a window SUM per tenant.
+    """
+    rows = (
+        ElectricityReading.objects.filter(is_paid=False, tenant__owner=owner)
+        .annotate(running_total=Window(
+            Sum('calculated_bill'), partition_by=[F('tenant_id')], order_by=[F('year'), F('month')],
+        ))
+        .order_by('tenant_id', 'year', 'month')
+        .values(
+            'id', 'tenant_id', 'year', 'month', 'total_units', 'calculated_bill', 'running_total',
+            tenant_name=F('tenant__name'), room_no=F('tenant__room_no'),
+        )
+    )
+
+    tenants = {}
+    buckets = {label: ZERO for label, _limit in AGEING_BUCKETS}
+    for row in rows:
+        tenant = tenants.get(row['tenant_id'])
+        if tenant is None:
+            tenant = tenants[row['tenant_id']] = {
+                "tenant_id": row['tenant_id'],
+                "name": row['tenant_name'],
+                "room_no": row['room_no'],
+                "total_outstanding": ZERO,
+                "count": 0,
+                "buckets": {label: ZERO for label, _limit in AGEING_BUCKETS},
+                "readings": [],
+            }
+        bill = _cents(row['calculated_bill'])
+        age = max((as_of - month_bounds(row['year'], row['month'])[1]).days, 0)
+        bucket = ageing_bucket(age)
+        tenant['readings'].append({
+            "id": row['id'],
+            "year": row['year'],
+            "month": row['month'],
+            "label": f"{row['year']:04d}-{row['month']:02d}",
+            "total_units": row['total_units'],
+            "bill": bill,
+            "running_total": _cents(row['running_total']),
+            "age_days": age,
+            "bucket": bucket,
+        })
+        tenant['total_outstanding'] += bill
+        tenant['count'] += 1
+        tenant['buckets'][bucket] += bill
+        buckets[bucket] += bill
+
+    ordered = sorted(tenants.values(), key=lambda tenant: (-tenant['total_outstanding'], tenant['tenant_id']))
+    return {
+        "as_of": as_of.isoformat(),
+        "total_outstanding": sum((tenant['total_outstanding'] for tenant in ordered), ZERO),
+        "count": sum(tenant['count'] for tenant in ordered),
+        "buckets": buckets,
+        "tenants": ordered,
+    }
@@ -0,0 +1,1418 @@
+import csv
+import datetime
+import gzip
+import hashlib
+import importlib
+import io
+import json
+import logging
+import threading
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIHandler
+from django.db import OperationalError, connection
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, Resolver404, clear_url_caches, resolve, reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from home_expense_manager import urls as project_urls
+from home_expense_manager.warmup import warm_up
+
+from app import db_routing, fast_lists, metrics
+from app.authentication import CachedTokenAuthentication, token_cache
+from app.ledger import ledger_drift
+from app.middleware import CompressionMiddleware, ReplicaRoutingMiddleware
+from app.summary import outstanding_dues
+from app.billing import bill_expression, recompute_bills
+from app.models import Tenant, ElectricityReading, ExpenseCategory, Expense, MonthlyLedger, Tariff, TariffSlab
+from app.serializers import (
+    TenantSerializer,
+    ElectricityReadingSerializer,
+    ExpenseCategorySerializer,
+    ExpenseSerializer,
+)
+
+User = get_user_model()
+logger = logging.getLogger('django.request')
+
+
+class FastListTests(APITestCase):
+    """The values()-based list endpoints match the serializers and use a fixed number of queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', password='x', is_superuser=True)
+        cls.other = User.objects.create_user('other', password='x', is_superuser=True)
+        cls.category = ExpenseCategory.objects.create(owner=cls.owner, name='Plumber')
+        Tenant.objects.create(owner=cls.other, name='Not mine', room_no='X1', contact_no='0', rent=Decimal('1.00'))
+
+    def setUp(self):
+        # The async endpoints authenticate the token themselves
+        token = Token.objects.create(user=self.owner)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def add_rows(self, count, start=0):
+        for i in range(start, start + count):
+            tenant = Tenant.objects.create(
+                owner=self.owner, name=f'Tenant {i}', room_no=f'R{i}', contact_no='0',
+                joining_date=datetime.date(2024, 1, 1), rent=Decimal('5000.50'),
+            )
+            ElectricityReading.objects.create(
+                tenant=tenant, month=3, year=2025, previous_reading=Decimal('10.5'),
+                current_reading=Decimal('110.25'), rate_per_unit=Decimal('8'),
+            )
+            Expense.objects.create(
+                owner=self.owner, category=self.category if i % 2 else None, amount=Decimal('99.9'),
+                date=datetime.date(2025, 3, 1 + i % 28), month=3, year=2025, description=f'Row {i}',
+            )
+            ExpenseCategory.objects.create(owner=self.owner, name=f'Category {i}')
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        urls = [
+            '/api/tenants/', '/api/categories/', '/api/expenses/?year=2025',
+            '/api/readings/?year=2025', '/api/expenses/?year=2025&page_size=5',
+            '/api/async/tenants/', '/api/async/categories/', '/api/async/expenses/?year=2025',
+            '/api/async/readings/?year=2025',
+        ]
+        self.add_rows(2)
+        # Warm the token cache so the first count does not include the token lookup
+        self.count_queries(urls[0])
+        small = {url: self.count_queries(url) for url in urls}
+        self.add_rows(20, start=2)
+        large = {url: self.count_queries(url) for url in urls}
+        self.assertEqual(small, large)
+
+    def test_output_matches_model_serializers(self):
+        self.add_rows(5)
+        cases = [
+            ('/api/tenants/', TenantSerializer, Tenant.objects.filter(owner=self.owner)),
+            ('/api/categories/', ExpenseCategorySerializer, ExpenseCategory.objects.filter(owner=self.owner)),
+            ('/api/expenses/', ExpenseSerializer, Expense.objects.filter(owner=self.owner)),
+            ('/api/readings/?year=2025', ElectricityReadingSerializer,
+             ElectricityReading.objects.filter(tenant__owner=self.owner, year=2025)),
+        ]
+        for url, serializer_class, queryset in cases:
+            with self.subTest(url=url):
+                expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+                self.assertEqual(self.client.get(url).content, expected)
+
+    def test_sparse_fieldsets_select_only_requested_columns(self):
+        self.add_rows(3)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/tenants/?fields=id,name,room_no')
+        self.assertEqual(list(response.json()[0]), ['id', 'name', 'room_no'])
+        select = next(q['sql'] for q in queries if 'FROM "app_tenant"' in q['sql'])
+        self.assertNotIn('rent', select)
+        self.assertNotIn('auth_user', select)
+
+        response = self.client.get('/api/categories/?omit=owner,owner_username,description')
+        self.assertEqual(list(response.json()[0]), ['id', 'name'])
+        self.assertEqual(self.client.get('/api/expenses/?fields=nope').status_code, 400)
+
+    def test_readings_etag_follows_the_default_month(self):
+        for url in ('/api/readings/', '/api/async/readings/'):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+                with mock.patch('app.conditional.datetime') as clock:
+                    clock.date.today.return_value = datetime.date(2099, 1, 1)
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+                # An explicit period does not depend on the date
+                etag = self.client.get(url + '?year=2025')['ETag']
+                with mock.patch('app.conditional.datetime') as clock:
+                    clock.date.today.return_value = datetime.date(2099, 1, 1)
+                    self.assertEqual(self.client.get(url + '?year=2025', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class TokenCacheTests(APITestCase):
+    """Cached token authentication shares only user ids between processes and forgets users when they change."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('token-cache', password='x')
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.auth = CachedTokenAuthentication()
+
+    def authenticate(self):
+        with CaptureQueriesContext(connection) as queries:
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual((user.pk, token.key), (self.user.pk, self.token.key))
+        return user, len(queries)
+
+    def test_shared_tier_holds_only_the_user_id(self):
+        self.assertEqual(self.authenticate()[1], 1)
+        shared = cache.get('authtoken:' + hashlib.sha256(self.token.key.encode()).hexdigest())
+        self.assertEqual(shared[0], self.user.pk)
+        self.assertIsInstance(shared[1], float)
+        self.assertEqual(self.authenticate()[1], 0)
+
+        # Another process finds the shared entry and loads the user into its own LRU
+        token_cache.clear()
+        hits = token_cache.stats()['shared_hits']
+        self.assertEqual(self.authenticate()[1], 1)
+        self.assertEqual(token_cache.stats()['shared_hits'], hits + 1)
+        self.assertEqual(self.authenticate()[1], 0)
+
+    def test_any_user_save_revokes(self):
+        self.authenticate()
+        self.user.first_name = 'Changed'
+        self.user.save()
+        user, queries = self.authenticate()
+        self.assertEqual((user.first_name, queries), ('Changed', 1))
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+
+    def test_process_local_entries_expire_after_local_ttl(self):
+        with override_settings(TOKEN_AUTH_CACHE={'TTL': 60, 'LOCAL_TTL': 5, 'USE_DJANGO_CACHE': False}), \
+                mock.patch('app.authentication.time.time') as clock:
+            clock.return_value = 1000.0
+            self.assertEqual(self.authenticate()[1], 1)
+            clock.return_value = 1004.0
+            self.assertEqual(self.authenticate()[1], 0)
+            # Another worker's revocation is not seen here, so the entry must not outlive LOCAL_TTL
+            clock.return_value = 1006.0
+            self.assertEqual(self.authenticate()[1], 1)
+
+
+class KeysetPaginationTests(APITestCase):
+    """Cursor pages seek on every ordering field, so ties on year or date cost no offset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('pages', password='x', is_superuser=True)
+        for i in range(7):
+            tenant = Tenant.objects.create(owner=cls.owner, name=f'Tenant {i}', room_no=f'P{i}', contact_no='0',
+                                           rent=Decimal('1.00'))
+            for month in (2, 3):
+                ElectricityReading.objects.create(
+                    tenant=tenant, month=month, year=2025, previous_reading=Decimal('0'),
+                    current_reading=Decimal('1'), rate_per_unit=Decimal('1'),
+                )
+            Expense.objects.create(owner=cls.owner, amount=Decimal('1'), date=datetime.date(2025, 3, 1 + i % 2))
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def walk(self, url):
+        """Ids of every page following 'next', then of every page following 'previous' back."""
+        forward, response = [], self.client.get(url)
+        while True:
+            data = response.json()
+            forward.append([row['id'] for row in data['results']])
+            if not data['next']:
+                break
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(data['next'])
+            self.assertFalse(any('OFFSET' in q['sql'] for q in queries))
+        backward = [forward[-1]]
+        while data['previous']:
+            data = self.client.get(data['previous']).json()
+            backward.insert(0, [row['id'] for row in data['results']])
+        return forward, backward
+
+    def test_pages_follow_the_full_ordering(self):
+        cases = [
+            ('/api/readings/?year=2025&page_size=3',
+             ElectricityReading.objects.filter(tenant__owner=self.owner).order_by('-year', '-month', 'id')),
+            ('/api/expenses/?page_size=2', Expense.objects.filter(owner=self.owner).order_by('-date', 'id')),
+        ]
+        for url, queryset in cases:
+            with self.subTest(url=url):
+                forward, backward = self.walk(url)
+                self.assertEqual(sum(forward, []), list(queryset.values_list('pk', flat=True)))
+                self.assertEqual(backward, forward)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/expenses/', {'cursor': 'not-a-cursor'}).status_code, 404)
+
+
+class MonthlySummaryTests(APITestCase):
+    """The monthly summary covers only the owner's data and runs a fixed number of queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('summary', password='x', is_superuser=True)
+        other = User.objects.create_user('summary-other', password='x', is_superuser=True)
+        tenant = Tenant.objects.create(owner=other, name='Not mine', room_no='N1', contact_no='0',
+                                       joining_date=datetime.date(2024, 1, 1), rent=Decimal('9999.00'))
+        ElectricityReading.objects.create(tenant=tenant, month=3, year=2025, previous_reading=Decimal('0'),
+                                          current_reading=Decimal('100'), rate_per_unit=Decimal('9'))
+        Expense.objects.create(owner=other, amount=Decimal('999'), date=datetime.date(2025, 3, 1))
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def add_tenants(self, count, start=0):
+        for i in range(start, start + count):
+            tenant = Tenant.objects.create(
+                owner=self.owner, name=f'Tenant {i}', room_no=f'M{i}', contact_no='0',
+                joining_date=datetime.date(2024, 1, 1), rent=Decimal('1000.00'),
+            )
+            # Every other tenant has no reading for the month
+            if i % 2:
+                ElectricityReading.objects.create(
+                    tenant=tenant, month=3, year=2025, previous_reading=Decimal('0'),
+                    current_reading=Decimal('10'), rate_per_unit=Decimal('8.5'),
+                )
+            Expense.objects.create(owner=self.owner, amount=Decimal('10.25'), date=datetime.date(2025, 3, 2))
+
+    def get_summary(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/monthly-summary/?month=3&year=2025')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries)
+
+    def test_owner_totals_and_constant_queries(self):
+        self.add_tenants(2)
+        small, small_queries = self.get_summary()
+        self.assertEqual(
+            [(t['name'], t['bill'], t['is_paid']) for t in small['tenants']],
+            [('Tenant 0', 0, False), ('Tenant 1', 85.0, False)],
+        )
+        # Tenants without a reading keep the integer 0 bill
+        self.assertIsInstance(small['tenants'][0]['bill'], int)
+        self.assertEqual(
+            (small['total_rent'], small['total_electricity'], small['total_other_expenses'], small['net_balance']),
+            (2000.0, 85.0, 20.5, 1894.5),
+        )
+
+        self.add_tenants(20, start=2)
+        large, large_queries = self.get_summary()
+        self.assertEqual(len(large['tenants']), 22)
+        self.assertEqual(large['total_electricity'], 935.0)
+        self.assertEqual(large_queries, small_queries)
+
+
+class SummaryCacheTests(APITestCase):
+    """Summaries are cached per owner data version; an owner's writes invalidate only that owner's entries."""
+
+    URL = '/api/monthly-summary/?month=3&year=2025'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('cached', password='x', is_superuser=True)
+        cls.other = User.objects.create_user('cached-other', password='x', is_superuser=True)
+        for user in (cls.owner, cls.other):
+            tenant = Tenant.objects.create(owner=user, name='Tenant', room_no=f'C{user.pk}', contact_no='0',
+                                           joining_date=datetime.date(2024, 1, 1), rent=Decimal('1000.00'))
+            ElectricityReading.objects.create(tenant=tenant, month=3, year=2025, previous_reading=Decimal('0'),
+                                              current_reading=Decimal('10'), rate_per_unit=Decimal('8'))
+
+    def get_summary(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        return response['X-Cache'], response.json()['total_electricity']
+
+    def test_writes_invalidate_the_owner_only(self):
+        hits = metrics.CACHE_REQUESTS.labels('summary', 'hit')
+        before = hits._value.get()
+        self.assertEqual(self.get_summary(self.owner), ('MISS', 80.0))
+        self.assertEqual(self.get_summary(self.owner), ('HIT', 80.0))
+        self.assertEqual(self.get_summary(self.other), ('MISS', 80.0))
+        self.assertEqual(hits._value.get(), before + 1)
+
+        # A write through the API, then one straight through the model
+        self.client.force_authenticate(self.owner)
+        response = self.client.post('/api/expenses/', {'amount': '5.00', 'date': '2025-03-01'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.get_summary(self.owner), ('MISS', 80.0))
+        reading = ElectricityReading.objects.get(tenant__owner=self.owner)
+        reading.current_reading = Decimal('20')
+        reading.save()
+        self.assertEqual(self.get_summary(self.owner), ('MISS', 160.0))
+        self.assertEqual(self.get_summary(self.owner), ('HIT', 160.0))
+
+        self.assertEqual(self.get_summary(self.other), ('HIT', 80.0))
+
+
+class MonthlyLedgerTests(APITestCase):
+    """Reading and expense writes keep the MonthlyLedger rollup equal to the raw rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('ledger', password='x', is_superuser=True)
+        cls.tenant = Tenant.objects.create(owner=cls.owner, name='Tenant', room_no='L1', contact_no='0',
+                                           rent=Decimal('1.00'))
+
+    def assertNoDrift(self):
+        self.assertEqual(ledger_drift([self.owner.pk]), [])
+
+    def ledger(self, month):
+        return MonthlyLedger.objects.filter(owner=self.owner, year=2025, month=month).values(
+            'electricity_billed', 'electricity_paid', 'electricity_unpaid', 'total_expenses',
+        ).first()
+
+    def test_saves_and_deletes(self):
+        reading = ElectricityReading.objects.create(
+            tenant=self.tenant, month=1, year=2025, previous_reading=Decimal('0'),
+            current_reading=Decimal('10'), rate_per_unit=Decimal('7.5'),
+        )
+        expense = Expense.objects.create(owner=self.owner, amount=Decimal('40.10'), date=datetime.date(2025, 1, 9))
+        self.assertNoDrift()
+        self.assertEqual(self.ledger(1), {
+            'electricity_billed': Decimal('75.00'), 'electricity_paid': Decimal('0.00'),
+            'electricity_unpaid': Decimal('75.00'), 'total_expenses': Decimal('40.10'),
+        })
+
+        reading.is_paid = True
+        reading.save()
+        self.assertNoDrift()
+        # Moving rows to another month takes their amounts out of the old month
+        reading.month = 2
+        reading.current_reading = Decimal('20')
+        reading.save()
+        expense.date = datetime.date(2025, 2, 1)
+        expense.amount = Decimal('12.00')
+        expense.save()
+        self.assertNoDrift()
+        self.assertEqual(self.ledger(2)['electricity_paid'], Decimal('150.00'))
+        self.assertEqual(self.ledger(1)['electricity_billed'] + self.ledger(1)['total_expenses'], 0)
+
+        expense.delete()
+        reading.delete()
+        self.assertNoDrift()
+        self.assertEqual(self.ledger(2)['electricity_billed'] + self.ledger(2)['total_expenses'], 0)
+
+    def test_tenant_delete_and_rebuild(self):
+        for month in (1, 2):
+            ElectricityReading.objects.create(
+                tenant=self.tenant, month=month, year=2025, previous_reading=Decimal('0'),
+                current_reading=Decimal('5'), rate_per_unit=Decimal('3'),
+            )
+        self.tenant.delete()
+        self.assertNoDrift()
+
+        Expense.objects.create(owner=self.owner, amount=Decimal('5'), date=datetime.date(2025, 3, 1))
+        MonthlyLedger.objects.filter(owner=self.owner).update(total_expenses=Decimal('999'))
+        with self.assertRaises(CommandError):
+            call_command('rebuild_ledger', '--verify', '--owner', str(self.owner.pk), stdout=io.StringIO(),
+                         stderr=io.StringIO())
+        call_command('rebuild_ledger', '--owner', str(self.owner.pk), stdout=io.StringIO())
+        self.assertNoDrift()
+
+
+class OccupancyRentTests(APITestCase):
+    """Summary rent counts only the days each tenant occupied the room."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('landlord', password='x', is_superuser=True)
+        tenancies = [
+            # (joining, leaving, rent)
+            (datetime.date(2024, 1, 1), None, '3000.00'),                        # whole month
+            (datetime.date(2025, 3, 17), None, '3100.00'),                       # 15 of 31 days
+            (datetime.date(2024, 5, 1), datetime.date(2025, 3, 10), '6200.00'),  # 10 of 31 days
+            (datetime.date(2025, 3, 5), datetime.date(2025, 3, 20), '3100.00'),  # 16 of 31 days
+            (datetime.date(2023, 1, 1), datetime.date(2025, 2, 28), '9999.00'),  # left before March
+        ]
+        for i, (joining, leaving, rent) in enumerate(tenancies):
+            Tenant.objects.create(
+                owner=cls.owner, name=f'Tenant {i}', room_no=f'O{i}', contact_no='0',
+                joining_date=joining, leaving_date=leaving, rent=Decimal(rent),
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def test_monthly_summary_prorates_partial_months(self):
+        data = self.client.get('/api/monthly-summary/?month=3&year=2025').json()
+        self.assertEqual(data['total_rent'], 8100.0)
+        self.assertEqual([t['name'] for t in data['tenants']], ['Tenant 0', 'Tenant 1', 'Tenant 2', 'Tenant 3'])
+
+    def test_range_rent_uses_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/summary/range/?from=2025-02&to=2025-04').json()
+        self.assertEqual([m['total_rent'] for m in data['months']], [19199.0, 8100.0, 6100.0])
+        rent_queries = [q for q in queries if 'FROM "app_tenant"' in q['sql']]
+        self.assertEqual(len(rent_queries), 1)
+
+
+class AsyncSummaryTests(APITransactionTestCase):
+    """The async summary endpoints return the same bytes as the sync ones and answer HEAD like GET."""
+
+    # Committed rather than TestCase data: run_concurrently() reads on its own threads' connections
+    def setUp(self):
+        self.owner = User.objects.create_user('async-summary', password='x', is_superuser=True)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.owner).key}')
+        category = ExpenseCategory.objects.create(owner=self.owner, name='Repairs')
+        for i in range(3):
+            tenant = Tenant.objects.create(
+                owner=self.owner, name=f'Tenant {i}', room_no=f'S{i}', contact_no='0',
+                joining_date=datetime.date(2024, 1, 1), rent=Decimal('4000.00'),
+            )
+            # The last tenant has no reading for March
+            if i < 2:
+                ElectricityReading.objects.create(
+                    tenant=tenant, month=3, year=2025, previous_reading=Decimal('0'),
+                    current_reading=Decimal('40.5'), rate_per_unit=Decimal('8'), is_paid=bool(i),
+                )
+        for month in (2, 3):
+            Expense.objects.create(
+                owner=self.owner, category=category, amount=Decimal('250.75'),
+                date=datetime.date(2025, month, 10), month=month, year=2025,
+            )
+
+    def test_payloads_match_the_sync_endpoints(self):
+        for query in ('monthly-summary/?month=3&year=2025', 'summary/range/?from=2025-01&to=2025-04'):
+            with self.subTest(query=query):
+                sync = self.client.get(f'/api/{query}')
+                response = self.client.get(f'/api/async/{query}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content, sync.content)
+
+        for query in ('monthly-summary/?month=13&year=2025', 'summary/range/?from=2025-04&to=2025-01'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/{query}').status_code, 400)
+                self.assertEqual(self.client.get(f'/api/async/{query}').status_code, 400)
+
+    def test_head_and_other_methods(self):
+        url = '/api/async/monthly-summary/?month=3&year=2025'
+        response = self.client.head(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], self.client.get(url)['ETag'])
+        self.assertEqual(self.client.head(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Allow'], 'GET, HEAD')
+
+
+class SummaryRangeTests(APITestCase):
+    """The range endpoint returns every month between from and to, with or without data, and their totals."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('range', password='x', is_superuser=True)
+        tenant = Tenant.objects.create(owner=cls.owner, name='Tenant', room_no='G1', contact_no='0',
+                                       joining_date=datetime.date(2024, 1, 1), rent=Decimal('1000.00'))
+        ElectricityReading.objects.create(tenant=tenant, month=12, year=2024, previous_reading=Decimal('0'),
+                                          current_reading=Decimal('20'), rate_per_unit=Decimal('6'))
+        Expense.objects.create(owner=cls.owner, amount=Decimal('30.50'), date=datetime.date(2025, 2, 3))
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def test_series_across_a_year_boundary(self):
+        data = self.client.get('/api/summary/range/?from=2024-11&to=2025-02').json()
+        self.assertEqual((data['from'], data['to']), ('2024-11', '2025-02'))
+        self.assertEqual(
+            [(m['label'], m['total_electricity'], m['total_other_expenses'], m['net_balance']) for m in data['months']],
+            [('2024-11', 0.0, 0.0, 1000.0), ('2024-12', 120.0, 0.0, 880.0),
+             ('2025-01', 0.0, 0.0, 1000.0), ('2025-02', 0.0, 30.5, 969.5)],
+        )
+        self.assertEqual(data['totals'], {
+            'total_rent': 4000.0, 'total_electricity': 120.0, 'total_other_expenses': 30.5, 'net_balance': 3849.5,
+        })
+
+    def test_invalid_ranges(self):
+        for query in ('from=2025-01', 'from=2025-1-1&to=2025-02', 'from=2025-02&to=2025-01',
+                      'from=2015-01&to=2025-01', 'from=2025-00&to=2025-01'):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/summary/range/?{query}')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+
+class DashboardTests(APITestCase):
+    """The dashboard endpoint combines the summary and lists with a fixed query budget."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('dashboard', password='x', is_superuser=True)
+        cls.category = ExpenseCategory.objects.create(owner=cls.owner, name='Repairs')
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def add_rows(self, count, start=0):
+        for i in range(start, start + count):
+            tenant = Tenant.objects.create(
+                owner=self.owner, name=f'Tenant {i}', room_no=f'D{i}', contact_no='0',
+                joining_date=datetime.date(2024, 1, 1), rent=Decimal('4000.00'),
+            )
+            ElectricityReading.objects.create(
+                tenant=tenant, month=3, year=2025, previous_reading=Decimal('0'),
+                current_reading=Decimal('50'), rate_per_unit=Decimal('8'),
+            )
+            Expense.objects.create(
+                owner=self.owner, category=self.category if i % 2 else None, amount=Decimal('100'),
+                date=datetime.date(2025, 3, 1 + i % 28), month=3, year=2025, description=f'Row {i}',
+            )
+
+    def get_dashboard(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/dashboard/?month=3&year=2025')
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_payload_and_query_budget(self):
+        self.add_rows(2)
+        _response, small = self.get_dashboard()
+        self.add_rows(20, start=2)
+        Expense.objects.create(owner=self.owner, amount=Decimal('1'), date=datetime.date(2025, 4, 1))
+        response, large = self.get_dashboard()
+        self.assertEqual(small, large)
+
+        data = response.json()
+        summary = self.client.get('/api/monthly-summary/?month=3&year=2025').json()
+        self.assertEqual(data['summary'], summary)
+        self.assertEqual(len(data['tenants']), 22)
+        self.assertEqual(len(data['recent_expenses']), 10)
+        self.assertEqual(data['recent_expenses'][0]['description'], '')
+        self.assertEqual(
+            {row['category_name']: row['total'] for row in data['expense_breakdown']},
+            {None: 1100.0, 'Repairs': 1100.0},
+        )
+
+        # Served from the per-owner cache until the owner's data changes
+        cached, queries = self.get_dashboard()
+        self.assertEqual(cached['X-Cache'], 'HIT')
+        self.assertEqual(queries, 0)
+
+        # Saves and deletes outside the API invalidate it too
+        for write in (
+            lambda: ElectricityReading.objects.filter(tenant__owner=self.owner).first().delete(),
+            lambda: Tenant.objects.filter(owner=self.owner).first().delete(),
+            lambda: self.category.save(),
+        ):
+            write()
+            self.assertEqual(self.get_dashboard()[0]['X-Cache'], 'MISS')
+            self.assertEqual(self.get_dashboard()[0]['X-Cache'], 'HIT')
+
+    def test_years_without_dates_are_rejected(self):
+        token = Token.objects.create(user=self.owner)
+        for path in (
+            '/api/monthly-summary/?month=1&year=0', '/api/monthly-summary/?month=1&year=10000',
+            '/api/dashboard/?month=1&year=0', '/api/summary/range/?from=0-01&to=0-02',
+            '/api/expenses/breakdown/?month=1&year=0', '/api/async/monthly-summary/?month=1&year=0',
+            '/api/async/summary/range/?from=9999-12&to=10000-01',
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path, HTTP_AUTHORIZATION=f'Token {token.key}')
+                self.assertEqual(response.status_code, 400)
+
+
+class ExpenseBreakdownTests(APITestCase):
+    """The category breakdown endpoint aggregates in one query with shares and month-over-month changes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('breakdown', password='x', is_superuser=True)
+        repairs = ExpenseCategory.objects.create(owner=cls.owner, name='Repairs #b')
+        cleaning = ExpenseCategory.objects.create(owner=cls.owner, name='Cleaning #b')
+        for category, amount, day in [
+            (repairs, '300', datetime.date(2025, 1, 5)),
+            (cleaning, '100', datetime.date(2025, 1, 9)),
+            (repairs, '150', datetime.date(2025, 2, 3)),
+            (repairs, '50', datetime.date(2025, 2, 20)),
+            (None, '200', datetime.date(2025, 2, 11)),
+        ]:
+            Expense.objects.create(owner=cls.owner, category=category, amount=Decimal(amount), date=day)
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def test_month_breakdown(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/expenses/breakdown/?month=2&year=2025&top=1').json()
+        self.assertEqual(len([q for q in queries if 'FROM "app_expense"' in q['sql']]), 1)
+        self.assertEqual(data['total'], 400.0)
+        self.assertEqual(
+            [(c['category_name'], c['total'], c['count'], c['share']) for c in data['categories']],
+            [('Repairs #b', 200.0, 2, 50.0), (None, 200.0, 1, 50.0)],
+        )
+        self.assertEqual(len(data['top']), 1)
+        changes = {c['category_name']: (c['previous_total'], c['change']) for c in data['months'][0]['categories']}
+        self.assertEqual(changes, {'Repairs #b': (300.0, -100.0), None: (0.0, 200.0), 'Cleaning #b': (100.0, -100.0)})
+
+    def test_range_and_validation(self):
+        data = self.client.get('/api/expenses/breakdown/?from=2025-01&to=2025-02').json()
+        self.assertEqual(data['top'][0], {
+            'category': data['top'][0]['category'], 'category_name': 'Repairs #b',
+            'total': 500.0, 'count': 3, 'share': 62.5, 'rank': 1,
+        })
+        self.assertEqual([m['total'] for m in data['months']], [400.0, 400.0])
+        cases = {
+            '': "Pass month and year, or from and to (YYYY-MM).",
+            '?from=2025-03&to=2025-01': "'from' must not be after 'to' and the range cannot exceed 120 months.",
+            '?from=2025-03': "'to' must be a month in YYYY-MM format.",
+            '?from=2025-x&to=2025-01': "'from' must be a month in YYYY-MM format.",
+            '?month=13&year=2025': "'month' must be an integer between 1 and 12.",
+            '?month=1&year=abc': "'year' must be an integer between 1 and 9999.",
+            '?month=1&year=2025&top=0': "'top' must be an integer of at least 1.",
+        }
+        for query, error in cases.items():
+            with self.subTest(query=query):
+                response = self.client.get('/api/expenses/breakdown/' + query)
+                self.assertEqual((response.status_code, response.json()), (400, {"error": error}))
+
+
+class TariffTests(APITestCase):
+    """Slab tariffs bill readings in SQL and in Python alike, and tariff changes rebill the affected months."""
+
+    # Fixed charge 100; 0-100 units at 5, 100-200 at 7.25, above 200 at 10
+    SLABS = [
+        {'lower_units': '0', 'upper_units': '100', 'rate': '5'},
+        {'lower_units': '100', 'upper_units': '200', 'rate': '7.25'},
+        {'lower_units': '200', 'upper_units': None, 'rate': '10'},
+    ]
+    # Units read in January, February and March 2025 (flat rate 8)
+    UNITS = {1: Decimal('50'), 2: Decimal('150'), 3: Decimal('250')}
+    FLAT = {1: Decimal('400.00'), 2: Decimal('1200.00'), 3: Decimal('2000.00')}
+    # 100 + 50 * 5; 100 + 100 * 5 + 50 * 7.25; 100 + 100 * 5 + 100 * 7.25 + 50 * 10
+    TARIFF = {1: Decimal('350.00'), 2: Decimal('962.50'), 3: Decimal('1825.00')}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('tariffs', password='x', is_superuser=True)
+        tenant = Tenant.objects.create(owner=cls.owner, name='Tenant', room_no='T1', contact_no='0',
+                                       rent=Decimal('1.00'))
+        meter = Decimal('0')
+        for month, units in cls.UNITS.items():
+            ElectricityReading.objects.create(
+                tenant=tenant, month=month, year=2025, previous_reading=meter,
+                current_reading=meter + units, rate_per_unit=Decimal('8'),
+            )
+            meter += units
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def create_tariff(self, effective_from):
+        tariff = Tariff.objects.create(owner=self.owner, effective_from=effective_from, fixed_charge=Decimal('100'))
+        TariffSlab.objects.bulk_create([
+            TariffSlab(tariff=tariff, lower_units=Decimal(slab['lower_units']), rate=Decimal(slab['rate']),
+                       upper_units=Decimal(slab['upper_units']) if slab['upper_units'] else None)
+            for slab in self.SLABS
+        ])
+        return tariff
+
+    def bills(self):
+        readings = ElectricityReading.objects.filter(tenant__owner=self.owner)
+        return dict(readings.values_list('month', 'calculated_bill'))
+
+    def test_bill_expression_matches_hand_computed_bills(self):
+        tariff = Tariff.objects.prefetch_related('slabs').get(pk=self.create_tariff(datetime.date(2025, 1, 1)).pk)
+        billed = ElectricityReading.objects.filter(tenant__owner=self.owner).annotate(bill=bill_expression(tariff))
+        self.assertEqual({reading.month: reading.bill for reading in billed}, self.TARIFF)
+        self.assertEqual({month: tariff.bill_for(units) for month, units in self.UNITS.items()}, self.TARIFF)
+
+    def test_recompute_bills_rebuilds_the_ledger(self):
+        self.create_tariff(datetime.date(2025, 2, 1))
+        MonthlyLedger.objects.filter(owner=self.owner).update(electricity_billed=0)
+        self.assertEqual(recompute_bills(self.owner.pk), 3)
+        self.assertEqual(self.bills(), {1: self.FLAT[1], 2: self.TARIFF[2], 3: self.TARIFF[3]})
+        self.assertEqual(ledger_drift([self.owner.pk]), [])
+        self.assertEqual(
+            MonthlyLedger.objects.get(owner=self.owner, year=2025, month=2).electricity_billed, self.TARIFF[2]
+        )
+
+    def test_viewset_rebills_on_create_update_and_delete(self):
+        response = self.client.post('/api/tariffs/', {
+            'name': 'Slabs', 'effective_from': '2025-02-01', 'fixed_charge': '100', 'slabs': self.SLABS,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.bills(), {1: self.FLAT[1], 2: self.TARIFF[2], 3: self.TARIFF[3]})
+
+        url = f"/api/tariffs/{response.json()['id']}/"
+        self.assertEqual(self.client.patch(url, {'effective_from': '2025-03-01'}, format='json').status_code, 200)
+        self.assertEqual(self.bills(), {1: self.FLAT[1], 2: self.FLAT[2], 3: self.TARIFF[3]})
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.bills(), self.FLAT)
+        self.assertEqual(ledger_drift([self.owner.pk]), [])
+
+        for query, error in (
+            ('from=2025-13', "'from' must be a month in YYYY-MM format."),
+            ('to=abc', "'to' must be a month in YYYY-MM format."),
+            ('from=2025-03&to=2025-01', "'from' must not be after 'to'."),
+        ):
+            with self.subTest(query=query):
+                response = self.client.post(f'/api/tariffs/recompute/?{query}')
+                self.assertEqual((response.status_code, response.json()), (400, {"error": error}))
+        self.assertEqual(self.client.post('/api/tariffs/recompute/?from=2025-01').json(), {'updated': 3})
+
+        for data in (
+            {'effective_from': '2025-02-15', 'fixed_charge': '0', 'slabs': self.SLABS},
+            {'effective_from': '2025-02-01', 'fixed_charge': '0', 'slabs': self.SLABS[:1] + self.SLABS[2:]},
+        ):
+            with self.subTest(data=data):
+                self.assertEqual(self.client.post('/api/tariffs/', data, format='json').status_code, 400)
+
+    def test_flat_bills_round_half_up_on_save_and_rebill(self):
+        tenant = Tenant.objects.create(owner=self.owner, name='Half', room_no='T2', contact_no='0',
+                                       rent=Decimal('1.00'))
+        # 0.5 units at 1.25 is exactly 0.625
+        reading = ElectricityReading.objects.create(
+            tenant=tenant, month=6, year=2025, previous_reading=Decimal('0'),
+            current_reading=Decimal('0.5'), rate_per_unit=Decimal('1.25'),
+        )
+        self.assertEqual(reading.calculated_bill, Decimal('0.63'))
+        reading.refresh_from_db()
+        self.assertEqual(reading.calculated_bill, Decimal('0.63'))
+        recompute_bills(self.owner.pk)
+        reading.refresh_from_db()
+        self.assertEqual(reading.calculated_bill, Decimal('0.63'))
+
+    def test_save_reprices_only_when_pricing_inputs_change(self):
+        self.create_tariff(datetime.date(2025, 1, 1))
+        reading = ElectricityReading.objects.get(tenant__owner=self.owner, month=2)
+
+        def tariff_queries(**kwargs):
+            with CaptureQueriesContext(connection) as queries:
+                reading.save(**kwargs)
+            return len([q for q in queries if 'FROM "app_tariff"' in q['sql']])
+
+        reading.is_paid = True
+        self.assertEqual(tariff_queries(), 0)
+        self.assertEqual(tariff_queries(update_fields=['is_paid']), 0)
+        self.assertEqual(reading.calculated_bill, self.FLAT[2])
+
+        reading.current_reading = reading.previous_reading + self.UNITS[3]
+        self.assertEqual(tariff_queries(update_fields=['current_reading']), 1)
+        reading.refresh_from_db()
+        self.assertEqual((reading.total_units, reading.calculated_bill), (self.UNITS[3], self.TARIFF[3]))
+        self.assertEqual(ledger_drift([self.owner.pk]), [])
+
+
+class SyntheticDataTests(APITestCase):
+    """generate_synthetic_data builds consistent data that benchmark_endpoints can measure without changing it."""
+
+    def test_generate_and_benchmark(self):
+        call_command('generate_synthetic_data', landlords=2, tenants=3, years=1, seed=1, stdout=io.StringIO())
+        owners = list(User.objects.filter(username__startswith='synthetic_'))
+        self.assertEqual(len(owners), 2)
+        self.assertEqual(Tenant.objects.filter(owner__in=owners).count(), 6)
+        self.assertEqual(ledger_drift([owner.pk for owner in owners]), [])
+        # Each tenant's meter carries over from one month to the next
+        for tenant in Tenant.objects.filter(owner__in=owners):
+            readings = list(tenant.electricity_readings.order_by('year', 'month'))
+            for previous, reading in zip(readings, readings[1:]):
+                self.assertEqual(reading.previous_reading, previous.current_reading)
+        with self.assertRaises(CommandError):
+            call_command('generate_synthetic_data', landlords=1, stdout=io.StringIO())
+
+        counts = (ElectricityReading.objects.count(), Expense.objects.count(), User.objects.count())
+        stdout = io.StringIO()
+        call_command(
+            'benchmark_endpoints', owner='synthetic_0', iterations=2, warmup=0, cold=True,
+            only=['monthly_summary', 'tenant-list'], stdout=stdout, stderr=io.StringIO(),
+        )
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(set(report['routes']), {'GET monthly_summary', 'GET tenant-list', 'POST tenant-list'})
+        self.assertEqual(report['routes']['POST tenant-list']['status'], 201)
+        self.assertGreater(report['routes']['GET monthly_summary']['queries'], 0)
+        self.assertEqual(report['meta']['dataset']['tenants'], 3)
+        # Benchmarked writes are rolled back
+        self.assertEqual((ElectricityReading.objects.count(), Expense.objects.count(), User.objects.count()), counts)
+
+
+class ExportTests(APITestCase):
+    """Exports stream the owner's filtered rows as CSV or NDJSON."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('exports', password='x', is_superuser=True)
+        cls.category = ExpenseCategory.objects.create(owner=cls.owner, name='Repairs')
+        for day in range(1, 6):
+            Expense.objects.create(owner=cls.owner, category=cls.category if day % 2 else None, amount=Decimal('9.5'),
+                                   date=datetime.date(2025, 4, day), description=f'Tap, "kitchen" {day}\nsecond line')
+        Expense.objects.create(owner=cls.owner, amount=Decimal('1'), date=datetime.date(2024, 4, 1))
+        other = User.objects.create_user('exports-other', password='x')
+        Expense.objects.create(owner=other, amount=Decimal('1'), date=datetime.date(2025, 4, 1))
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def export(self, query, **headers):
+        response = self.client.get(f'/api/expenses/export/?{query}', **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_and_ndjson(self):
+        # A tiny buffer sends every line as its own chunk; the body must not change
+        with mock.patch('app.exports.EXPORT_BUFFER_SIZE', 1):
+            response, body = self.export('year=2025')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="expenses.csv"')
+        rows = list(csv.DictReader(io.StringIO(body, newline='')))
+        self.assertEqual([row['date'] for row in rows], [f'2025-04-0{day}' for day in range(5, 0, -1)])
+        self.assertEqual((rows[0]['category_name'], rows[1]['category_name']), ('Repairs', ''))
+        self.assertEqual(rows[0]['description'], 'Tap, "kitchen" 5\nsecond line')
+
+        response, body = self.export('year=2025&output=ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(lines), 5)
+        self.assertEqual((lines[0]['amount'], lines[0]['month'], lines[0]['category']), ('9.50', 4, self.category.pk))
+        self.assertIsNone(lines[1]['category'])
+
+    def test_accept_selects_the_format(self):
+        response, body = self.export('year=2025', HTTP_ACCEPT='text/csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(body, newline='')))), 5)
+
+        response, body = self.export('year=2025', HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(body.splitlines()), 5)
+
+        tenant = Tenant.objects.create(owner=self.owner, name='Tenant', room_no='X2', contact_no='0',
+                                       rent=Decimal('1.00'))
+        ElectricityReading.objects.create(tenant=tenant, month=4, year=2025, previous_reading=Decimal('0'),
+                                          current_reading=Decimal('3'), rate_per_unit=Decimal('2'))
+        response = self.client.get('/api/readings/export/?year=2025', HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['calculated_bill'] for line in lines], ['6.00'])
+
+        # ?output= wins over Accept; media types the export cannot produce are still refused
+        response, body = self.export('year=2025&output=ndjson', HTTP_ACCEPT='text/csv')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(self.client.get('/api/expenses/export/', HTTP_ACCEPT='application/xml').status_code, 406)
+
+    def test_unknown_output(self):
+        for accept in ('*/*', 'text/csv'):
+            with self.subTest(accept=accept):
+                response = self.client.get('/api/expenses/export/?output=xml', HTTP_ACCEPT=accept)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertIn('error', response.json())
+
+
+class ExpenseImportTests(APITestCase):
+    """CSV import validates every row up front and keeps quoted line breaks inside their field."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('importer', password='x', is_superuser=True)
+        ExpenseCategory.objects.create(owner=cls.owner, name='Repairs #i')
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def post_csv(self, body, query=''):
+        return self.client.post('/api/expenses/import_csv/' + query, body, content_type='text/csv')
+
+    def test_quoted_newlines_and_errors(self):
+        body = (
+            'date,amount,category,description\r\n'
+            '2025-03-01,120.50,Repairs #i,"Boiler service,\r\nsecond visit"\r\n'
+            '2025-03-02,-5,,Refund\r\n'
+            '2025-03-03,10,Garden #i,\r\n'
+        ).encode()
+        report = self.post_csv(body).json()
+        self.assertEqual(report['created'], 0)
+        # Line numbers count physical lines, so the quoted line break moves the later rows down
+        self.assertEqual([(error['line'], list(error['errors'])) for error in report['errors']],
+                         [(4, ['amount']), (5, ['category'])])
+
+        response = self.post_csv(body, '?partial=true&create_categories=true')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['categories_created'], ['Garden #i'])
+        self.assertEqual(
+            list(Expense.objects.filter(owner=self.owner).order_by('date').values_list('description', flat=True)),
+            ['Boiler service,\r\nsecond visit', ''],
+        )
+
+    def test_non_utf8_body(self):
+        response = self.post_csv('date,amount\n2025-03-01,10\n,\xe9\n'.encode('latin-1'))
+        self.assertEqual(response.status_code, 400)
+
+
+class OutstandingDuesTests(APITestCase):
+    """Unpaid readings across all months, grouped by tenant with running totals and ageing."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('arrears', password='x', is_superuser=True)
+        tenant = Tenant.objects.create(
+            owner=cls.owner, name='Late', room_no='A1', contact_no='0', rent=Decimal('1000.00'),
+        )
+        # Bills of 80.00, 160.00 and 240.00, then a paid 320.00
+        for month, previous, current in [(3, 0, 10), (5, 10, 30), (6, 30, 60), (7, 60, 100)]:
+            reading = ElectricityReading.objects.create(
+                tenant=tenant, month=month, year=2025, previous_reading=Decimal(previous),
+                current_reading=Decimal(current), rate_per_unit=Decimal('8'),
+            )
+        reading.is_paid = True
+        reading.save()
+
+    def test_grouped_running_totals_and_buckets(self):
+        data = outstanding_dues(self.owner, datetime.date(2025, 7, 15))
+        self.assertEqual(data['total_outstanding'], Decimal('480.00'))
+        self.assertEqual(data['buckets'], {'0-30': Decimal('240.00'), '31-60': Decimal('160.00'), '60+': Decimal('80.00')})
+        readings = data['tenants'][0]['readings']
+        self.assertEqual([r['running_total'] for r in readings], [Decimal('80.00'), Decimal('240.00'), Decimal('480.00')])
+        self.assertEqual([r['age_days'] for r in readings], [106, 45, 15])
+
+        self.client.force_authenticate(self.owner)
+        response = self.client.get('/api/readings/outstanding/')
+        self.assertEqual(response.json()['count'], 3)
+
+
+class BulkCloseTests(APITestCase):
+    """Closing a month creates every reading in one batch, or none of them if any row is invalid."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('bulk-close', password='x', is_superuser=True)
+        cls.tenants = [
+            Tenant.objects.create(owner=cls.owner, name=f'Tenant {i}', room_no=f'B{i}', contact_no='0',
+                                  rent=Decimal('1.00'))
+            for i in range(3)
+        ]
+        # Tenant 0 was last read in October; the others have no reading yet
+        ElectricityReading.objects.create(tenant=cls.tenants[0], month=10, year=2025, previous_reading=Decimal('0'),
+                                          current_reading=Decimal('100'), rate_per_unit=Decimal('8'))
+        cls.foreign = Tenant.objects.create(owner=User.objects.create_user('bulk-other', password='x'),
+                                            name='Not mine', room_no='B9', contact_no='0', rent=Decimal('1.00'))
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def close(self, readings, month=11):
+        return self.client.post('/api/readings/bulk_close/', {
+            'month': month, 'year': 2025, 'rate_per_unit': '8.00', 'readings': readings,
+        }, format='json')
+
+    def test_creates_the_month(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.close([
+                {'tenant': self.tenants[0].pk, 'current_reading': '150.5'},
+                {'tenant': self.tenants[1].pk, 'current_reading': '20', 'rate_per_unit': '7.25'},
+                {'tenant': self.tenants[2].pk, 'current_reading': '30', 'previous_reading': '10'},
+            ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [(r['previous_reading'], r['total_units'], r['calculated_bill']) for r in response.json()],
+            [('100.00', '50.50', '404.00'), ('0.00', '20.00', '145.00'), ('10.00', '20.00', '160.00')],
+        )
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('INSERT INTO "app_electricityreading"')]), 1)
+        self.assertEqual(ledger_drift([self.owner.pk]), [])
+        data = self.client.get('/api/monthly-summary/?month=11&year=2025').json()
+        self.assertEqual(data['total_electricity'], 709.0)
+
+    def test_invalid_rows_save_nothing(self):
+        response = self.close([
+            {'tenant': self.tenants[0].pk, 'current_reading': '99'},
+            {'tenant': self.tenants[1].pk, 'current_reading': '20'},
+            {'tenant': self.foreign.pk, 'current_reading': '20'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['readings']
+        self.assertEqual([sorted(row) for row in errors], [['current_reading'], [], ['tenant']])
+        self.assertFalse(ElectricityReading.objects.filter(month=11).exists())
+
+        # A month that already has a reading for the tenant is rejected too
+        response = self.close([{'tenant': self.tenants[0].pk, 'current_reading': '200'}], month=10)
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkUpdateTests(APITestCase):
+    """Bulk actions update only the owner's rows in one statement and keep the ledger in step."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('bulk', password='x', is_superuser=True)
+        cls.other = User.objects.create_user('bulk-other', password='x', is_superuser=True)
+        cls.category = ExpenseCategory.objects.create(owner=cls.owner, name='Bulk #1')
+        cls.foreign_category = ExpenseCategory.objects.create(owner=cls.other, name='Bulk #2')
+        cls.readings = []
+        for owner, room in [(cls.owner, 'B1'), (cls.owner, 'B2'), (cls.other, 'B3')]:
+            tenant = Tenant.objects.create(owner=owner, name=room, room_no=room, contact_no='0', rent=Decimal('1'))
+            for month in (1, 2, 3):
+                cls.readings.append(ElectricityReading.objects.create(
+                    tenant=tenant, month=month, year=2025, previous_reading=Decimal('0'),
+                    current_reading=Decimal(10 * month), rate_per_unit=Decimal('8'),
+                ))
+        for owner in (cls.owner, cls.other):
+            Expense.objects.create(owner=owner, amount=Decimal('10'), date=datetime.date(2025, 2, 1))
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def test_mark_paid_by_filter_and_ids(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                '/api/readings/bulk_update/', {'filter': {'to': '2025-02'}, 'set': {'is_paid': True}}, format='json',
+            )
+        self.assertEqual(response.json(), {'matched': 4, 'updated': 4})
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('UPDATE "app_electricityreading"')]), 1)
+        self.assertEqual(ElectricityReading.objects.filter(is_paid=True, tenant__owner=self.other).count(), 0)
+
+        # Already-paid rows are matched but not changed; other owners' ids are ignored
+        ids = [reading.pk for reading in self.readings]
+        response = self.client.post('/api/readings/bulk_update/', {'ids': ids, 'set': {'is_paid': True}}, format='json')
+        self.assertEqual(response.json(), {'matched': 6, 'updated': 2})
+        response = self.client.post(
+            '/api/readings/bulk_update/', {'filter': {'tenant': self.readings[0].tenant_id}, 'set': {'is_paid': False}},
+            format='json',
+        )
+        self.assertEqual(response.json(), {'matched': 3, 'updated': 3})
+        self.assertEqual(ledger_drift(), [])
+
+    def test_expense_bulk_update_and_validation(self):
+        response = self.client.post(
+            '/api/expenses/bulk_update/', {'filter': {'category': None}, 'set': {'category': self.category.pk}},
+            format='json',
+        )
+        self.assertEqual(response.json(), {'updated': 1})
+        self.assertEqual(Expense.objects.filter(category__isnull=True).count(), 1)
+
+        for payload in (
+            {'set': {'description': 'x'}},
+            {'ids': [1], 'filter': {}, 'set': {'description': 'x'}},
+            {'ids': [1], 'set': {}},
+            {'filter': {'from': '2025-13'}, 'set': {'description': 'x'}},
+            {'ids': [1], 'set': {'category': self.foreign_category.pk}},
+        ):
+            with self.subTest(payload=payload):
+                response = self.client.post('/api/expenses/bulk_update/', payload, format='json')
+                self.assertEqual(response.status_code, 400)
+
+
+class ExpenseSearchTests(APITestCase):
+    """Search matches every term as a prefix across category, description and month, within the owner's data."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('search', password='x', is_superuser=True)
+        cls.other = User.objects.create_user('search-other', password='x', is_superuser=True)
+        cls.plumber = ExpenseCategory.objects.create(owner=cls.owner, name='Plumber', description='Pipes and taps')
+        foreign = ExpenseCategory.objects.create(owner=cls.other, name='Plumbing')
+        for day in range(1, 6):
+            Expense.objects.create(owner=cls.owner, category=cls.plumber, amount=Decimal('10'),
+                                   date=datetime.date(2025, 3, day), description='Leak under sink')
+        Expense.objects.create(owner=cls.owner, category=cls.plumber, amount=Decimal('10'),
+                               date=datetime.date(2025, 4, 1), description='Boiler service')
+        Expense.objects.create(owner=cls.owner, amount=Decimal('10'), date=datetime.date(2025, 3, 9),
+                               description='Groceries')
+        Expense.objects.create(owner=cls.other, category=foreign, amount=Decimal('10'),
+                               date=datetime.date(2025, 3, 1), description='Leak')
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def search(self, query, **params):
+        return self.client.get('/api/expenses/search/', {'q': query, **params})
+
+    def test_prefix_terms_and_owner_scoping(self):
+        results = self.search('plumb mar').json()['results']
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(item['owner'] == self.owner.pk for item in results))
+        self.assertEqual([item['description'] for item in self.search('boil').json()['results']], ['Boiler service'])
+        self.assertEqual(self.search('plumb groceries').json()['results'], [])
+
+    def test_cursor_pages_cover_every_match_once(self):
+        seen, response = [], self.search('leak', page_size=2, fields='id')
+        while True:
+            data = response.json()
+            seen += [item['id'] for item in data['results']]
+            if not data['next']:
+                break
+            response = self.client.get(data['next'])
+        self.assertEqual(sorted(seen), sorted(
+            Expense.objects.filter(owner=self.owner, description__startswith='Leak').values_list('pk', flat=True)
+        ))
+
+    def test_matches_without_rows_are_skipped(self):
+        boiler = Expense.objects.get(owner=self.owner, description='Boiler service')
+        # An id deleted after the index was read, or not yet replicated
+        with mock.patch('app.views.search_expenses', return_value=[(boiler.pk + 1000, 2.0), (boiler.pk, 1.0)]):
+            response = self.search('boil')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.json()['results']], [boiler.pk])
+
+    def test_index_follows_category_rename(self):
+        ExpenseCategory.objects.filter(pk=self.plumber.pk).update(name='Handyman')
+        self.assertEqual(len(self.search('handy').json()['results']), 6)
+        self.assertEqual(self.search('plumber').json()['results'], [])
+
+    def test_invalid_queries(self):
+        cases = [
+            ({'q': ''}, "Pass a search query as 'q'."),
+            ({'q': 'leak', 'cursor': 'abc'}, "Invalid cursor; follow the 'next' link of a previous page."),
+            ({'q': 'leak', 'page_size': '0'}, "page_size must be a positive integer."),
+            ({'q': 'leak', 'page_size': 'ten'}, "page_size must be a positive integer."),
+        ]
+        for params, error in cases:
+            with self.subTest(params=params):
+                response = self.client.get('/api/expenses/search/', params)
+                self.assertEqual((response.status_code, response.json()), (400, {"error": error}))
+        response = self.client.get('/api/expenses/search/', {'q': 'leak', 'fields': 'nope'})
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.json()['error'].startswith('Unknown field(s): nope.'))
+
+
+class CompressionTests(APITestCase):
+    """Large responses are compressed as negotiated, except on routes that return credentials."""
+
+    def compress(self, path, accept_encoding='br, gzip'):
+        request = RequestFactory().post(path, HTTP_ACCEPT_ENCODING=accept_encoding)
+        request.resolver_match = resolve(path)
+        return CompressionMiddleware(lambda request: HttpResponse(b'{"token": "abc"}' * 200))(request)
+
+    def test_negotiation_and_excluded_routes(self):
+        response = self.compress('/api/logout/')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(gzip.decompress(self.compress('/api/logout/', 'gzip').content), b'{"token": "abc"}' * 200)
+        self.assertFalse(self.compress('/api/logout/', 'br;q=0, gzip;q=0').has_header('Content-Encoding'))
+        for path in ('/api/login/', '/api/register/'):
+            with self.subTest(path=path):
+                self.assertFalse(self.compress(path).has_header('Content-Encoding'))
+
+
+REPLICAS = {'ALIASES': ['replica1'], 'PIN_SECONDS': 10, 'MAX_LAG_SECONDS': 5, 'CHECK_INTERVAL_SECONDS': 10}
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class ReplicaRoutingTests(APITestCase):
+    """Safe requests read from a healthy replica unless the user just wrote; failures fall back to the primary."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('replica', password='x')
+
+    def setUp(self):
+        cache.clear()
+        db_routing.replica_health.reset()
+        self.addCleanup(db_routing.replica_health.reset)
+        self.factory = RequestFactory()
+
+    def routing(self, method='get', user=None):
+        request = getattr(self.factory, method)('/api/expenses/')
+        request.user = user or self.user
+        return db_routing.RequestRouting(request, db_routing.replica_config())
+
+    def test_read_target(self):
+        with mock.patch.object(db_routing.ReplicaHealth, 'measure_lag', return_value=0.5):
+            self.assertEqual(self.routing().read_alias(), 'replica1')
+            self.assertEqual(self.routing(user=AnonymousUser()).read_alias(), 'replica1')
+            self.assertEqual(self.routing('post').read_alias(), 'default')
+            db_routing.pin_to_primary(self.user.pk)
+            routing = self.routing()
+            self.assertEqual((routing.read_alias(), routing.reason), ('default', 'pinned'))
+
+        db_routing.replica_health.reset()
+        with mock.patch.object(db_routing.ReplicaHealth, 'measure_lag', return_value=60.0):
+            routing = self.routing(user=AnonymousUser())
+            self.assertEqual((routing.read_alias(), routing.reason), ('default', 'fallback'))
+
+    def test_middleware_pins_writers_and_retries_failed_reads(self):
+        attempts = []
+
+        def view(request):
+            routing = db_routing.current_routing()
+            attempts.append(request.method)
+            if attempts == ['POST', 'GET']:
+                routing.alias = 'replica1'
+                return middleware.process_exception(request, OperationalError('replica went away'))
+            return HttpResponse(routing.read_alias())
+
+        middleware = ReplicaRoutingMiddleware(view)
+        request = self.factory.post('/api/expenses/')
+        request.user = self.user
+        middleware(request)
+        self.assertTrue(db_routing.is_pinned(self.user.pk))
+
+        request = self.factory.get('/api/expenses/')
+        request.user = AnonymousUser()
+        response = middleware(request)
+        self.assertEqual((response.status_code, response.content), (200, b'default'))
+        self.assertEqual(attempts, ['POST', 'GET', 'GET'])
+        self.assertFalse(db_routing.replica_health.status()['replica1']['healthy'])
+
+    def test_one_thread_checks_a_hung_replica(self):
+        config = {**db_routing.replica_config(), 'CHECK_INTERVAL_SECONDS': 0}
+        health = db_routing.ReplicaHealth()
+        with mock.patch.object(db_routing.ReplicaHealth, 'measure_lag', return_value=0.5):
+            self.assertEqual(health.healthy(['replica1'], config), ['replica1'])
+
+        probing, release = threading.Event(), threading.Event()
+
+        def hung_replica(alias):
+            probing.set()
+            release.wait(5)
+            return None
+
+        with mock.patch.object(db_routing.ReplicaHealth, 'measure_lag', side_effect=hung_replica) as measure_lag:
+            checker = threading.Thread(target=health.healthy, args=(['replica1'], config))
+            checker.start()
+            self.assertTrue(probing.wait(5))
+            # Meanwhile other requests keep the last known status instead of probing too
+            self.assertEqual(health.healthy(['replica1'], config), ['replica1'])
+            release.set()
+            checker.join()
+        self.assertEqual(measure_lag.call_count, 1)
+        self.assertFalse(health.status()['replica1']['healthy'])
+
+
+@override_settings(REQUEST_TIMING={'ENABLED': True, 'SAMPLE_RATE': 1, 'SLOW_REQUEST_MS': 0, 'WORST_QUERIES': 2})
+class RequestTimingTests(APITestCase):
+    """Sampled requests get a Server-Timing header, and slow ones are logged with their slowest statements."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('timing', password='x', is_superuser=True)
+        Tenant.objects.create(owner=cls.owner, name='Tenant', room_no='T9', contact_no='0', rent=Decimal('1.00'))
+
+    def setUp(self):
+        self.client.force_authenticate(self.owner)
+
+    def test_server_timing_and_slow_log(self):
+        with CaptureQueriesContext(connection) as queries, self.assertLogs('app.request_timing', 'WARNING') as logs:
+            response = self.client.get('/api/tenants/')
+        timings = dict(entry.split(';', 1) for entry in response['Server-Timing'].split(', '))
+        self.assertEqual(list(timings), ['db', 'view', 'serialize', 'render', 'total'])
+        self.assertIn(f'desc="{len(queries)} queries"', timings['db'])
+        self.assertIn('Slow request GET /api/tenants/ -> 200', logs.output[0])
+        # The slowest statements (at most WORST_QUERIES) follow the summary line
+        self.assertEqual(len(logs.output[0].splitlines()), 1 + min(len(queries), 2))
+
+    def test_unsampled_and_disabled(self):
+        with override_settings(REQUEST_TIMING={'ENABLED': True, 'SAMPLE_RATE': 0}):
+            client = self.client_class()
+            client.force_authenticate(self.owner)
+            self.assertNotIn('Server-Timing', client.get('/api/tenants/'))
+        with override_settings(REQUEST_TIMING={'ENABLED': False}):
+            client = self.client_class()
+            client.force_authenticate(self.owner)
+            self.assertNotIn('Server-Timing', client.get('/api/tenants/'))
+
+
+class StartupTests(APITestCase):
+    """Boot-time warm-up and the optional apps and routes settings.py can switch off."""
+
+    def test_warm_up_compiles_list_fields(self):
+        fast_lists._compiled.clear()
+        with override_settings(WARM_UP_ON_BOOT=False):
+            warm_up()
+        self.assertEqual(fast_lists._compiled, {})
+        # Closing the connections would end the test's transaction on a server database
+        with override_settings(WARM_UP_ON_BOOT=True), mock.patch('home_expense_manager.warmup.connections') as conns:
+            warm_up()
+        self.assertIn(TenantSerializer, fast_lists._compiled)
+        conns.close_all.assert_called_once_with()
+        self.assertEqual(self.client.get('/api/health/').status_code, 200)
+
+    def test_disabled_optional_routes(self):
+        self.assertEqual(
+            [name for name, enabled in settings.OPTIONAL_APPS.items() if enabled],
+            [name for name in settings.OPTIONAL_APPS if name in settings.INSTALLED_APPS],
+        )
+
+        def load_urlconf():
+            importlib.reload(project_urls)
+            clear_url_caches()
+
+        self.addCleanup(load_urlconf)
+        with override_settings(ADMIN_ENABLED=False, API_SCHEMA_ENABLED=False):
+            load_urlconf()
+            with self.assertRaises(Resolver404):
+                resolve('/admin/')
+            with self.assertRaises(NoReverseMatch):
+                reverse('schema')
+            # The core API still resolves and reverses
+            self.assertEqual(reverse('tenant-list'), '/api/tenants/')
+            self.assertEqual(reverse('monthly_summary'), '/api/monthly-summary/')
+            self.assertEqual(self.client.get(reverse('health_check')).status_code, 200)
+
+
+class MetricsTests(APITestCase):
+    """Requests are counted by route name, and /metrics exposes them to Prometheus."""
+
+    def sample(self, route, status):
+        return metrics.REQUESTS.labels(route, 'GET', status)._value.get()
+
+    def test_requests_are_counted_by_route(self):
+        before = self.sample('health_check', '200'), self.sample('unmatched', '404')
+        self.assertEqual(self.client.get('/api/health/').status_code, 200)
+        self.assertEqual(self.client.get('/api/no-such-route/').status_code, 404)
+        self.assertEqual((self.sample('health_check', '200'), self.sample('unmatched', '404')),
+                         (before[0] + 1, before[1] + 1))
+
+        with override_settings(METRICS_ALLOWED_IPS=['127.0.0.1']):
+            response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'http_requests_total{method="GET",route="health_check",status="200"}', response.content.decode()
+        )
+        self.assertIn('http_request_db_queries_bucket', response.content.decode())
+
+    def test_denied_by_default(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+        with override_settings(METRICS_ALLOWED_IPS=['10.0.0.5']):
+            self.assertEqual(self.client.get('/metrics').status_code, 404)
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code, 200)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    @override_settings(METRICS_AUTH_TOKEN='scrape-secret', METRICS_ALLOWED_IPS=['127.0.0.1'])
+    def test_auth_token(self):
+        # A configured token is required even from an allowed address
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret').status_code, 200)
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class AsyncMiddlewareTests(APITestCase):
+    """Under ASGI the app's middleware runs natively async, so async views are not adapted to sync and back."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('async-middleware', password='x')
+        cls.token = Token.objects.create(user=cls.user)
+        Tenant.objects.bulk_create([
+            Tenant(owner=cls.user, name=f'Tenant {i}', room_no=f'A{i}', contact_no='0',
+                   joining_date=datetime.date(2024, 1, 1), rent=Decimal('4000.00'))
+            for i in range(20)
+        ])
+
+    def test_async_chain_is_not_adapted(self):
+        # With DEBUG on, BaseHandler.load_middleware() logs every sync/async adaptation
+        with override_settings(DEBUG=True), self.assertLogs('django.request', 'DEBUG') as logs:
+            handler = ASGIHandler()
+            logger.debug('Middleware loaded.')
+        self.assertEqual([line for line in logs.output if 'adapted' in line], [])
+        self.assertTrue(iscoroutinefunction(handler._middleware_chain))
+
+    async def test_async_view_through_async_middleware(self):
+        requests = metrics.REQUESTS.labels('async_tenant_list', 'GET', '200')
+        before = requests._value.get()
+        with mock.patch.object(db_routing.ReplicaHealth, 'measure_lag', return_value=None):
+            response = await self.async_client.get(
+                '/api/async/tenants/', headers={'Authorization': f'Token {self.token.key}', 'Accept-Encoding': 'gzip'},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 20)
+        self.assertEqual(requests._value.get(), before + 1)
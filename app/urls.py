@@ -1,14 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from home_expense_manager.views import HealthCheckView
 from .views import (
-    # HealthCheckView,
     TenantViewSet,
     ElectricityReadingViewSet,
     ExpenseCategoryViewSet,
-    ExpenseViewSet
+    ExpenseViewSet,
+    TariffViewSet,
 )
-from .views_summary import MonthlySummaryView
+from .views_summary import DashboardView, MonthlySummaryView, SummaryRangeView
 from .auth_views import RegisterView, LoginView, LogoutView # <-- Import Auth Views
+from . import async_views
 
 # Create a router and register our viewsets with it.
 router = DefaultRouter()
@@ -16,10 +18,11 @@ router.register(r'tenants', TenantViewSet)
 router.register(r'readings', ElectricityReadingViewSet)
 router.register(r'categories', ExpenseCategoryViewSet)
 router.register(r'expenses', ExpenseViewSet)
+router.register(r'tariffs', TariffViewSet)
 
 urlpatterns = [
     # Health check endpoint
-    # path('health/', HealthCheckView.as_view(), name='health_check'),
+    path('health/', HealthCheckView.as_view(), name='health_check'),
 
     # Authentication Endpoints
     path('register/', RegisterView.as_view(), name='register'),
@@ -29,6 +32,18 @@ urlpatterns = [
     # New custom summary endpoint
     # The full path will be /api/monthly-summary/
     path('monthly-summary/', MonthlySummaryView.as_view(), name='monthly_summary'),
+    # Per-month series for charts, e.g. /api/summary/range/?from=2024-01&to=2025-12
+    path('summary/range/', SummaryRangeView.as_view(), name='summary_range'),
+    # Everything the dashboard shows in one response, e.g. /api/dashboard/?month=10&year=2025
+    path('dashboard/', DashboardView.as_view(), name='dashboard'),
+
+    # Async (ASGI) read-only mirrors of the summary and list endpoints
+    path('async/monthly-summary/', async_views.monthly_summary, name='async_monthly_summary'),
+    path('async/summary/range/', async_views.summary_range, name='async_summary_range'),
+    path('async/tenants/', async_views.tenant_list, name='async_tenant_list'),
+    path('async/categories/', async_views.category_list, name='async_category_list'),
+    path('async/expenses/', async_views.expense_list, name='async_expense_list'),
+    path('async/readings/', async_views.reading_list, name='async_reading_list'),
 
     # API endpoints registered with the router
     path('', include(router.urls)),
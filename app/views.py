@@ -1,28 +1,93 @@
 import datetime
-from django.db.models import Sum, DecimalField
-from rest_framework import viewsets
+import io
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Window
+from django.db.models.functions import RowNumber
+from rest_framework import status, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 
-from app.models import Tenant, ElectricityReading, ExpenseCategory, Expense
+from app.models import Tenant, ElectricityReading, ExpenseCategory, Expense, MonthlyLedger, Tariff
+from app.billing import FIRST_PERIOD, LAST_PERIOD, recompute_bills
+from app.bulk import set_readings_paid, update_expenses
+from app.search import (
+    SEARCH_MAX_PAGE_SIZE, SEARCH_PAGE_SIZE, decode_cursor, encode_cursor, search_expenses, search_terms,
+)
+from app.ledger import ledger_totals
+from app.summary import expense_breakdown, outstanding_dues, rent_by_month
+from app.caching import bump_owner_version_on_commit, get_or_compute
+from app.conditional import ConditionalOwnerMixin, conditional_owner_response, current_period
+from app.importers import import_expenses_csv
+from app.fast_lists import FastListMixin, compile_fields, select_fields, serialize_values, values_queryset
+from app.exports import (
+    EXPORT_FORMATS, EXPORT_RENDERERS, EXPENSE_EXPORT_FIELDS, READING_EXPORT_FIELDS, stream_export,
+)
 from app.serializers import (
     TenantSerializer,
     ElectricityReadingSerializer,
     ExpenseCategorySerializer,
     ExpenseSerializer,
     UserSerializer,
+    BulkReadingSerializer,
+    ReadingBulkUpdateSerializer,
+    ExpenseBulkUpdateSerializer,
+    TariffSerializer,
 )
 from app.permissions import  IsLandlordOrReadOnly
+from app.views_summary import MAX_RANGE_MONTHS, int_param, month_param, validate_year
+from app.pagination import (
+    TenantCursorPagination,
+    ExpenseCursorPagination,
+    ElectricityReadingCursorPagination,
+)
+
+
+def export_response(request, queryset, fields, filename):
+    """
+    Shared handler for the export actions: picks the format from ?output=
+    (csv or ndjson), else from the Accept header, else CSV, and streams the
+    already-filtered queryset.
+    """
+    negotiated = request.accepted_renderer.format
+    output = request.query_params.get('output', negotiated if negotiated in EXPORT_FORMATS else 'csv')
+    if output not in EXPORT_FORMATS:
+        return Response(
+            {"error": f"Unsupported output '{output}'. Use one of: {', '.join(EXPORT_FORMATS)}."},
+            status=400, content_type='application/json'
+        )
+    return stream_export(queryset, fields, output, filename)
 
 
-class BaseOwnerViewSet(viewsets.ModelViewSet):
+class OwnerDataVersionMixin:
+    """
+    Bumps the owner's data version after every successful write, so responses
+    cached under the previous version (see app/caching.py) are never served again.
+    Row saves and deletes also bump it through app/signals.py; this covers the
+    bulk actions, whose queryset updates and bulk inserts send no signals.
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            bump_owner_version_on_commit(request.user.pk)
+        return response
+
+
+class BaseOwnerViewSet(ConditionalOwnerMixin, OwnerDataVersionMixin, FastListMixin, viewsets.ModelViewSet):
     """
     Base class to handle multi-tenancy filtering and owner assignment.
+    Lists are served by the values()-based fast path (see app/fast_lists.py).
     """
     permission_classes = [IsAuthenticated, IsLandlordOrReadOnly]
     filter_backends = [DjangoFilterBackend]
@@ -48,19 +113,20 @@ class TenantViewSet(BaseOwnerViewSet):
     """
     CRUD for Tenants. Filters by owner.
     """
-    queryset = Tenant.objects.all()
+    queryset = Tenant.objects.select_related('owner').all()
     serializer_class = TenantSerializer
+    pagination_class = TenantCursorPagination
 
 
 class ExpenseCategoryViewSet(BaseOwnerViewSet):
     """
     CRUD for Expense Categories. Filters by owner.
     """
-    queryset = ExpenseCategory.objects.all()
+    queryset = ExpenseCategory.objects.select_related('owner').all()
     serializer_class = ExpenseCategorySerializer
 
 
-class ElectricityReadingViewSet(viewsets.ModelViewSet):
+class ElectricityReadingViewSet(ConditionalOwnerMixin, OwnerDataVersionMixin, FastListMixin, viewsets.ModelViewSet):
     """
     CRUD for Electricity Readings.
     Filtering is done implicitly via Tenant ownership.
@@ -69,6 +135,7 @@ class ElectricityReadingViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsLandlordOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['tenant', 'month', 'year']
+    pagination_class = ElectricityReadingCursorPagination
     
     # REQUIRED for DRF Router to function
     # Note: Queryset defined here must be filtered in get_queryset below.
@@ -102,6 +169,10 @@ class ElectricityReadingViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def etag_period(self):
+        # Without ?month= or ?year= the list shows the current month
+        return current_period(self.request.query_params)
+
     def perform_create(self, serializer):
         """
         Ensure the Tenant being linked belongs to the current Landlord.
@@ -116,6 +187,141 @@ class ElectricityReadingViewSet(viewsets.ModelViewSet):
         serializer.save(tenant=tenant_instance)
 
 
+    @action(detail=False, methods=['post'])
+    def bulk_close(self, request):
+        """
+        Custom action to create all of a month's readings in one request.
+        Ownership is checked with one query, previous readings are resolved with
+        one windowed query, and all rows are inserted with a single bulk_create.
+        Nothing is saved if any row is invalid; errors are returned per row.
+        Example: POST /api/readings/bulk_close/
+            { "month": 11, "year": 2025, "rate_per_unit": "8.00",
+              "readings": [{ "tenant": 1, "current_reading": "1250.00" }, ...] }
+        """
+        payload = BulkReadingSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        month = payload.validated_data['month']
+        year = payload.validated_data['year']
+        default_rate = payload.validated_data.get('rate_per_unit')
+        rows = payload.validated_data['readings']
+        tenant_ids = [row['tenant'] for row in rows]
+
+        # 1. Verify Tenant Ownership and find tenants already read this month (one query)
+        tenants = {
+            tenant.pk: tenant
+            for tenant in Tenant.objects.filter(owner=request.user, pk__in=tenant_ids).annotate(
+                has_reading=Exists(
+                    ElectricityReading.objects.filter(tenant=OuterRef('pk'), month=month, year=year)
+                )
+            )
+        }
+
+        # 2. Latest reading before this period for every tenant (one windowed query)
+        last_readings = dict(
+            ElectricityReading.objects.filter(tenant_id__in=tenants)
+            .filter(Q(year__lt=year) | Q(year=year, month__lt=month))
+            .annotate(position=Window(
+                expression=RowNumber(),
+                partition_by=[F('tenant_id')],
+                order_by=[F('year').desc(), F('month').desc()],
+            ))
+            .filter(position=1)
+            .order_by()
+            .values_list('tenant_id', 'current_reading')
+        )
+
+        # 3. Compute units and bills for the batch, collecting per-row errors
+        # (the month's tariff, if the owner has one, replaces the flat rate)
+        tariff = Tariff.objects.effective_for(request.user.pk, year, month)
+        readings = []
+        errors = []
+        for row in rows:
+            row_errors = {}
+            tenant = tenants.get(row['tenant'])
+            if tenant is None:
+                row_errors['tenant'] = ["Tenant not found or does not belong to you."]
+            elif tenant.has_reading:
+                row_errors['tenant'] = [f"A reading for {month}/{year} already exists."]
+            else:
+                previous = last_readings.get(tenant.pk, row.get('previous_reading', Decimal('0')))
+                if row['current_reading'] < previous:
+                    row_errors['current_reading'] = [
+                        "Current reading must be greater than or equal to the previous reading."
+                    ]
+                else:
+                    rate = row.get('rate_per_unit', default_rate)
+                    units = row['current_reading'] - previous
+                    readings.append(ElectricityReading(
+                        tenant=tenant, month=month, year=year,
+                        previous_reading=previous,
+                        current_reading=row['current_reading'],
+                        rate_per_unit=rate,
+                        total_units=units,
+                        calculated_bill=(
+                            tariff.bill_for(units) if tariff
+                            else (units * rate).quantize(Decimal('0.01'), ROUND_HALF_UP)
+                        ),
+                        is_paid=False,
+                    ))
+            errors.append(row_errors)
+
+        if any(errors):
+            return Response({"readings": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 4. Insert the batch and update the monthly ledger in one transaction
+        with transaction.atomic():
+            created = ElectricityReading.objects.bulk_create(readings)
+            billed = sum((reading.calculated_bill for reading in created), Decimal('0'))
+            MonthlyLedger.objects.apply_delta(
+                request.user.pk, year, month,
+                electricity_billed=billed, electricity_unpaid=billed,
+            )
+
+        serializer = self.get_serializer(created, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """
+        Custom action to mark many readings paid or unpaid in one UPDATE.
+        Select readings by 'ids' or by a 'filter' of tenant and/or from/to months;
+        readings of other owners are never matched.
+        Example: POST /api/readings/bulk_update/
+            { "filter": { "tenant": 3, "to": "2025-06" }, "set": { "is_paid": true } }
+        """
+        payload = ReadingBulkUpdateSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        data = payload.validated_data
+        matched, updated = set_readings_paid(
+            request.user, data['set']['is_paid'], ids=data.get('ids'), filters=data.get('filter'),
+        )
+        return Response({"matched": matched, "updated": updated})
+
+    @action(detail=False, methods=['get'], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """
+        Custom action to stream readings as CSV or NDJSON.
+        Accepts the same filters as the list endpoint (defaults to the current month).
+        Example: /api/readings/export/?year=2025&output=ndjson
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(request, queryset, READING_EXPORT_FIELDS, 'readings')
+
+    @action(detail=False, methods=['get'])
+    def outstanding(self, request):
+        """
+        Custom action listing every unpaid reading across all months, grouped
+        by tenant with running totals and ageing buckets (0-30, 31-60 and 60+
+        days after the end of the billing month).
+        Example: /api/readings/outstanding/
+        """
+        today = datetime.date.today()
+        data, hit = get_or_compute(
+            request.user.pk, 'outstanding_dues', (today,),
+            lambda: outstanding_dues(request.user, today),
+        )
+        return Response(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
+
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def get_previous_reading(self, request):
         """
@@ -165,9 +371,10 @@ class ExpenseViewSet(BaseOwnerViewSet):
     """
     CRUD for Expenses. Filters by owner and allows filtering by month and year.
     """
-    queryset = Expense.objects.select_related('category').all()
+    queryset = Expense.objects.select_related('owner', 'category').all()
     serializer_class = ExpenseSerializer
     filterset_fields = ['month', 'year', 'category'] # Added category filter for convenience
+    pagination_class = ExpenseCursorPagination
     
     def perform_create(self, serializer):
         """
@@ -185,6 +392,169 @@ class ExpenseViewSet(BaseOwnerViewSet):
         # 2. Inject the owner automatically before saving the instance
         serializer.save(owner=self.request.user)
 
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Custom action for ranked full-text search over the owner's expenses
+        (description, category name and description, and month, e.g. "March").
+        Every word must match, as a prefix. Results are paginated by cursor:
+        follow 'next' until it is null. ?page_size= defaults to 20 (max 100).
+        Example: /api/expenses/search/?q=plumber+march
+        """
+        terms = search_terms(request.query_params.get('q', ''))
+        if not terms:
+            return Response({"error": "Pass a search query as 'q'."}, status=400)
+        try:
+            page_size = int(request.query_params.get('page_size', SEARCH_PAGE_SIZE))
+        except ValueError:
+            page_size = 0
+        if page_size < 1:
+            return Response({"error": "page_size must be a positive integer."}, status=400)
+        page_size = min(page_size, SEARCH_MAX_PAGE_SIZE)
+        cursor = request.query_params.get('cursor')
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            return Response({"error": "Invalid cursor; follow the 'next' link of a previous page."}, status=400)
+        try:
+            mapping = select_fields(compile_fields(ExpenseSerializer), request.query_params)
+        except ValueError as e:
+            # select_fields() names the unknown fields and the available ones
+            return Response({"error": str(e)}, status=400)
+
+        # 1. Best matches after the cursor, from the text index (one more than a page)
+        matches = search_expenses(request.user, terms, page_size + 1, after)
+        has_next, matches = len(matches) > page_size, matches[:page_size]
+
+        # 2. The page's expenses in one query, serialized like the list endpoint
+        rows = {row['id']: row for row in values_queryset(
+            Expense.objects.filter(pk__in=[pk for pk, _score in matches]), mapping, extra=['id']
+        )}
+        results = []
+        for pk, score in matches:
+            # Deleted since the index was read, or not yet on the replica serving this request
+            if pk not in rows:
+                continue
+            item = serialize_values([rows[pk]], mapping)[0]
+            item['score'] = round(score, 6)
+            results.append(item)
+
+        next_link = None
+        if has_next:
+            last_pk, last_score = matches[-1]
+            next_link = replace_query_param(request.build_absolute_uri(), 'cursor', encode_cursor(last_score, last_pk))
+        return Response({"next": next_link, "results": results})
+
+    @action(detail=False, methods=['get'])
+    def breakdown(self, request):
+        """
+        Custom action returning per-category totals, counts and share of spend
+        for a month (?month=&year=) or a range (?from=YYYY-MM&to=YYYY-MM), with
+        the top N categories (?top=, default 5) and month-over-month changes.
+        Example: /api/expenses/breakdown/?from=2025-01&to=2025-06&top=3
+        """
+        params = request.query_params
+        if not ({'from', 'to'} & set(params) or {'month', 'year'} <= set(params)):
+            return Response({"error": "Pass month and year, or from and to (YYYY-MM)."}, status=400)
+        try:
+            if 'from' in params or 'to' in params:
+                start, end = month_param(params, 'from'), month_param(params, 'to')
+            else:
+                start = end = (
+                    int_param(params, 'year', datetime.MINYEAR, datetime.MAXYEAR), int_param(params, 'month', 1, 12)
+                )
+            top = int_param(params, 'top', 1, default=5)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+        span = (end[0] - start[0]) * 12 + (end[1] - start[1]) + 1
+        if not (1 <= span <= MAX_RANGE_MONTHS):
+            return Response(
+                {"error": f"'from' must not be after 'to' and the range cannot exceed {MAX_RANGE_MONTHS} months."},
+                status=400,
+            )
+
+        def build_response():
+            data, hit = get_or_compute(
+                request.user.pk, 'expense_breakdown', (*start, *end, top),
+                lambda: {
+                    "from": f"{start[0]:04d}-{start[1]:02d}",
+                    "to": f"{end[0]:04d}-{end[1]:02d}",
+                    **expense_breakdown(request.user, start, end, top),
+                },
+            )
+            return Response(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
+
+        return conditional_owner_response(request, build_response)
+
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """
+        Custom action to change the category and/or description of many
+        expenses in one UPDATE. Select expenses by 'ids' or by a 'filter' of
+        category (null for uncategorized) and/or from/to months.
+        Example: POST /api/expenses/bulk_update/
+            { "ids": [4, 5, 9], "set": { "category": 2 } }
+        """
+        payload = ExpenseBulkUpdateSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        data = payload.validated_data
+
+        # 1. Verify Category Ownership (if one is being assigned)
+        category_id = data['set'].get('category')
+        if category_id is not None and not ExpenseCategory.objects.filter(
+            owner=request.user, pk=category_id
+        ).exists():
+            return Response({"error": "Category not found or does not belong to you."}, status=400)
+
+        # 2. Apply the changes to every selected expense at once
+        updated = update_expenses(request.user, data['set'], ids=data.get('ids'), filters=data.get('filter'))
+        return Response({"updated": updated})
+
+    @action(detail=False, methods=['get'], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """
+        Custom action to stream expenses as CSV or NDJSON.
+        Accepts the same filters as the list endpoint (month, year, category).
+        Example: /api/expenses/export/?year=2025&output=csv
+        """
+        queryset = self.filter_queryset(self.get_queryset()).order_by('-date', 'id')
+        return export_response(request, queryset, EXPENSE_EXPORT_FIELDS, 'expenses')
+
+    @action(detail=False, methods=['post'])
+    def import_csv(self, request):
+        """
+        Custom action to import many expenses from a CSV with the header
+        date,amount,category,description. Send it as a multipart 'file' field
+        or as a raw text/csv body.
+        Query params: create_categories=true to create unknown category names,
+        partial=true to save the valid rows even if some rows fail.
+        Example: POST /api/expenses/import_csv/?create_categories=true
+        """
+        if request.content_type.startswith('text/csv'):
+            data = request.body
+        else:
+            upload = request.FILES.get('file')
+            if upload is None:
+                return Response({"error": "Upload a CSV as 'file' or send a text/csv body."}, status=400)
+            data = upload.read()
+        try:
+            text = data.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            return Response({"error": "The CSV must be UTF-8 encoded."}, status=400)
+
+        def flag(name):
+            return request.query_params.get(name, '').lower() in ('1', 'true', 'yes')
+
+        # newline='' leaves line endings to the csv module, so quoted fields may span lines
+        report = import_expenses_csv(
+            request.user, io.StringIO(text, newline=''),
+            create_missing_categories=flag('create_categories'),
+            partial=flag('partial'),
+        )
+        if report['errors'] and not report['created']:
+            return Response(report, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_201_CREATED)
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -202,28 +572,38 @@ def monthly_summary(request):
 
     try:
         month = int(month)
-        year = int(year)
-    except ValueError:
-        return Response({"error": "Month and year must be integers."}, status=400)
+        year = validate_year(int(year))
+        if not (1 <= month <= 12):
+            raise ValueError("Month must be between 1 and 12.")
+    except ValueError as e:
+        return Response({"error": f"Month and year must be integers: {e}"}, status=400)
+
+    def build_response():
+        data, hit = get_or_compute(
+            user.pk, 'monthly_summary', (month, year),
+            lambda: _monthly_summary_payload(user, month, year),
+        )
+        return Response(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
+
+    return conditional_owner_response(request, build_response)
 
-    # 1. Fetch Tenants (Income source) for the current user
-    user_tenants = Tenant.objects.filter(owner=user)
 
-    # 2. Calculate Total Rent (Income) - Sum of rent for all owned tenants
-    total_rent_income_qs = user_tenants.aggregate(
-        total=Coalesce(Sum('rent', output_field=DecimalField()), 0)
-    )
-    total_rent_income = float(total_rent_income_qs['total'])
+def _monthly_summary_payload(user, month, year):
+    # 1. Electricity and other expense totals from the monthly ledger row,
+    #    rent prorated by each tenant's occupancy in SQL
+    totals = ledger_totals(user, month, year)
+    total_rent_income = float(rent_by_month(user, (year, month), (year, month))[(year, month)])
+    total_electricity_bill = float(totals['electricity_billed'])
+    total_other_expenses = float(totals['total_expenses'])
 
-    # 3. Fetch Electricity Readings for the period, linked through the user's tenants
+    # 2. Fetch Electricity Readings for the period, linked through the user's tenants
     readings = ElectricityReading.objects.filter(
-        tenant__in=user_tenants, 
-        month=month, 
+        tenant__owner=user,
+        month=month,
         year=year
     ).select_related('tenant')
 
     tenant_summary = []
-    total_electricity_bill = 0
 
     # Summarize electricity bill per tenant
     for reading in readings:
@@ -235,22 +615,12 @@ def monthly_summary(request):
             "bill": float(reading.calculated_bill),
             "is_paid": reading.is_paid
         })
-        total_electricity_bill += float(reading.calculated_bill)
-
-    # 4. Calculate Total Other Expenses, owned by the current user
-    total_expenses_qs = Expense.objects.filter(
-        owner=user,
-        month=month, year=year
-    ).aggregate(
-        total=Coalesce(Sum('amount', output_field=DecimalField()), 0)
-    )
-    total_other_expenses = float(total_expenses_qs['total'])
-
-    # 5. Calculate Net Balance
+
+    # 3. Calculate Net Balance
     total_costs = total_electricity_bill + total_other_expenses
     net_balance = total_rent_income - total_costs
 
-    return Response({
+    return {
         "month": datetime.date(year, month, 1).strftime('%B'),
         "year": year,
         "tenants": tenant_summary,
@@ -258,4 +628,63 @@ def monthly_summary(request):
         "total_rent": round(total_rent_income, 2),
         "total_other_expenses": round(total_other_expenses, 2),
         "net_balance": round(net_balance, 2)
-    })
+    }
+
+
+class TariffViewSet(BaseOwnerViewSet):
+    """
+    CRUD for electricity Tariffs (with nested slabs). Filters by owner.
+    Creating, revising or deleting a tariff rebills every affected reading
+    with set-based UPDATEs (see app/billing.py).
+    """
+    queryset = Tariff.objects.select_related('owner').prefetch_related('slabs')
+    serializer_class = TariffSerializer
+
+    def _check_unique_month(self, serializer):
+        effective_from = serializer.validated_data.get('effective_from')
+        clash = Tariff.objects.filter(owner=self.request.user, effective_from=effective_from)
+        if serializer.instance is not None:
+            clash = clash.exclude(pk=serializer.instance.pk)
+        if effective_from and clash.exists():
+            raise ValidationError({"effective_from": ["You already have a tariff starting this month."]})
+
+    @staticmethod
+    def _period(date):
+        return (date.year, date.month)
+
+    def perform_create(self, serializer):
+        self._check_unique_month(serializer)
+        with transaction.atomic():
+            tariff = serializer.save(owner=self.request.user)
+            recompute_bills(self.request.user.pk, start=self._period(tariff.effective_from))
+
+    def perform_update(self, serializer):
+        self._check_unique_month(serializer)
+        old_start = self._period(serializer.instance.effective_from)
+        with transaction.atomic():
+            tariff = serializer.save()
+            recompute_bills(self.request.user.pk, start=min(old_start, self._period(tariff.effective_from)))
+
+    def perform_destroy(self, instance):
+        start = self._period(instance.effective_from)
+        with transaction.atomic():
+            instance.delete()
+            recompute_bills(self.request.user.pk, start=start)
+
+    @action(detail=False, methods=['post'])
+    def recompute(self, request):
+        """
+        Custom action to rebill the owner's readings for a month or range of
+        months from their tariffs, in one set-based pass.
+        Query params: from=YYYY-MM and to=YYYY-MM (both optional; default all months).
+        Example: POST /api/tariffs/recompute/?from=2025-01&to=2025-12
+        """
+        try:
+            start = month_param(request.query_params, 'from', default=FIRST_PERIOD)
+            end = month_param(request.query_params, 'to', default=LAST_PERIOD)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+        if start > end:
+            return Response({"error": "'from' must not be after 'to'."}, status=400)
+        return Response({"updated": recompute_bills(request.user.pk, start, end)})
+
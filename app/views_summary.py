@@ -2,10 +2,63 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from django.db.models import Sum
-from django.core.exceptions import ObjectDoesNotExist
-from . models import Tenant, ElectricityReading, Expense
+from .summary import dashboard_lists, monthly_summary_data, range_summary_data
+from .caching import get_or_compute
+from .conditional import conditional_owner_response
 import calendar # Used to convert month number to name
+import datetime
+
+# Longest series the range endpoint will build in one response (10 years)
+MAX_RANGE_MONTHS = 120
+
+
+def validate_year(year):
+    """Returns `year`, or raises ValueError if a date cannot be built in it (the summaries need month bounds)."""
+    if not (datetime.MINYEAR <= year <= datetime.MAXYEAR):
+        raise ValueError(f"Year must be between {datetime.MINYEAR} and {datetime.MAXYEAR}.")
+    return year
+
+
+def parse_year_month(value):
+    """Parses 'YYYY-MM' into a (year, month) tuple, raising ValueError if invalid."""
+    year_str, sep, month_str = (value or '').partition('-')
+    if not sep:
+        raise ValueError(f"'{value}' is not in YYYY-MM format.")
+    year, month = validate_year(int(year_str)), int(month_str)
+    if not (1 <= month <= 12):
+        raise ValueError("Month must be between 1 and 12.")
+    return year, month
+
+def month_param(params, name, default=None):
+    """
+    Parses the YYYY-MM query param `name`, or returns `default` when it is
+    absent (required without a default). Raises ValueError with a message
+    that names the parameter and is safe to return to clients.
+    """
+    if name not in params and default is not None:
+        return default
+    try:
+        return parse_year_month(params.get(name))
+    except ValueError:
+        raise ValueError(f"'{name}' must be a month in YYYY-MM format.") from None
+
+
+def int_param(params, name, low, high=None, default=None):
+    """
+    Parses the integer query param `name` within [low, high], or returns
+    `default` when it is absent (required without a default). Raises
+    ValueError with a message that names the parameter.
+    """
+    if name not in params and default is not None:
+        return default
+    bounds = f"between {low} and {high}" if high is not None else f"of at least {low}"
+    try:
+        value = int(params.get(name, ''))
+    except ValueError:
+        value = None
+    if value is None or value < low or (high is not None and value > high):
+        raise ValueError(f"'{name}' must be an integer {bounds}.")
+    return value
 
 class MonthlySummaryView(APIView):
     """
@@ -14,6 +67,7 @@ class MonthlySummaryView(APIView):
     Example: /api/monthly-summary/?month=10&year=2025
     """
     permission_classes = [IsAuthenticated]
+    cache_namespace = 'monthly_summary_view'
 
     def get(self, request, *args, **kwargs):
         # 1. Input Validation and Extraction
@@ -28,7 +82,7 @@ class MonthlySummaryView(APIView):
 
         try:
             month = int(month_str)
-            year = int(year_str)
+            year = validate_year(int(year_str))
             if not (1 <= month <= 12):
                  raise ValueError("Month must be between 1 and 12.")
         except ValueError as e:
@@ -37,62 +91,109 @@ class MonthlySummaryView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 2. Calculate Total Rent and Tenant Summary
-        all_tenants = Tenant.objects.all()
-        total_rent = sum(tenant.rent for tenant in all_tenants)
-        total_electricity = 0
-        tenants_summary = []
-
-        # Find the specific reading for each tenant
-        for tenant in all_tenants:
-            try:
-                # Use .get() to find the unique reading for this tenant/month/year
-                reading = ElectricityReading.objects.get(
-                    tenant=tenant,
-                    month=month,
-                    year=year
-                )
-                bill_amount = reading.calculated_bill
-                is_paid_status = reading.is_paid
-
-            except ObjectDoesNotExist:
-                # If no reading exists for a tenant for this month, bill is 0
-                bill_amount = 0
-                is_paid_status = False
-
-            total_electricity += bill_amount
-
-            tenants_summary.append({
-                "tenant_id": tenant.id,
-                "name": tenant.name,
-                "room_no": tenant.room_no,
-                "bill": bill_amount,
-                "is_paid": is_paid_status,
-            })
-
-        # 3. Calculate Total Other Expenses
-        expense_summary = Expense.objects.filter(
-            month=month,
-            year=year
-        ).aggregate(
-            total_amount=Sum('amount')
-        )
-        # Use .get() to safely retrieve the aggregated value, default to 0
-        total_other_expenses = expense_summary.get('total_amount') or 0
-
-        # 4. Calculate Net Balance
-        total_outgoing = total_electricity + total_other_expenses
-        net_balance = total_rent - total_outgoing
-
-        # 5. Prepare Final Response
-        response_data = {
+        # 2. Answer 304 for an unchanged owner, else serve from the versioned cache
+        def build_response():
+            response_data, hit = get_or_compute(
+                request.user.pk, self.cache_namespace, (month, year),
+                lambda: self.build_summary(request.user, month, year),
+            )
+            return Response(
+                response_data, status=status.HTTP_200_OK,
+                headers={'X-Cache': 'HIT' if hit else 'MISS'},
+            )
+
+        return conditional_owner_response(request, build_response)
+
+    def build_summary(self, user, month, year):
+        """
+        Computes the response payload for the current owner only.
+        """
+        summary = monthly_summary_data(user, month, year)
+
+        return {
             "month": calendar.month_name[month],
             "year": year,
-            "tenants": tenants_summary,
-            "total_rent": total_rent,
-            "total_electricity": total_electricity,
-            "total_other_expenses": total_other_expenses,
-            "net_balance": net_balance,
+            "tenants": summary["tenants"],
+            "total_rent": summary["total_rent"],
+            "total_electricity": summary["total_electricity"],
+            "total_other_expenses": summary["total_other_expenses"],
+            "net_balance": summary["net_balance"],
         }
 
-        return Response(response_data, status=status.HTTP_200_OK)
+
+class DashboardView(MonthlySummaryView):
+    """
+    API view returning everything the dashboard needs in one response: the
+    monthly summary (totals and per-tenant bill status), the month's expense
+    breakdown by category, the most recent expenses, and the category and
+    tenant lists. Takes the same 'month' and 'year' parameters as
+    MonthlySummaryView and shares its validation, ETag and cache handling.
+    Example: /api/dashboard/?month=10&year=2025
+    """
+    cache_namespace = 'dashboard'
+
+    def build_summary(self, user, month, year):
+        """
+        Computes the dashboard payload for the current owner with a fixed
+        number of queries: three for the monthly summary and one per list.
+        """
+        return {
+            "summary": super().build_summary(user, month, year),
+            **dashboard_lists(user, month, year),
+        }
+
+
+class SummaryRangeView(APIView):
+    """
+    API view to provide a per-month financial series between two months (inclusive).
+    Requires 'from' and 'to' query parameters in YYYY-MM format.
+    Example: /api/summary/range/?from=2024-01&to=2025-12
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        # 1. Input Validation and Extraction
+        from_str = request.query_params.get('from')
+        to_str = request.query_params.get('to')
+
+        if not from_str or not to_str:
+            return Response(
+                {"error": "Both 'from' and 'to' parameters are required (YYYY-MM)."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            start = parse_year_month(from_str)
+            end = parse_year_month(to_str)
+        except ValueError as e:
+            return Response(
+                {"error": f"Invalid 'from' or 'to' format: {e}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        span = (end[0] - start[0]) * 12 + (end[1] - start[1]) + 1
+        if span < 1:
+            return Response(
+                {"error": "'from' must not be after 'to'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if span > MAX_RANGE_MONTHS:
+            return Response(
+                {"error": f"Range cannot exceed {MAX_RANGE_MONTHS} months."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # 2. Build the series for the current owner, via ETag check and versioned cache
+        def build_response():
+            series, hit = get_or_compute(
+                request.user.pk, 'summary_range', (*start, *end),
+                lambda: range_summary_data(request.user, start, end),
+            )
+            return Response({
+                "from": f"{start[0]:04d}-{start[1]:02d}",
+                "to": f"{end[0]:04d}-{end[1]:02d}",
+                "months": series["months"],
+                "totals": series["totals"],
+            }, status=status.HTTP_200_OK, headers={'X-Cache': 'HIT' if hit else 'MISS'})
+
+        return conditional_owner_response(request, build_response)
@@ -0,0 +1,182 @@
+"""
+Throughput benchmark: sync gunicorn workers (WSGI) vs uvicorn workers (ASGI)
+at the same worker count, against a throwaway SQLite database.
+
+Usage (from the repository root):
+    python benchmarks/asgi_vs_wsgi.py --workers 4 --concurrency 32 --duration 15 --output asgi.json
+
+WSGI mode is measured on the DRF endpoints and ASGI mode on their /api/async/
+equivalents, which return identical JSON.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENDPOINTS = {
+    'monthly_summary': ('/api/monthly-summary/?month=3&year=2025', '/api/async/monthly-summary/?month=3&year=2025'),
+    'summary_range': ('/api/summary/range/?from=2024-01&to=2025-12', '/api/async/summary/range/?from=2024-01&to=2025-12'),
+    'tenants': ('/api/tenants/', '/api/async/tenants/'),
+    'expenses': ('/api/expenses/?year=2025', '/api/async/expenses/?year=2025'),
+    'readings': ('/api/readings/?year=2025', '/api/async/readings/?year=2025'),
+}
+
+
+def setup_database(env, tenants):
+    """Migrates a fresh SQLite database and seeds one landlord; returns an API token."""
+    subprocess.run([sys.executable, 'manage.py', 'migrate', '-v', '0'], cwd=ROOT, env=env, check=True)
+
+    os.environ.update(env)
+    sys.path.insert(0, str(ROOT))
+    import django
+    django.setup()
+    from django.contrib.auth import get_user_model
+    from rest_framework.authtoken.models import Token
+    from app.ledger import rebuild_ledger
+    from app.models import Tenant, ElectricityReading, ExpenseCategory, Expense
+    import datetime
+
+    owner = get_user_model().objects.create_user('bench', password='bench', is_superuser=True)
+    created = Tenant.objects.bulk_create([
+        Tenant(owner=owner, name=f'Tenant {i}', room_no=f'R{i}', contact_no='0', rent=Decimal('8000.00'))
+        for i in range(tenants)
+    ])
+    ElectricityReading.objects.bulk_create([
+        ElectricityReading(
+            tenant=tenant, month=month, year=year, previous_reading=0, current_reading=100,
+            rate_per_unit=Decimal('8.00'), total_units=100, calculated_bill=Decimal('800.00'),
+        )
+        for tenant in created for year in (2024, 2025) for month in range(1, 13)
+    ])
+    category = ExpenseCategory.objects.create(owner=owner, name='Bench')
+    Expense.objects.bulk_create([
+        Expense(owner=owner, category=category, amount=Decimal('150.00'),
+                date=datetime.date(year, month, 10), month=month, year=year)
+        for year in (2024, 2025) for month in range(1, 13) for _ in range(10)
+    ])
+    rebuild_ledger()
+    return Token.objects.create(user=owner).key
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, workers, env):
+    port = free_port()
+    app = 'home_expense_manager.wsgi:application' if mode == 'wsgi' else 'home_expense_manager.asgi:application'
+    command = [sys.executable, '-m', 'gunicorn', app, '--bind', f'127.0.0.1:{port}',
+               '--workers', str(workers), '--log-level', 'warning']
+    if mode == 'asgi':
+        command += ['-k', 'uvicorn_worker.UvicornWorker']
+    process = subprocess.Popen(command, cwd=ROOT, env=env)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/login/', timeout=1)
+        except urllib.error.HTTPError:
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{mode} server did not start')
+
+
+def load(url, token, concurrency, duration):
+    """Hammers `url` from `concurrency` threads for `duration` seconds."""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def worker():
+        nonlocal errors
+        request = urllib.request.Request(url, headers={'Authorization': f'Token {token}'})
+        while time.time() < stop_at:
+            started = time.perf_counter()
+            try:
+                urllib.request.urlopen(request, timeout=30).read()
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+            except OSError:
+                with lock:
+                    errors += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2) if latencies else None
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / duration, 1),
+        'p50_ms': pick(0.50),
+        'p95_ms': pick(0.95),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per endpoint and mode')
+    parser.add_argument('--tenants', type=int, default=200)
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='hem-bench-')
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE='home_expense_manager.settings',
+        DATABASE_URL=f'sqlite:///{workdir}/bench.sqlite3',
+        DB_SSL_REQUIRE='False',
+        # settings.py enables DEBUG only when DEBUG is unset or 'False'
+        DEBUG='0',
+        CACHE_LOCATION=f'{workdir}/cache',
+        # Measure the database path, not the response cache
+        SUMMARY_CACHE_TIMEOUT='0',
+    )
+    token = setup_database(env, args.tenants)
+
+    results = {'workers': args.workers, 'concurrency': args.concurrency, 'duration': args.duration, 'modes': {}}
+    for mode in ('wsgi', 'asgi'):
+        process, port = start_server(mode, args.workers, env)
+        try:
+            results['modes'][mode] = {
+                name: load(f'http://127.0.0.1:{port}{paths[0 if mode == "wsgi" else 1]}',
+                           token, args.concurrency, args.duration)
+                for name, paths in ENDPOINTS.items()
+            }
+        finally:
+            process.terminate()
+            process.wait()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Expense search benchmark: the text index behind /api/expenses/search/ (see
+app/search.py) vs the unindexed icontains scan it replaces, against a
+throwaway SQLite database (or --database-url).
+
+Usage (from the repository root):
+    python benchmarks/expense_search.py --expenses 1000000 --repeat 20 --output search.json
+
+Each query shape is timed --repeat times for the first page, and the second
+page is timed by following the first page's cursor. Latencies are in ms.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CATEGORIES = ['Plumber', 'Electrician', 'Groceries', 'Internet', 'Cleaning', 'Gardener', 'Painter', 'Insurance',
+              'Water', 'Gas', 'Security', 'Furniture']
+WORDS = ['visit', 'repair', 'monthly', 'bill', 'replacement', 'leak', 'filter', 'service', 'annual', 'deposit',
+         'refund', 'urgent', 'kitchen', 'bathroom', 'roof', 'garden', 'hallway', 'boiler', 'meter', 'window']
+RARE_WORD = 'chandelier'
+
+QUERIES = {
+    'common': 'service',
+    'rare': RARE_WORD,
+    'two_terms': 'plumber leak',
+    'prefix': 'elec rep',
+    'with_month': 'gas march',
+}
+
+
+def setup_django(database_url):
+    os.environ.update(
+        DJANGO_SETTINGS_MODULE='home_expense_manager.settings',
+        DATABASE_URL=database_url,
+        DB_SSL_REQUIRE='False',
+        # settings.py enables DEBUG only when DEBUG is unset or 'False'
+        DEBUG='0',
+        CACHE_BACKEND='django.core.cache.backends.locmem.LocMemCache',
+    )
+    sys.path.insert(0, str(ROOT))
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def seed(expenses):
+    """One landlord with `expenses` expenses described from a small vocabulary (0.1% use RARE_WORD)."""
+    from django.contrib.auth import get_user_model
+    from app.models import Expense, ExpenseCategory
+
+    rng = random.Random(0)
+    owner = get_user_model().objects.create_user('search-bench', password='bench', is_superuser=True)
+    categories = ExpenseCategory.objects.bulk_create([
+        ExpenseCategory(owner=owner, name=name, description=f'{name} costs') for name in CATEGORIES
+    ])
+    first = datetime.date(2015, 1, 1)
+    batch = []
+    for i in range(expenses):
+        words = rng.sample(WORDS, 3)
+        if rng.random() < 0.001:
+            words[0] = RARE_WORD
+        date = first + datetime.timedelta(days=rng.randrange(3650))
+        # bulk_create() skips Expense.save(), which fills month and year
+        batch.append(Expense(
+            owner=owner, category=rng.choice(categories), amount=Decimal(rng.randrange(100, 100000)) / 100,
+            date=date, month=date.month, year=date.year, description=' '.join(words).capitalize(),
+        ))
+        if len(batch) >= 10000:
+            Expense.objects.bulk_create(batch, batch_size=10000)
+            batch = []
+    Expense.objects.bulk_create(batch, batch_size=10000)
+    return owner
+
+
+def icontains_page(owner, terms, limit):
+    """The pre-index approach: every term via LIKE over description and category, newest first."""
+    from django.db.models import Q
+    from app.models import Expense
+
+    queryset = Expense.objects.filter(owner=owner)
+    for term in terms:
+        queryset = queryset.filter(Q(description__icontains=term) | Q(category__name__icontains=term))
+    return list(queryset.order_by('-pk').values_list('pk', flat=True)[:limit])
+
+
+def timed(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return result, {
+        'p50_ms': round(statistics.median(samples), 2),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--expenses', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--database-url', help='defaults to a temporary SQLite file')
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp(prefix='hem-search-')}/bench.sqlite3"
+    setup_django(database_url)
+    from django.db import connection
+    from app.search import search_expenses, search_terms
+
+    started = time.perf_counter()
+    owner = seed(args.expenses)
+    seed_seconds = time.perf_counter() - started
+
+    queries = {}
+    for name, query in QUERIES.items():
+        terms = search_terms(query)
+        first, indexed = timed(lambda: search_expenses(owner, terms, args.page_size + 1), args.repeat)
+        after = tuple(reversed(first[args.page_size - 1])) if len(first) > args.page_size else None
+        _second, second_page = timed(
+            lambda: search_expenses(owner, terms, args.page_size + 1, after), args.repeat
+        ) if after else (None, None)
+        _rows, scan = timed(lambda: icontains_page(owner, terms, args.page_size), args.repeat)
+        queries[name] = {
+            'query': query,
+            'matches': len(search_expenses(owner, terms, args.expenses)),
+            'indexed': indexed,
+            'indexed_page_2': second_page,
+            'icontains': scan,
+            'speedup_p50': round(scan['p50_ms'] / indexed['p50_ms'], 1) if indexed['p50_ms'] else None,
+        }
+
+    results = {
+        'database': connection.vendor,
+        'expenses': args.expenses,
+        'seed_and_index_seconds': round(seed_seconds, 1),
+        'page_size': args.page_size,
+        'queries': queries,
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Startup benchmark: boot time, first-request latency and per-worker memory for
+the startup options in settings.py (ADMIN_ENABLED, API_SCHEMA_ENABLED,
+WARM_UP_ON_BOOT) and gunicorn's preload_app (GUNICORN_PRELOAD, see
+gunicorn.conf.py). Linux only: memory is read from /proc.
+
+Usage (from the repository root):
+    python benchmarks/startup.py --runs 5 --workers 4 --output benchmarks/results/startup.json
+
+Boot numbers come from fresh interpreters that import the WSGI application
+and then serve GET /api/health/ in-process. For gunicorn, RSS counts shared
+pages in full, PSS splits them between the processes sharing them, and USS
+(private memory) is what each additional worker really costs.
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Optional routes enabled in each configuration
+CONFIGS = {
+    'all_routes': {'ADMIN_ENABLED': 'True', 'API_SCHEMA_ENABLED': 'True'},
+    'default': {'ADMIN_ENABLED': 'True', 'API_SCHEMA_ENABLED': 'False'},
+    'api_only': {'ADMIN_ENABLED': 'False', 'API_SCHEMA_ENABLED': 'False'},
+}
+
+# Run in a fresh interpreter: boot, then two in-process requests
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from home_expense_manager.wsgi import application
+boot = time.perf_counter() - started
+modules = len(sys.modules)
+from wsgiref.util import setup_testing_defaults
+
+def request():
+    environ = {}
+    setup_testing_defaults(environ)
+    environ.update(PATH_INFO='/api/health/', HTTP_HOST='localhost')
+    started = time.perf_counter()
+    b''.join(application(environ, lambda status, headers: None))
+    return time.perf_counter() - started
+
+first, second = request(), request()
+rss = next(int(line.split()[1]) for line in open('/proc/self/status') if line.startswith('VmRSS'))
+print(json.dumps({'boot_ms': boot * 1000, 'first_request_ms': first * 1000, 'second_request_ms': second * 1000,
+                  'modules': modules, 'rss_mb': rss / 1024}))
+"""
+
+
+def base_env(workdir):
+    return dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE='home_expense_manager.settings',
+        DATABASE_URL=f'sqlite:///{workdir}/bench.sqlite3',
+        DB_SSL_REQUIRE='False',
+        # settings.py enables DEBUG only when DEBUG is unset or 'False'
+        DEBUG='0',
+        CACHE_LOCATION=f'{workdir}/cache',
+        PROMETHEUS_MULTIPROC_DIR=f'{workdir}/metrics',
+    )
+
+
+def probe(env, runs):
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env, check=True,
+                                capture_output=True, text=True)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {key: round(statistics.median(sample[key] for sample in samples), 1) for key in samples[0]}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def memory(pid):
+    """(rss, pss, uss) of a process in MB, from /proc/<pid>/smaps_rollup."""
+    fields = {}
+    for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines()[1:]:
+        name, value = line.split(':', 1)
+        fields[name] = int(value.split()[0])
+    uss = fields['Private_Clean'] + fields['Private_Dirty']
+    return fields['Rss'] / 1024, fields['Pss'] / 1024, uss / 1024
+
+
+def children(pid):
+    return [int(child) for child in Path(f'/proc/{pid}/task/{pid}/children').read_text().split()]
+
+
+def gunicorn(env, workers, requests):
+    """Starts gunicorn, times it until it answers, spreads requests over the workers and measures memory."""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'home_expense_manager.wsgi:application', '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers), '--log-level', 'warning'],
+        cwd=ROOT, env=env,
+    )
+    url = f'http://127.0.0.1:{port}/api/health/'
+    try:
+        deadline = time.time() + 60
+        while True:
+            try:
+                urllib.request.urlopen(url, timeout=1).read()
+                break
+            except (urllib.error.URLError, OSError):
+                if time.time() > deadline:
+                    raise RuntimeError('gunicorn did not start')
+                time.sleep(0.02)
+        ready = time.perf_counter() - started
+
+        # Wait for every worker to boot, then let each of them serve requests
+        deadline = time.time() + 60
+        while len(children(process.pid)) < workers and time.time() < deadline:
+            time.sleep(0.05)
+        latencies = []
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            urllib.request.urlopen(url, timeout=5).read()
+            latencies.append(time.perf_counter() - request_started)
+
+        per_worker = [memory(pid) for pid in children(process.pid)]
+        master = memory(process.pid)
+        return {
+            'first_response_seconds': round(ready, 2),
+            'max_request_ms': round(max(latencies) * 1000, 1),
+            'worker_rss_mb': round(statistics.median(rss for rss, _pss, _uss in per_worker), 1),
+            'worker_pss_mb': round(statistics.median(pss for _rss, pss, _uss in per_worker), 1),
+            'worker_uss_mb': round(statistics.median(uss for _rss, _pss, uss in per_worker), 1),
+            'total_pss_mb': round(master[1] + sum(pss for _rss, pss, _uss in per_worker), 1),
+        }
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per boot configuration')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200, help='requests spread over the gunicorn workers')
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='hem-startup-')
+    env = base_env(workdir)
+    os.makedirs(env['PROMETHEUS_MULTIPROC_DIR'])
+    results = {
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'boot': {},
+        'gunicorn': {'workers': args.workers},
+    }
+    for name, options in CONFIGS.items():
+        for warm_up in ('False', 'True'):
+            key = f'{name}{"_warm_up" if warm_up == "True" else ""}'
+            results['boot'][key] = probe({**env, **options, 'WARM_UP_ON_BOOT': warm_up}, args.runs)
+
+    for name in ('default', 'api_only'):
+        for preload in ('False', 'True'):
+            key = f'{name}{"_preload" if preload == "True" else ""}'
+            results['gunicorn'][key] = gunicorn(
+                {**env, **CONFIGS[name], 'GUNICORN_PRELOAD': preload}, args.workers, args.requests
+            )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Tariff revision benchmark: set-based rebilling (one UPDATE per tariff window,
+see app/billing.py) vs re-saving readings one at a time, against a throwaway
+SQLite database (or --database-url).
+
+Usage (from the repository root):
+    python benchmarks/tariff_recompute.py --tenants 2000 --months 50 --sample 2000 --output tariff.json
+
+The per-object path is timed on --sample readings and extrapolated to the
+full table, since re-saving 100k rows one by one takes several minutes.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django(database_url):
+    os.environ.update(
+        DJANGO_SETTINGS_MODULE='home_expense_manager.settings',
+        DATABASE_URL=database_url,
+        DB_SSL_REQUIRE='False',
+        # settings.py enables DEBUG only when DEBUG is unset or 'False'
+        DEBUG='0',
+        CACHE_BACKEND='django.core.cache.backends.locmem.LocMemCache',
+    )
+    sys.path.insert(0, str(ROOT))
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def seed(tenants, months):
+    """One landlord with `tenants` x `months` readings and a three-slab tariff."""
+    from django.contrib.auth import get_user_model
+    from app.ledger import rebuild_ledger
+    from app.models import Tenant, ElectricityReading, Tariff, TariffSlab
+
+    rng = random.Random(0)
+    owner = get_user_model().objects.create_user('tariff-bench', password='bench', is_superuser=True)
+    created = Tenant.objects.bulk_create([
+        Tenant(owner=owner, name=f'Tenant {i}', room_no=f'T{i}', contact_no='0', rent=Decimal('8000.00'))
+        for i in range(tenants)
+    ], batch_size=5000)
+    periods = [(2020 + i // 12, i % 12 + 1) for i in range(months)]
+    batch = []
+    for tenant in created:
+        for year, month in periods:
+            units = Decimal(rng.randrange(2000, 40000)) / 100
+            batch.append(ElectricityReading(
+                tenant=tenant, month=month, year=year, previous_reading=0, current_reading=units,
+                rate_per_unit=Decimal('8.00'), total_units=units, calculated_bill=units * 8,
+            ))
+        if len(batch) >= 5000:
+            ElectricityReading.objects.bulk_create(batch, batch_size=5000)
+            batch = []
+    ElectricityReading.objects.bulk_create(batch, batch_size=5000)
+    rebuild_ledger([owner.pk])
+
+    tariff = Tariff.objects.create(owner=owner, name='Revised', effective_from=datetime.date(2020, 1, 1),
+                                   fixed_charge=Decimal('50.00'))
+    TariffSlab.objects.bulk_create([
+        TariffSlab(tariff=tariff, lower_units=0, upper_units=100, rate=Decimal('5.00')),
+        TariffSlab(tariff=tariff, lower_units=100, upper_units=200, rate=Decimal('7.50')),
+        TariffSlab(tariff=tariff, lower_units=200, upper_units=None, rate=Decimal('9.25')),
+    ])
+    return owner, tariff
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tenants', type=int, default=2000)
+    parser.add_argument('--months', type=int, default=50)
+    parser.add_argument('--sample', type=int, default=2000, help='readings re-saved one by one')
+    parser.add_argument('--database-url', help='defaults to a temporary SQLite file')
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp(prefix='hem-tariff-')}/bench.sqlite3"
+    setup_django(database_url)
+    from django.db import connection
+    from app.billing import recompute_bills
+    from app.ledger import ledger_drift, rebuild_ledger
+    from app.models import ElectricityReading
+
+    owner, tariff = seed(args.tenants, args.months)
+    readings = ElectricityReading.objects.filter(tenant__owner=owner)
+    total = readings.count()
+
+    started = time.perf_counter()
+    updated = recompute_bills(owner.pk)
+    set_based = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rebuild_ledger([owner.pk])
+    ledger_only = time.perf_counter() - started
+
+    sample = list(readings.select_related('tenant').order_by('?')[:args.sample])
+    started = time.perf_counter()
+    for reading in sample:
+        reading.save()
+    per_object = time.perf_counter() - started
+
+    # The SQL expression and Tariff.bill_for() must agree
+    tariff.refresh_from_db()
+    checked = list(readings.order_by('?')[:1000])
+    mismatches = sum(1 for r in checked if r.calculated_bill != tariff.bill_for(r.total_units))
+
+    per_row = per_object / len(sample) if sample else 0.0
+    results = {
+        'database': connection.vendor,
+        'readings': total,
+        'set_based': {
+            'rows_updated': updated,
+            'seconds': round(set_based, 3),
+            'of_which_ledger_rebuild_seconds': round(ledger_only, 3),
+        },
+        'per_object': {
+            'sample': len(sample),
+            'sample_seconds': round(per_object, 3),
+            'extrapolated_seconds': round(per_row * total, 1),
+        },
+        'speedup': round(per_row * total / set_based, 1) if set_based else None,
+        'bill_mismatches_in_1000': mismatches,
+        'ledger_drift_rows': len(ledger_drift([owner.pk])),
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -1128,8 +1128,7 @@ const ExpensesPage = ({ user, apiClient, addToast }) => {
 const DashboardPage = ({ user, apiClient, addToast }) => {
     const today = new Date();
     const [summary, setSummary] = useState(null);
-    const [expenses, setExpenses] = useState([]);
-    const [categories, setCategories] = useState([]);
+    const [breakdown, setBreakdown] = useState([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
     const [filterMonth, setFilterMonth] = useState(today.getMonth() + 1);
@@ -1139,15 +1138,10 @@ const DashboardPage = ({ user, apiClient, addToast }) => {
         setLoading(true);
         setError('');
         try {
-            const [summaryRes, expensesRes, categoriesRes] = await Promise.all([
-                apiClient.get(`monthly-summary/?month=${filterMonth}&year=${filterYear}`),
-                apiClient.get(`expenses/?month=${filterMonth}&year=${filterYear}`),
-                apiClient.get('categories/'),
-            ]);
-            
-            setSummary(summaryRes.data);
-            setExpenses(expensesRes.data.results || expensesRes.data);
-            setCategories(categoriesRes.data.results || categoriesRes.data);
+            // One request for the summary, tenant bill status and expense breakdown
+            const response = await apiClient.get(`dashboard/?month=${filterMonth}&year=${filterYear}`);
+            setSummary(response.data.summary);
+            setBreakdown(response.data.expense_breakdown);
         } catch (err) {
             setError('Failed to fetch dashboard data. Check connection and filters.');
             addToast('Failed to load dashboard data.', 'error');
@@ -1171,16 +1165,11 @@ const DashboardPage = ({ user, apiClient, addToast }) => {
 
     const formatCurrency = (amount) => `₹${parseFloat(amount || 0).toFixed(2)}`;
 
-    // Group expenses by category name for breakdown table
-    const expenseBreakdown = useMemo(() => {
-        const categoryMap = categories.reduce((acc, cat) => ({ ...acc, [cat.id]: cat.name }), {});
-        const breakdown = expenses.reduce((acc, expense) => {
-            const categoryName = categoryMap[expense.category] || 'Uncategorized';
-            acc[categoryName] = (acc[categoryName] || 0) + parseFloat(expense.amount);
-            return acc;
-        }, {});
-        return Object.entries(breakdown).map(([name, total]) => ({ name, total }));
-    }, [expenses, categories]);
+    // Expense totals per category name for the breakdown table (grouped by the API)
+    const expenseBreakdown = useMemo(() => breakdown.map((item) => ({
+        name: item.category_name || 'Uncategorized',
+        total: parseFloat(item.total),
+    })), [breakdown]);
 
 
     if (loading) {
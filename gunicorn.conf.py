@@ -0,0 +1,39 @@
+"""
+Gunicorn settings, picked up automatically from the working directory
+(the Procfile command runs from the repository root).
+
+Workers are separate processes, so Prometheus metrics use prometheus_client's
+multiprocess mode: each worker writes its values to files under
+PROMETHEUS_MULTIPROC_DIR and /metrics merges them (see app/metrics.py).
+
+The application is preloaded: the master imports Django, the URLconf and
+every view once (home_expense_manager/warmup.py) and then forks, so workers
+start ready and share those pages copy-on-write. Set GUNICORN_PRELOAD=False
+to load it in each worker instead (e.g. with --reload).
+Compare both with benchmarks/startup.py.
+"""
+import os
+import shutil
+import tempfile
+
+# Must be set before the application imports prometheus_client, which with
+# preload_app happens in the master, before on_starting()
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'home_expense_manager_metrics')
+)
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+
+def on_starting(server):
+    """Starts from empty metric files so counters from a previous run are not merged in."""
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drops the live gauges (in-flight requests) of a worker that has exited."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
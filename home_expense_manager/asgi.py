@@ -1,8 +1,19 @@
 """
-ASGI config for tutorial project.
+ASGI config for home_expense_manager project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+ASGI deployment mode
+--------------------
+The default Procfile serves WSGI with sync gunicorn workers, where one slow
+request blocks its worker. To serve the async read endpoints under
+/api/async/ without blocking, run the same worker count with uvicorn workers:
+
+    gunicorn home_expense_manager.asgi:application -k uvicorn_worker.UvicornWorker --workers 4
+
+The DRF endpoints keep working unchanged in this mode (Django runs them in a
+thread). Compare both modes with benchmarks/asgi_vs_wsgi.py.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -11,6 +22,9 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tutorial.settings')
+from home_expense_manager.warmup import warm_up
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'home_expense_manager.settings')
 
 application = get_asgi_application()
+warm_up()
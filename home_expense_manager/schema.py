@@ -0,0 +1,28 @@
+"""
+OpenAPI schema view, imported by urls.py only when settings.API_SCHEMA_ENABLED.
+"""
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.response import Response
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """
+    SpectacularAPIView serving the public schema from memory. The schema is
+    generated once per process, at boot (home_expense_manager/warmup.py),
+    instead of walking every view and serializer on each request; the API
+    only changes with a deploy.
+    """
+    _schema = None
+
+    @classmethod
+    def get_schema(cls):
+        if cls._schema is None:
+            generator = cls.generator_class(urlconf=cls.urlconf, api_version=cls.api_version, patterns=cls.patterns)
+            cls._schema = generator.get_schema(request=None, public=True)
+        return cls._schema
+
+    def _get_schema_response(self, request):
+        return Response(
+            data=self.get_schema(),
+            headers={"Content-Disposition": f'inline; filename="{self._get_filename(request, None)}"'},
+        )
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
@@ -13,6 +14,15 @@ DEBUG = os.getenv('DEBUG', 'False') == 'False'
 
 ALLOWED_HOSTS = ['*']
 
+# Optional routes (home_expense_manager/urls.py). The apps behind a disabled
+# route are not installed, so workers never import them; API-only deployments
+# can set ADMIN_ENABLED=False to start faster and use less memory per worker.
+ADMIN_ENABLED = os.getenv('ADMIN_ENABLED', 'True') == 'True'
+API_SCHEMA_ENABLED = os.getenv('API_SCHEMA_ENABLED', 'False') == 'True'
+# Import the URLconf and views at boot instead of on each worker's first request
+# (home_expense_manager/warmup.py); with gunicorn's preload_app this happens once, before forking
+WARM_UP_ON_BOOT = os.getenv('WARM_UP_ON_BOOT', 'True') == 'True'
+
 # Application definition
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -33,7 +43,22 @@ INSTALLED_APPS = [
     'app',
 ]
 
+# Apps (and their middleware) only needed by an optional route
+OPTIONAL_APPS = {
+    'django.contrib.admin': ADMIN_ENABLED,
+    'django.contrib.messages': ADMIN_ENABLED,
+    'django.contrib.staticfiles': ADMIN_ENABLED,
+    'drf_spectacular': API_SCHEMA_ENABLED,
+}
+INSTALLED_APPS = [name for name in INSTALLED_APPS if OPTIONAL_APPS.get(name, True)]
+
 MIDDLEWARE = [
+    # First, so request metrics cover the whole middleware stack (see app/metrics.py)
+    'app.middleware.MetricsMiddleware',
+    # Inactive without read replicas (see DATABASE_REPLICA_URLS below)
+    'app.middleware.ReplicaRoutingMiddleware',
+    # Before anything that reads or alters the response body
+    'app.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware', # CORS middleware
@@ -42,6 +67,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Inactive unless REQUEST_TIMING['ENABLED'] (see below)
+    'app.middleware.RequestTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'home_expense_manager.urls'
@@ -62,6 +89,10 @@ TEMPLATES = [
     },
 ]
 
+if not ADMIN_ENABLED:
+    MIDDLEWARE.remove('django.contrib.messages.middleware.MessageMiddleware')
+    TEMPLATES[0]['OPTIONS']['context_processors'].remove('django.contrib.messages.context_processors.messages')
+
 WSGI_APPLICATION = 'home_expense_manager.wsgi.application'
 
 DATABASE_URL = os.getenv('DATABASE_URL')
@@ -69,11 +100,51 @@ DATABASES = {
 'default': dj_database_url.config(
         default=os.environ.get('DATABASE_URL'),
         conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', 600)),
-        ssl_require=True)
+        # Set DB_SSL_REQUIRE=False for local SQLite/Postgres (benchmarks, development)
+        ssl_require=os.environ.get('DB_SSL_REQUIRE', 'True') == 'True')
+}
+
+# Read replicas (app/db_routing.py): comma-separated URLs become the aliases
+# replica1, replica2, ... that safe-method requests read from. Locally, a
+# second SQLite file or a Postgres standby works; tests mirror the primary.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+for _index, _url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    DATABASES[f'replica{_index}'] = {
+        **dj_database_url.parse(
+            _url,
+            conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+            ssl_require=os.environ.get('DB_SSL_REQUIRE', 'True') == 'True',
+        ),
+        'TEST': {'MIRROR': 'default'},
+    }
+    # Bound how long a hung replica can hold a request or a health check (app/db_routing.py)
+    if DATABASES[f'replica{_index}']['ENGINE'] == 'django.db.backends.postgresql':
+        DATABASES[f'replica{_index}'].setdefault('OPTIONS', {}).update(
+            connect_timeout=int(os.getenv('READ_REPLICA_CONNECT_TIMEOUT', 3)),
+            options=f"-c statement_timeout={int(os.getenv('READ_REPLICA_STATEMENT_TIMEOUT_MS', 30000))}",
+        )
+DATABASE_ROUTERS = ['app.db_routing.ReplicaRouter']
+READ_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    # Should exceed MAX_LAG_SECONDS, or a pinned user could still read stale data afterwards
+    'PIN_SECONDS': float(os.getenv('READ_REPLICA_PIN_SECONDS', 10)),
+    'MAX_LAG_SECONDS': float(os.getenv('READ_REPLICA_MAX_LAG_SECONDS', 5)),
+    'CHECK_INTERVAL_SECONDS': float(os.getenv('READ_REPLICA_CHECK_INTERVAL', 10)),
 }
 
 # --------------------------------------------------------
 
+# Cache (used for per-owner versioned summary responses)
+# The file-based default is shared by all gunicorn workers on a host; the
+# local-memory backend is per-process and only safe with a single worker.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'home_expense_manager_cache')),
+    }
+}
+SUMMARY_CACHE_TIMEOUT = int(os.getenv('SUMMARY_CACHE_TIMEOUT', 300))
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -101,13 +172,48 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'app.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+}
+if API_SCHEMA_ENABLED:
+    REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS'] = 'drf_spectacular.openapi.AutoSchema'
+
+# Token -> user cache used by app.authentication.CachedTokenAuthentication.
+# With TOKEN_AUTH_CACHE_SHARED=False a logout or deactivation only reaches the
+# worker that handled it; the others keep accepting the token until their
+# entry expires, so entries then live at most LOCAL_TTL seconds. That is fine
+# for a single worker; with several, keep the shared cache.
+TOKEN_AUTH_CACHE = {
+    'TTL': int(os.getenv('TOKEN_AUTH_CACHE_TTL', 60)),
+    'LOCAL_TTL': int(os.getenv('TOKEN_AUTH_CACHE_LOCAL_TTL', 5)),
+    'MAX_SIZE': int(os.getenv('TOKEN_AUTH_CACHE_MAX_SIZE', 10000)),
+    'USE_DJANGO_CACHE': os.getenv('TOKEN_AUTH_CACHE_SHARED', 'True') == 'True',
+}
+
+# Prometheus metrics at /metrics (app.metrics). Outside DEBUG the endpoint is a
+# 404 unless METRICS_AUTH_TOKEN is set (scrapers send it as a bearer token) or
+# the scraper's address is in METRICS_ALLOWED_IPS (comma-separated). Behind a
+# proxy on the same host every request comes from the proxy, so prefer the token.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+METRICS_AUTH_TOKEN = os.getenv('METRICS_AUTH_TOKEN', '')
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()]
+
+# Negotiated brotli/gzip response compression (app.middleware.CompressionMiddleware)
+COMPRESSION = {
+    'ENABLED': os.getenv('COMPRESSION_ENABLED', 'True') == 'True',
+    'MIN_SIZE': int(os.getenv('COMPRESSION_MIN_SIZE', 1024)),
+}
+
+# Sampled query/DB/view/render timing with a Server-Timing header (app.middleware)
+REQUEST_TIMING = {
+    'ENABLED': os.getenv('REQUEST_TIMING_ENABLED', 'False') == 'True',
+    'SAMPLE_RATE': float(os.getenv('REQUEST_TIMING_SAMPLE_RATE', 0.1)),
+    'SLOW_REQUEST_MS': float(os.getenv('REQUEST_TIMING_SLOW_MS', 500)),
+    'WORST_QUERIES': int(os.getenv('REQUEST_TIMING_WORST_QUERIES', 3)),
 }
 
 # CORS Configuration (from .env)
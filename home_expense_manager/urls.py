@@ -1,15 +1,27 @@
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
-# from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from app.metrics import metrics_view
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-
     # Health check and core app endpoints
     path('api/', include('app.urls')),
 
-    # # API Documentation routes (drf-spectacular)
-    # path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    # # Optional: Swagger UI for browsing the API
-    # path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    # Prometheus scrape endpoint (see app/metrics.py and gunicorn.conf.py)
+    path('metrics', metrics_view, name='metrics'),
 ]
+
+# Optional routes import their apps here, only when enabled (see settings.OPTIONAL_APPS)
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
+    urlpatterns.append(path('admin/', admin.site.urls))
+
+if settings.API_SCHEMA_ENABLED:
+    from drf_spectacular.views import SpectacularSwaggerView
+    from home_expense_manager.schema import CachedSchemaView
+
+    urlpatterns += [
+        # API Documentation routes (drf-spectacular)
+        path('api/schema/', CachedSchemaView.as_view(), name='schema'),
+        # Optional: Swagger UI for browsing the API
+        path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    ]
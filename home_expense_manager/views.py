@@ -2,10 +2,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+from app.db_routing import replica_config, replica_health
+
 class HealthCheckView(APIView):
     """
     API view to check the health and status of the application.
-    Returns a simple JSON object: { "status": "ok" }.
+    Returns a simple JSON object: { "status": "ok" }, plus each read
+    replica's health and lag when replicas are configured.
     """
     permission_classes = [] # Allow unauthenticated access for health check
 
@@ -13,4 +16,9 @@ class HealthCheckView(APIView):
         """
         Handles GET requests and returns a success status.
         """
-        return Response({"status": "ok"}, status=status.HTTP_200_OK)
+        data = {"status": "ok"}
+        config = replica_config()
+        if config['ALIASES']:
+            replica_health.healthy(config['ALIASES'], config)
+            data["replicas"] = replica_health.status()
+        return Response(data, status=status.HTTP_200_OK)
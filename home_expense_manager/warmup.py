@@ -0,0 +1,36 @@
+"""
+Boot-time warm-up, run from wsgi.py and asgi.py unless WARM_UP_ON_BOOT is off.
+
+Django imports the URLconf, and with it every view, serializer and most of
+DRF, when a process serves its first request. Doing that work at boot keeps
+it out of the first user's request. Under gunicorn's preload_app
+(gunicorn.conf.py) it happens once, in the master: forked workers start
+ready and share those pages copy-on-write instead of each building its own.
+"""
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver, reverse
+
+
+def warm_up():
+    if not settings.WARM_UP_ON_BOOT:
+        return
+    from app.fast_lists import FastListMixin, compile_fields, supports_values
+    from app.urls import router
+
+    # 1. The URLconf (importing every view) and the resolver's lookup tables
+    get_resolver().resolve('/api/health/')
+    reverse('health_check')
+
+    # 2. The field mappings that list endpoints otherwise compile on first use
+    for _prefix, viewset, _basename in router.registry:
+        if issubclass(viewset, FastListMixin) and supports_values(viewset.serializer_class):
+            compile_fields(viewset.serializer_class)
+
+    # 3. The OpenAPI schema, served from memory afterwards
+    if settings.API_SCHEMA_ENABLED:
+        from home_expense_manager.schema import CachedSchemaView
+        CachedSchemaView.get_schema()
+
+    # Forked workers must not share a database connection opened here
+    connections.close_all()
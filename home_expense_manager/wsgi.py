@@ -2,6 +2,9 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from home_expense_manager.warmup import warm_up
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'home_expense_manager.settings')
 
 application = get_wsgi_application()
+warm_up()